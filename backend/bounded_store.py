@@ -0,0 +1,132 @@
+"""
+Two-tier bounded key/value store shared by the response cache
+(response_cache) and the image cache (image_prep).
+
+Tier 1 is an in-process LRU of `memory_entries` decoded values. Tier 2 is
+one file per key under `directory` (sharded by key prefix, named
+"<key><suffix>"), bounded to `max_disk_bytes`: when full, the least
+recently used files are deleted until the store is back under 90% of the
+budget. File mtime doubles as last access, so eviction order survives
+restarts. Not locked: owners serialize access with their own lock.
+"""
+import os
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Eviction stops once the disk tier is back under this share of its budget
+DISK_LOW_WATER = 0.9
+
+
+class BoundedStore:
+    def __init__(
+        self,
+        directory: Optional[str],
+        suffix: str,
+        memory_entries: int,
+        max_disk_bytes: int
+    ):
+        self.directory = directory
+        self.suffix = suffix
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self.memory: "OrderedDict[str, Any]" = OrderedDict()
+        # key -> file size, least recently used first
+        self.disk: "OrderedDict[str, int]" = OrderedDict()
+        self.disk_bytes = 0
+
+        if directory:
+            self._scan_disk()
+
+    # -----------------------------
+    # Memory tier
+    # -----------------------------
+
+    def recall(self, key: str) -> Optional[Any]:
+        """Value from memory (marked most recently used), or None."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory.move_to_end(key)
+        return value
+
+    def remember(self, key: str, value: Any):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def forget(self, key: str):
+        self.memory.pop(key, None)
+
+    # -----------------------------
+    # Disk tier
+    # -----------------------------
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    def _scan_disk(self):
+        """Index existing files, oldest access first."""
+        found = []
+        if os.path.isdir(self.directory):
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for item in os.scandir(shard.path):
+                    if item.name.endswith(self.suffix):
+                        stat = item.stat()
+                        found.append((stat.st_mtime, item.name[:-len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(found):
+            self.disk[key] = size
+            self.disk_bytes += size
+
+    def read(self, key: str) -> Optional[bytes]:
+        """File bytes for `key` (marked most recently used), or None."""
+        if not self.directory or key not in self.disk:
+            return None
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.remove(key)
+            return None
+
+        self.disk.move_to_end(key)
+        return data
+
+    def write(self, key: str, data: bytes):
+        """Write atomically (temp file + rename), then evict down to the low-water mark."""
+        if not self.directory or len(data) > self.max_disk_bytes:
+            return
+
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self.disk_bytes += len(data) - self.disk.pop(key, 0)
+        self.disk[key] = len(data)
+        if self.disk_bytes > self.max_disk_bytes:
+            target = self.max_disk_bytes * DISK_LOW_WATER
+            while self.disk_bytes > target and len(self.disk) > 1:
+                self.remove(next(iter(self.disk)))
+
+    def remove(self, key: str):
+        """Drop `key` from the disk tier (memory is left to forget())."""
+        size = self.disk.pop(key, None)
+        if size is None:
+            return
+        self.disk_bytes -= size
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        self.memory.clear()
+        for key in list(self.disk):
+            self.remove(key)
@@ -1,6 +1,39 @@
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
 from .gemini_client import EduMeshGemini
+from .tokens import DEFAULT_BATCH_TOKENS, estimate_tokens
+
+# Thought-store namespace for this agent's reasoning history
+THOUGHT_NAMESPACE = "extractor"
+
+# Per-document output shape, shared by the single and batched prompts
+EXTRACTION_SCHEMA = """{
+            "people": [{ "name": "str", "role": "str", "bio": "str" }],
+            "skills": [{ "name": "str", "level": "Beginner|Intermediate|Expert" }],
+            "needs": [{ "name": "str", "type": "Learning|Mentorship|Collaboration" }],
+            "relationships": [{ "from": "name", "to": "name", "type": "str" }]
+        }"""
+
+Document = Tuple[str, str]  # (document id, survey text)
+
+
+def pack_documents(documents: Iterable[Document], token_budget: int) -> Iterator[List[Document]]:
+    """
+    Greedily group documents into batches whose estimated tokens stay
+    within `token_budget`. A document larger than the budget goes alone.
+    Consumes `documents` lazily, one batch ahead.
+    """
+    batch: List[Document] = []
+    used = 0
+    for doc_id, text in documents:
+        cost = estimate_tokens(doc_id) + estimate_tokens(text)
+        if batch and used + cost > token_budget:
+            yield batch
+            batch, used = [], 0
+        batch.append((doc_id, text))
+        used += cost
+    if batch:
+        yield batch
 
 class EntityExtractor:
     """
@@ -18,13 +51,73 @@ class EntityExtractor:
         
         Input Text: "{text}"
         
+        Output Schema (JSON):
+        {EXTRACTION_SCHEMA}
+        """
+        
+        return self.gemini.generate_json(prompt, thinking_level="HIGH", namespace=THOUGHT_NAMESPACE)
+
+    def extract_batch(self, documents: List[Document]) -> Dict[str, Dict[str, Any]]:
+        """
+        One request for many surveys. Returns document id -> extraction for
+        the documents the model answered well-formed; others are left out.
+        """
+        payload = json.dumps(dict(documents), ensure_ascii=False, indent=1)
+        prompt = f"""
+        Role: Sociographic Data Analyst ({self.thought_signature_label})
+        Task: Analyze EACH survey below independently and extract structured entities.
+        
+        Input Surveys (JSON object, document id -> survey text):
+        {payload}
+        
         Output Schema (JSON):
         {{
-            "people": [{{ "name": "str", "role": "str", "bio": "str" }}],
-            "skills": [{{ "name": "str", "level": "Beginner|Intermediate|Expert" }}],
-            "needs": [{{ "name": "str", "type": "Learning|Mentorship|Collaboration" }}],
-            "relationships": [{{ "from": "name", "to": "name", "type": "str" }}]
+            "documents": {{
+                "<document id>": {EXTRACTION_SCHEMA}
+            }}
         }}
-        """
         
-        return self.gemini.generate_json(prompt, thinking_level="HIGH")
+        Return exactly one entry per document id, using the ids as given.
+        """
+
+        result = self.gemini.generate_json(prompt, thinking_level="HIGH", namespace=THOUGHT_NAMESPACE)
+        keyed = result.get("documents", result) if isinstance(result, dict) else {}
+        if not isinstance(keyed, dict):
+            return {}
+        return {
+            doc_id: keyed[doc_id]
+            for doc_id, _ in documents
+            if isinstance(keyed.get(doc_id), dict)
+        }
+
+    def extract_many(
+        self,
+        documents: Iterable[Document],
+        token_budget: int = DEFAULT_BATCH_TOKENS
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream (document id, extraction) for every document, in input order.
+        Documents are packed into token-budgeted batches; documents missing
+        or malformed in a batch answer are split in half and retried, down
+        to the single-document prompt. A document that still fails yields {}.
+        """
+        for batch in pack_documents(documents, token_budget):
+            results = self._extract_with_retry(batch)
+            for doc_id, _ in batch:
+                yield doc_id, results.get(doc_id, {})
+
+    def _extract_with_retry(self, batch: List[Document]) -> Dict[str, Dict[str, Any]]:
+        if len(batch) == 1:
+            doc_id, text = batch[0]
+            result = self.extract(text)
+            return {doc_id: result} if isinstance(result, dict) else {}
+
+        results = self.extract_batch(batch)
+        failed = [doc for doc in batch if doc[0] not in results]
+        if failed:
+            print(f"⚠️ {len(failed)} of {len(batch)} documents malformed; retrying in halves")
+            mid = len(failed) // 2
+            for half in (failed[:mid], failed[mid:]):
+                if half:
+                    results.update(self._extract_with_retry(half))
+        return results
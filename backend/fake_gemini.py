@@ -0,0 +1,260 @@
+"""
+Local stand-in for the Gemini generateContent endpoint.
+
+Speaks just enough of the REST API for google-genai to work against it
+(generateContent and SSE streamGenerateContent): point the SDK at it with
+GEMINI_BASE_URL (and any GEMINI_API_KEY). Latency, streamed chunk pacing
+and a rate of retryable failures (429 / 503) can be injected to exercise
+backend.gemini_pool and streaming without spending quota.
+
+    python -m backend.fake_gemini --port 8765 --latency 0.2 --fail-rate 0.1
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# (prompt, request JSON) -> answer text, or {"text", "thoughts"}.
+# Raising LookupError turns into a 404 (e.g. a cassette miss).
+Responder = Callable[[str, Dict[str, Any]], Union[str, Dict[str, Any]]]
+
+
+def echo_responder(prompt: str, request: Dict[str, Any]) -> str:
+    """JSON requests get an empty JSON object; text requests get an echo."""
+    config = request.get("generationConfig") or {}
+    if config.get("responseMimeType") == "application/json":
+        return "{}"
+    return f"echo: {prompt[:200]}"
+
+
+_WORD = re.compile(r"\b[A-Z][A-Za-z+#./-]+")
+_WANT = re.compile(r"\b(?:learn|help with|help|need)\s+([A-Za-z+#. ]+?)(?:[.,!]|$| to | like | and )", re.I)
+_STOP = {"I", "I'm", "Complete", "Experienced", "Here", "Data"}
+
+
+def _extraction(text: str) -> Dict[str, Any]:
+    """A plausible EntityExtractor answer: capitalized terms are skills, "learn X" is a need."""
+    skills = [w for w in dict.fromkeys(w.rstrip(".") for w in _WORD.findall(text)) if w not in _STOP]
+    needs = list(dict.fromkeys(m.strip() for m in _WANT.findall(text)))
+    return {
+        "people": [{"name": "Respondent", "role": "Member", "bio": text[:80]}],
+        "skills": [{"name": s, "level": "Intermediate"} for s in skills[:4]],
+        "needs": [{"name": n, "type": "Learning"} for n in needs[:2]],
+        "relationships": [],
+    }
+
+
+def _json_after(prompt: str, marker: str) -> Any:
+    start = prompt.index(marker) + len(marker)
+    start += len(prompt[start:]) - len(prompt[start:].lstrip())
+    return json.JSONDecoder().raw_decode(prompt, start)[0]
+
+
+def synthetic_responder(prompt: str, request: Dict[str, Any]) -> str:
+    """
+    Schema-shaped JSON for the EduMesh agent prompts, derived from the
+    prompt itself, so agents can run end to end with no recorded data.
+    Keys off the prompt wording in entity_extractor / gap_detector /
+    lead_selector; anything else falls back to echo_responder.
+    """
+    if "document id -> survey text):" in prompt:
+        documents = _json_after(prompt, "document id -> survey text):")
+        return json.dumps({"documents": {doc_id: _extraction(text) for doc_id, text in documents.items()}})
+    if 'Input Text: "' in prompt:
+        return json.dumps(_extraction(prompt.split('Input Text: "', 1)[1].split('"\n', 1)[0]))
+    if "strategic skill gaps" in prompt:
+        names = re.findall(r"^([^|\n(]+)\|", prompt, re.M)[:5] or ["the community"]
+        return json.dumps([
+            {
+                "title": f"Strategic gap {i + 1}",
+                "severity": ("HIGH", "MEDIUM", "LOW")[i % 3],
+                "suggested_intervention": f"{names[i % len(names)]} runs a peer session.",
+            }
+            for i in range(5)
+        ])
+    if '"Community Lead" roles' in prompt:
+        # Shortlist rows: id|name|role|score|mentees|skills
+        rows = re.findall(r"^([^|\n]+)\|([^|\n]+)\|[^|\n]*\|[\d.]+\|", prompt, re.M)[:3]
+        return json.dumps([
+            {"id": person_id, "name": name, "reason": "Strong skills and mentorship signals."}
+            for person_id, name in rows
+        ])
+    return echo_responder(prompt, request)
+
+
+RESPONDERS: Dict[str, Responder] = {"echo": echo_responder, "synthetic": synthetic_responder}
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        fail_rate: float = 0.0,
+        responder: Optional[Responder] = None,
+        seed: Optional[int] = None,
+        chunk_chars: int = 40,
+        chunk_delay: float = 0.0
+    ):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.responder = responder or echo_responder
+        # Streaming: characters per SSE chunk and the pause between chunks
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            fail = self.rng.random() < self.fail_rate
+            self.failures += fail
+            return fail
+
+
+def _response_body(prompt: str, text: str, thoughts: List[str] = (), final: bool = True) -> Dict[str, Any]:
+    prompt_tokens = len(prompt) // 4 + 1
+    output_tokens = len(text) // 4 + 1
+    parts = [{"text": thought, "thought": True} for thought in thoughts] + [{"text": text}]
+    candidate: Dict[str, Any] = {"content": {"role": "model", "parts": parts}}
+    if final:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeGeminiServer
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.server.latency)
+
+        path = self.path.split("?")[0]
+        # .../models/<model>:generateContent
+        request.setdefault("model", path.rsplit("/", 1)[-1].split(":", 1)[0])
+        streaming = path.endswith(":streamGenerateContent")
+        if not streaming and not path.endswith(":generateContent"):
+            self._send(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+            return
+
+        if self.server._should_fail():
+            code, status = self.server.rng.choice([(429, "RESOURCE_EXHAUSTED"), (503, "UNAVAILABLE")])
+            self._send(code, {"error": {"code": code, "message": "injected failure", "status": status}})
+            return
+
+        prompt = "".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        try:
+            reply = self.server.responder(prompt, request)
+        except LookupError as e:
+            self._send(404, {"error": {"code": 404, "message": str(e), "status": "NOT_FOUND"}})
+            return
+
+        thoughts: List[str] = []
+        if isinstance(reply, dict):
+            text, thoughts = reply["text"], reply.get("thoughts") or []
+        else:
+            text = reply
+        if streaming:
+            self._stream(prompt, text, thoughts)
+        else:
+            self._send(200, _response_body(prompt, text, thoughts))
+
+    def _stream(self, prompt: str, text: str, thoughts: List[str]):
+        size = max(1, self.server.chunk_chars)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i, chunk in enumerate(chunks):
+                if i:
+                    time.sleep(self.server.chunk_delay)
+                body = _response_body(
+                    prompt, chunk, thoughts if i == 0 else [], final=i == len(chunks) - 1
+                )
+                self.wfile.write(b"data: " + json.dumps(body).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send(self, code: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline / cancellation) while we were "thinking"
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake Gemini endpoint.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of 429/503 replies")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--responder", choices=sorted(RESPONDERS), default="synthetic")
+    parser.add_argument("--cassette", help="serve recorded responses from this cassette instead")
+    args = parser.parse_args()
+
+    responder = RESPONDERS[args.responder]
+    if args.cassette:
+        from .transport import Cassette
+        responder = Cassette(args.cassette).responder
+    server = FakeGeminiServer(
+        args.port, args.latency, args.fail_rate, responder, chunk_delay=args.chunk_delay
+    )
+    print(f"✅ Fake Gemini listening on {server.url} (set GEMINI_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
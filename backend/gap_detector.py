@@ -1,6 +1,21 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .gemini_client import EduMeshGemini
+from .prompt_encoding import (
+    DEFAULT_PROMPT_TOKENS,
+    CommunityEncoding,
+    encode_community,
+    encode_people,
+    people_from_state,
+)
+
+# Thought-store namespace for this agent's reasoning history
+THOUGHT_NAMESPACE = "gap_detector"
+
+RESPONSE_FORMAT = """Return a JSON array with:
+        - title
+        - severity (HIGH, MEDIUM, LOW)
+        - suggested_intervention (mention real people by name)"""
 
 class GapDetector:
     """
@@ -11,33 +26,58 @@ class GapDetector:
         self.gemini = gemini
         self.thought_signature_label = "edumesh-gap-detector-v1"
 
-    def detect_gaps(self, community_state: str) -> List[Dict[str, Any]]:
-        # 1. Parse the raw state to extract lists for constraints
+    def detect_gaps(self, community_state: str, token_budget: int = DEFAULT_PROMPT_TOKENS) -> List[Dict[str, Any]]:
+        # 1. Parse the raw state into the compact encoding when possible
         try:
             state_data = json.loads(community_state)
-            people = state_data.get("people", [])
-            community_people = [p["name"] for p in people]
-            
-            # Extract all unique skills from everyone
-            all_skills = set()
-            for p in people:
-                all_skills.update(p.get("skills", []))
-            community_skills = list(all_skills)
-            
         except json.JSONDecodeError:
-            # Fallback if state is not valid JSON
-            community_people = "Unknown"
-            community_skills = "Unknown"
+            state_data = None
 
+        if isinstance(state_data, dict):
+            return self.detect_gaps_encoded(
+                encode_people(people_from_state(state_data), token_budget)
+            )
+
+        # Fallback if state is not valid JSON
         prompt = f"""
         You are a community intelligence system.
 
-        IMPORTANT RULES:
-        - You may ONLY reference people from this list:
-          {community_people}
+        TASK:
+        Analyze the community graph and identify strategic skill gaps
+        and leadership opportunities using ONLY the provided people.
+        
+        Community Data:
+        {community_state}
+
+        {RESPONSE_FORMAT}
+        """
+        return self._run(prompt)
+
+    def detect_gaps_from_graph(self, db, token_budget: int = DEFAULT_PROMPT_TOKENS) -> List[Dict[str, Any]]:
+        """Encode the live graph directly (no raw JSON export) and analyze it."""
+        return self.detect_gaps_encoded(encode_community(db, token_budget))
+
+    def detect_gaps_encoded(self, encoding: CommunityEncoding) -> List[Dict[str, Any]]:
+        return self._run(self.build_prompt(encoding))
+
+    def stream_gaps_encoded(self, encoding: CommunityEncoding) -> Iterator[Dict[str, Any]]:
+        """Yield each gap as soon as the model finishes writing it."""
+        for gap in self.gemini.stream_json(self.build_prompt(encoding), namespace=THOUGHT_NAMESPACE):
+            if isinstance(gap, dict):
+                yield gap
 
-        - You may ONLY reference skills from this list:
-          {community_skills}
+    def build_prompt(self, encoding: CommunityEncoding) -> str:
+        scope = (
+            "one row per person"
+            if encoding.mode == "rows"
+            else "cluster summaries; only the listed members may be named"
+        )
+        return f"""
+        You are a community intelligence system.
+
+        IMPORTANT RULES:
+        - You may ONLY reference people named in the data below.
+        - You may ONLY reference skills listed in TERMS (ids map to names).
 
         DO NOT invent new names, roles, or skills.
 
@@ -45,16 +85,14 @@ class GapDetector:
         Analyze the community graph and identify strategic skill gaps
         and leadership opportunities using ONLY the provided people.
         
-        Community Data:
-        {community_state}
+        Community Data ({encoding.people} people, {scope}):
+        {encoding.text}
 
-        Return a JSON array with:
-        - title
-        - severity (HIGH, MEDIUM, LOW)
-        - suggested_intervention (mention real people by name)
+        {RESPONSE_FORMAT}
         """
-        
-        result = self.gemini.generate_json(prompt, thinking_level="HIGH")
+
+    def _run(self, prompt: str) -> List[Dict[str, Any]]:
+        result = self.gemini.generate_json(prompt, thinking_level="HIGH", namespace=THOUGHT_NAMESPACE)
         # Ensure result is a list, generate_json might return a dict if the model wraps it
         if isinstance(result, dict) and "gaps" in result:
             return result["gaps"]
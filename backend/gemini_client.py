@@ -1,123 +1,326 @@
-import os
 import json
-from typing import Optional, Dict, Any, List
+import time
+from typing import Callable, Optional, Dict, Any, Iterator, List, Tuple
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
-from PIL import Image
+
+from .image_prep import ImagePreprocessor, PreparedImage
+from .json_stream import JsonArrayStream
+from .metrics import METRICS
+from .response_cache import ResponseCache, cache_key
+from .thought_store import DEFAULT_NAMESPACE, ThoughtStore
+from .transport import resolve_transport
 
 # Load environment variables
 load_dotenv()
 
+JSON_INSTRUCTION = "IMPORTANT: Output ONLY valid JSON."
+
+
+def _parses(text: str) -> bool:
+    try:
+        json.loads(text)
+        return True
+    except (TypeError, json.JSONDecodeError):
+        return False
+
+
+def _thought_parts(response) -> List[str]:
+    """
+    Thought summaries from a response. The SDK flags thought parts with
+    `part.thought = True` and puts the summary in `part.text`.
+    """
+    thoughts = []
+    if hasattr(response, 'candidates') and response.candidates:
+         for part in response.candidates[0].content.parts or []:
+             if hasattr(part, 'thought') and part.thought:
+                 thoughts.append(part.text if part.thought is True else part.thought)
+    return thoughts
+
+
+def _answer_text(response) -> str:
+    """Non-thought text of one (streamed) response chunk."""
+    if not getattr(response, 'candidates', None):
+        return ""
+    content = response.candidates[0].content
+    parts = (content.parts or []) if content else []
+    return "".join(part.text for part in parts if part.text and not getattr(part, 'thought', None))
+
+
+def _array_items(value, key: Optional[str] = None) -> List[Any]:
+    """The elements a streamed array would have produced, for whole values."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        for name, inner in value.items():
+            if isinstance(inner, list) and key in (None, name):
+                return inner
+        return [value] if value else []
+    return []
+
+
 class EduMeshGemini:
     """
     Core client for interacting with Gemini 3 Pro.
-    Maintains persistent thought signature across calls.
+    Maintains persistent thought signature across calls, per agent
+    namespace, in a bounded store (see thought_store).
     """
-    def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        thoughts: Optional[ThoughtStore] = None,
+        images: Optional[ImagePreprocessor] = None
+    ):
+        # live / record / replay (see backend/transport.py); replay needs no key
+        self.transport = resolve_transport()
+        self.api_key = self.transport.api_key
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
-        self.client = genai.Client(api_key=self.api_key)
+        # A base URL points the SDK at a stand-in endpoint (see backend/fake_gemini.py)
+        base_url = self.transport.base_url
+        self.client = genai.Client(
+            api_key=self.api_key,
+            http_options=types.HttpOptions(base_url=base_url) if base_url else None
+        )
         self.model = "gemini-3-pro-preview" 
-        self.thought_signature: List[str] = [] 
+        self.thoughts = thoughts or ThoughtStore.from_env()
+        # Timing of the most recent stream_json call (time to first result, etc.)
+        self.last_stream: Dict[str, Any] = {}
+        # Responses keyed by model + config + prompt before thought injection (see response_cache)
+        self.cache = cache or ResponseCache.from_env()
+        # Downscaled, re-encoded images keyed by content hash (see image_prep)
+        self.images = images or ImagePreprocessor.from_env()
+        # Hit rates for the Performance panel / metrics export (see metrics)
+        METRICS.register_source("llm_cache", self.cache.stats)
+        METRICS.register_source("image_cache", self.images.stats)
         
-    def _add_thought_context(self, prompt: str) -> str:
+    @property
+    def thought_signature(self) -> List[str]:
+        """All stored thoughts, oldest first, across namespaces."""
+        return self.thoughts.thoughts()
+
+    def _add_thought_context(self, prompt: str, namespace: str = DEFAULT_NAMESPACE) -> str:
         """Injects previous thought signatures into the current prompt context."""
-        if not self.thought_signature:
+        recent = self.thoughts.context(namespace)  # newest few, within the token budget
+        if not recent:
             return prompt
         
-        signature_block = "\n".join([f"Previous Thought: {t}" for t in self.thought_signature[-3:]]) # Keep last 3
+        signature_block = "\n".join([f"Previous Thought: {t}" for t in recent])
         return f"{prompt}\n\n[SYSTEM: PREVIOUS THOUGHT SIGNATURES]\n{signature_block}\n[END SYSTEM]"
 
-    def generate_text(self, prompt: str, thinking_level: str = "HIGH") -> str:
+    def _generate_cached(
+        self,
+        contents: str,
+        config: types.GenerateContentConfig,
+        use_cache: bool,
+        cache_text: str,
+        accept: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, Any]:
         """
-        Generates text with thinking capabilities.
-        thinking_level: "HIGH" (simulated via strict instruction or config)
+        Returns {"text", "thoughts"} for one text-only call, from the
+        response cache (keyed by `cache_text`) when possible. `accept(text)`
+        decides whether a fresh response is worth storing; use_cache=False
+        skips lookup and store.
         """
+        key, cached = self._cache_lookup(cache_text, config, use_cache)
+        if cached is not None:
+            return cached
+
+        response = self._model_call(contents, config)
+        return self._cache_result(contents, config, key, response, accept)
+
+    def _model_call(self, contents, config):
+        """One uncached generate_content call, timed, with its token usage counted."""
+        with METRICS.timer("gemini.model_call"):
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config
+            )
+        METRICS.record_usage("gemini.model_call", response)
+        return response
+
+    def _cache_lookup(self, cache_text: str, config, use_cache: bool) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        if not use_cache:
+            return None, None
+        key = cache_key(self.model, config, cache_text)
+        return key, self.cache.get(key)
+
+    def _cache_result(self, contents, config, key: Optional[str], response, accept=None) -> Dict[str, Any]:
+        """Record the request as sent (`contents`) and cache the result under `key`."""
+        result = {"text": response.text, "thoughts": _thought_parts(response)}
+        self.transport.record(self.model, contents, config, result)
+        if key and (accept is None or accept(result["text"])):
+            self.cache.put(key, result)
+        return result
+
+    # -----------------------------
+    # Request / result shaping (shared with backend.gemini_pool)
+    # -----------------------------
+    # Each request builder also returns its cache text: the prompt BEFORE
+    # thought-context injection. Every answer adds thoughts to the store, so
+    # keying on the injected prompt would make every repeat a miss.
+
+    def _text_request(self, prompt: str, namespace: str = DEFAULT_NAMESPACE) -> Tuple[str, types.GenerateContentConfig, str]:
         # Enhance prompt with thought history
-        full_prompt = self._add_thought_context(prompt)
+        full_prompt = self._add_thought_context(prompt, namespace)
 
         # map "HIGH" to specific config if API supports it, essentially ensuring include_thoughts is True
         # and potentially setting a higher token budget for thoughts if that were an option.
         config = types.GenerateContentConfig(
             thinking_config=types.ThinkingConfig(include_thoughts=True)
         )
-        
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=full_prompt,
-            config=config
-        )
-        
-        # Capture thoughts if available to persist signature
-        if hasattr(response, 'candidates') and response.candidates:
-             for part in response.candidates[0].content.parts:
-                 if part.thought:
-                     if part.thought not in self.thought_signature:
-                        self.thought_signature.append(part.thought)
-        
-        return response.text
+        return full_prompt, config, prompt
 
-    def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, thinking_level: str = "HIGH") -> Dict[str, Any]:
-        """
-        Generates structured JSON output.
-        """
-        full_prompt = self._add_thought_context(prompt)
-        json_prompt = f"{full_prompt}\n\nIMPORTANT: Output ONLY valid JSON."
+    def _json_request(self, prompt: str, namespace: str = DEFAULT_NAMESPACE) -> Tuple[str, types.GenerateContentConfig, str]:
+        full_prompt = self._add_thought_context(prompt, namespace)
+        json_prompt = f"{full_prompt}\n\n{JSON_INSTRUCTION}"
         
         config = types.GenerateContentConfig(
              response_mime_type="application/json",
              thinking_config=types.ThinkingConfig(include_thoughts=True)
         )
+        return json_prompt, config, f"{prompt}\n\n{JSON_INSTRUCTION}"
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=json_prompt,
-            config=config
-        )
+    def _remember_thoughts(self, thoughts: List[str], namespace: str):
+        # Capture thoughts if available to persist signature (deduplicated by the store)
+        for thought in thoughts:
+            self.thoughts.add(thought, namespace)
 
-        # Persist thought similarly
-        if hasattr(response, 'candidates') and response.candidates:
-             for part in response.candidates[0].content.parts:
-                 if hasattr(part, 'thought') and part.thought: # Check attribute existence
-                     self.thought_signature.append(part.thought)
+    def _text_result(self, result: Dict[str, Any], namespace: str = DEFAULT_NAMESPACE) -> str:
+        self._remember_thoughts(result["thoughts"], namespace)
+        return result["text"]
+
+    def _json_result(self, result: Dict[str, Any], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Any]:
+        self._remember_thoughts(result["thoughts"], namespace)
 
         try:
-            return json.loads(response.text)
+            return json.loads(result["text"])
         except json.JSONDecodeError:
-            print(f"Failed to parse JSON: {response.text}")
+            print(f"Failed to parse JSON: {result['text']}")
             return {}
 
-    def generate_multimodal(self, prompt: str, image_path: str, thinking_level: str = "HIGH") -> str:
+    @METRICS.timed("gemini.generate_text")
+    def generate_text(self, prompt: str, thinking_level: str = "HIGH", use_cache: bool = True, namespace: str = DEFAULT_NAMESPACE) -> str:
+        """
+        Generates text with thinking capabilities.
+        thinking_level: "HIGH" (simulated via strict instruction or config)
+        use_cache: False forces a fresh model call (and does not store it).
+        namespace: agent whose thought history is injected and extended.
+        """
+        full_prompt, config, cache_text = self._text_request(prompt, namespace)
+        result = self._generate_cached(full_prompt, config, use_cache, cache_text)
+        return self._text_result(result, namespace)
+
+    @METRICS.timed("gemini.generate_json")
+    def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, thinking_level: str = "HIGH", use_cache: bool = True, namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Any]:
+        """
+        Generates structured JSON output.
+        Only responses that parse are cached.
+        """
+        json_prompt, config, cache_text = self._json_request(prompt, namespace)
+        result = self._generate_cached(json_prompt, config, use_cache, cache_text, accept=_parses)
+        return self._json_result(result, namespace)
+
+    def stream_json(
+        self, prompt: str, use_cache: bool = True, namespace: str = DEFAULT_NAMESPACE, array_key: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Streaming generate_json for prompts that ask for a JSON array:
+        yields each array element as soon as it is complete. Timing lands
+        in `self.last_stream` ({"ttfr_s", "total_s", "items", "cached"}).
+        An object reply streams its `array_key` member (default: its first
+        array member). A response without an array is parsed whole at the end and
+        its first list (or the object itself) is yielded instead.
+        """
+        json_prompt, config, cache_text = self._json_request(prompt, namespace)
+        start = time.perf_counter()
+        stats = self.last_stream = {"ttfr_s": None, "total_s": None, "items": 0, "cached": False}
+
+        def emit(item):
+            if stats["ttfr_s"] is None:
+                stats["ttfr_s"] = time.perf_counter() - start
+            stats["items"] += 1
+            return item
+
+        key, cached = self._cache_lookup(cache_text, config, use_cache)
+        if cached is not None:
+            stats["cached"] = True
+            for item in _array_items(self._json_result(cached, namespace), array_key):
+                yield emit(item)
+            stats["total_s"] = time.perf_counter() - start
+            self._observe_stream(stats)
+            return
+
+        parser = JsonArrayStream(array_key)
+        thoughts: List[str] = []
+        usage_chunk = None
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=json_prompt,
+            config=config
+        ):
+            thoughts.extend(_thought_parts(chunk))
+            if getattr(chunk, "usage_metadata", None) is not None:
+                usage_chunk = chunk
+            for item in parser.feed(_answer_text(chunk)):
+                yield emit(item)
+        # Streamed usage is cumulative: the last chunk carrying it has the totals
+        METRICS.record_usage("gemini.stream_json", usage_chunk)
+
+        result = {"text": parser.text, "thoughts": thoughts}
+        self.transport.record(self.model, json_prompt, config, result)
+        if key and _parses(parser.text):
+            self.cache.put(key, result)
+        parsed = self._json_result(result, namespace)
+        if not stats["items"]:
+            for item in _array_items(parsed, array_key):
+                yield emit(item)
+        stats["total_s"] = time.perf_counter() - start
+        self._observe_stream(stats)
+
+    @staticmethod
+    def _observe_stream(stats: Dict[str, Any]):
+        METRICS.observe("gemini.stream_json", stats["total_s"])
+        if stats["ttfr_s"] is not None:
+            METRICS.observe("gemini.stream_json.ttfr", stats["ttfr_s"])
+
+    def _multimodal_request(
+        self, prompt: str, image: PreparedImage, namespace: str = DEFAULT_NAMESPACE
+    ) -> Tuple[list, types.GenerateContentConfig, str]:
+        """
+        (contents, config, cache text). The cache text stands in for the
+        contents in the response-cache key: prompt + image hash.
+        """
+        full_prompt = self._add_thought_context(prompt, namespace)
+        config = types.GenerateContentConfig(
+            thinking_config=types.ThinkingConfig(include_thoughts=True)
+        )
+        contents = [full_prompt, types.Part.from_bytes(data=image.data, mime_type=image.mime_type)]
+        return contents, config, f"{prompt}\n\n[image sha256:{image.digest} {image.width}x{image.height}]"
+
+    @METRICS.timed("gemini.generate_multimodal")
+    def generate_multimodal(self, prompt: str, image_path: str, thinking_level: str = "HIGH", use_cache: bool = True, namespace: str = DEFAULT_NAMESPACE) -> str:
         """
         Generates content based on text and image.
+        The image is downscaled and re-encoded first (see image_prep);
+        answers are cached by prompt + image content hash.
         """
-        full_prompt = self._add_thought_context(prompt)
-        
         try:
-            image = Image.open(image_path)
+            image = self.images.prepare(image_path)
         except Exception as e:
             return f"Error loading image: {e}"
 
-        config = types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(include_thoughts=True)
-        )
+        contents, config, cache_text = self._multimodal_request(prompt, image, namespace)
+        key, cached = self._cache_lookup(cache_text, config, use_cache)
+        if cached is None:
+            response = self._model_call(contents, config)
+            cached = self._cache_result(contents, config, key, response)
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=[full_prompt, image],
-            config=config
-        )
-        
         # Persist thought
-        if hasattr(response, 'candidates') and response.candidates:
-             for part in response.candidates[0].content.parts:
-                 if hasattr(part, 'thought') and part.thought:
-                     self.thought_signature.append(part.thought)
-                     
-        return response.text
+        return self._text_result(cached, namespace)
     
     def get_thought_signature(self) -> List[str]:
         return self.thought_signature
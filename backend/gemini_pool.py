@@ -0,0 +1,288 @@
+import os
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from google.genai import errors
+
+from .gemini_client import EduMeshGemini, _parses
+from .image_prep import image_files
+from .metrics import METRICS
+from .thought_store import DEFAULT_NAMESPACE
+from .tokens import estimate_tokens
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MIN = 60
+DEFAULT_TOKENS_PER_MIN = 1_000_000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_DEADLINE_S = 120.0
+
+# Output tokens reserved per call before the real usage is known
+DEFAULT_OUTPUT_TOKENS = 1024
+# Input tokens reserved per image (a downscaled page is roughly this much)
+IMAGE_TOKENS = 1100
+
+# HTTP codes worth retrying: timeouts, rate limits, transient server errors
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, errors.APIError):
+        return exc.code in RETRYABLE_CODES
+    # Dropped connections / transport timeouts, from the OS or from httpx
+    return isinstance(exc, OSError) or type(exc).__module__.startswith("httpx")
+
+
+class TokenBucket:
+    """
+    Refills continuously at `per_minute / 60` units per second up to
+    `capacity` (one minute's worth by default). `wait_time` says how long
+    until units are available and `take` spends them; `charge` settles the
+    difference once the real cost is known, and may leave the bucket in debt.
+    """
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.clock = clock
+        self.level = self.capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def charge(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+
+class RateLimiter:
+    """requests/min and tokens/min buckets, acquired together in FIFO order."""
+    def __init__(self, requests_per_min: float, tokens_per_min: float):
+        self.requests = TokenBucket(requests_per_min)
+        self.tokens = TokenBucket(tokens_per_min)
+        self._lock: Optional[asyncio.Lock] = None
+
+    def bind(self):
+        """(Re)create the lock for the running event loop."""
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    def settle(self, reserved: int, used: int):
+        self.tokens.charge(used - reserved)
+
+
+class GeminiPool:
+    """
+    Async execution layer around EduMeshGemini.
+
+    Every call goes through the rate limiter (requests/min and tokens/min),
+    holds one of `max_concurrency` slots while in flight, and is retried on
+    retryable errors with full-jitter exponential backoff. `deadline` bounds
+    a call end to end, retries and rate-limit waits included. Responses use
+    the client's response cache and thought signature, so results match
+    the blocking generate_text / generate_json.
+
+    Point GEMINI_BASE_URL at backend/fake_gemini.py to run it offline.
+    """
+    def __init__(
+        self,
+        gemini: EduMeshGemini,
+        max_concurrency: int | None = None,
+        requests_per_min: float | None = None,
+        tokens_per_min: float | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: float | None = DEFAULT_DEADLINE_S
+    ):
+        self.gemini = gemini
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("GEMINI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        self.limiter = RateLimiter(
+            requests_per_min or float(os.getenv("GEMINI_REQUESTS_PER_MIN", DEFAULT_REQUESTS_PER_MIN)),
+            tokens_per_min or float(os.getenv("GEMINI_TOKENS_PER_MIN", DEFAULT_TOKENS_PER_MIN)),
+        )
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        METRICS.register_source("gemini_pool", self.stats)
+
+        # asyncio primitives belong to one event loop; rebuilt on loop change
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self.limiter.bind()
+
+    # -----------------------------
+    # Single calls
+    # -----------------------------
+
+    async def generate_text(
+        self,
+        prompt: str,
+        use_cache: bool = True,
+        deadline: float | None = None,
+        namespace: str = DEFAULT_NAMESPACE
+    ) -> str:
+        contents, config, cache_text = self.gemini._text_request(prompt, namespace)
+        result = await self._generate(contents, config, use_cache, None, deadline, cache_text=cache_text)
+        return self.gemini._text_result(result, namespace)
+
+    async def generate_json(
+        self,
+        prompt: str,
+        use_cache: bool = True,
+        deadline: float | None = None,
+        namespace: str = DEFAULT_NAMESPACE
+    ) -> Dict[str, Any]:
+        contents, config, cache_text = self.gemini._json_request(prompt, namespace)
+        result = await self._generate(contents, config, use_cache, _parses, deadline, cache_text=cache_text)
+        return self.gemini._json_result(result, namespace)
+
+    async def generate_multimodal(
+        self,
+        prompt: str,
+        image_path: str,
+        use_cache: bool = True,
+        deadline: float | None = None,
+        namespace: str = DEFAULT_NAMESPACE
+    ) -> str:
+        # Decoding / resizing is CPU work: keep it off the event loop
+        image = await asyncio.to_thread(self.gemini.images.prepare, image_path)
+        contents, config, cache_text = self.gemini._multimodal_request(prompt, image, namespace)
+        result = await self._generate(
+            contents, config, use_cache, None, deadline,
+            cache_text=cache_text, prompt_tokens=estimate_tokens(contents[0]) + IMAGE_TOKENS
+        )
+        return self.gemini._text_result(result, namespace)
+
+    async def _generate(
+        self,
+        contents,
+        config,
+        use_cache: bool,
+        accept,
+        deadline: float | None,
+        cache_text: str | None = None,
+        prompt_tokens: int | None = None
+    ):
+        """`cache_text` keys the response cache (see EduMeshGemini._text_request)."""
+        cache_text = cache_text or contents
+        key, cached = self.gemini._cache_lookup(cache_text, config, use_cache)
+        if cached is not None:
+            return cached
+
+        deadline = deadline if deadline is not None else self.deadline
+        call = self._call_with_retry(contents, config, prompt_tokens or estimate_tokens(contents))
+        response = await (asyncio.wait_for(call, deadline) if deadline else call)
+        return self.gemini._cache_result(contents, config, key, response, accept)
+
+    async def _call_with_retry(self, contents, config, prompt_tokens: int):
+        self._bind_loop()
+        reserved = prompt_tokens + (
+            getattr(config, "max_output_tokens", None) or DEFAULT_OUTPUT_TOKENS
+        )
+
+        attempt = 0
+        while True:
+            await self.limiter.acquire(reserved)
+            try:
+                async with self._slots:
+                    self.calls += 1
+                    with METRICS.timer("pool.model_call"):
+                        response = await self.gemini.client.aio.models.generate_content(
+                            model=self.gemini.model,
+                            contents=contents,
+                            config=config
+                        )
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise
+                attempt += 1
+                self.retries += 1
+                # Full jitter: uniform over [0, capped exponential]
+                await asyncio.sleep(
+                    random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                )
+                continue
+
+            METRICS.record_usage("pool.model_call", response)
+            usage = getattr(response, "usage_metadata", None)
+            used = getattr(usage, "total_token_count", None)
+            if used:
+                self.limiter.settle(reserved, used)
+            return response
+
+    # -----------------------------
+    # Fan-out
+    # -----------------------------
+
+    async def map(
+        self,
+        call: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        return_exceptions: bool = True
+    ) -> List[Any]:
+        """Run `call(item)` for every item; results in input order."""
+        return await asyncio.gather(
+            *(call(item) for item in items), return_exceptions=return_exceptions
+        )
+
+    def generate_json_many(self, prompts: Iterable[str], use_cache: bool = True) -> List[Any]:
+        """Blocking helper for scripts: concurrent generate_json over many prompts."""
+        return asyncio.run(
+            self.map(lambda p: self.generate_json(p, use_cache=use_cache), prompts)
+        )
+
+    def generate_multimodal_many(self, prompt: str, images, use_cache: bool = True) -> List[Tuple[str, Any]]:
+        """
+        Blocking helper for scanned-survey folders: `images` is a folder or
+        a list of paths. Returns (path, answer text or exception) in order.
+        """
+        paths = image_files(images) if isinstance(images, str) else list(images)
+        results = asyncio.run(
+            self.map(lambda path: self.generate_multimodal(prompt, path, use_cache=use_cache), paths)
+        )
+        return list(zip(paths, results))
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "retries": self.retries, "failures": self.failures}
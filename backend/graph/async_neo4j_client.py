@@ -0,0 +1,622 @@
+import os
+import uuid
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Any, Iterable, List, Sequence, Tuple
+from dotenv import load_dotenv
+from neo4j import AsyncGraphDatabase
+
+from ..metrics import METRICS
+from . import cypher
+from .compact_graph import CompactGraph
+from .entity_resolution import RESOLVED_RELATIONSHIPS, EntityResolver
+from .events import (
+    EDGE_ADDED,
+    EDGE_REMOVED,
+    NODE_ADDED,
+    NODE_REMOVED,
+    GraphEvent,
+    GraphListener,
+)
+from .neo4j_client import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE
+from .schema import (
+    LABEL_NEED,
+    LABEL_PERSON,
+    LABEL_SKILL,
+    NODE_KEYS,
+    REL_HAS_NEED,
+    REL_HAS_SKILL,
+    REL_MENTORS,
+)
+
+load_dotenv()
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncNeo4jClient:
+    """
+    asyncio twin of Neo4jClient for ingest and analysis jobs.
+
+    Same upsert / relationship / query / event surface, but every call is
+    a coroutine (iter_nodes / iter_edges are async generators) and bulk
+    writes keep up to `max_concurrency` UNWIND transactions in flight
+    instead of waiting on each round trip. Listeners are called as each
+    batch commits, from the event loop.
+    Construction does no I/O; use `await AsyncNeo4jClient.connect()`.
+    Falls back to an in-memory CompactGraph when Neo4j is unreachable.
+    """
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        resolver: EntityResolver | None = None
+    ):
+        self.uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        self.user = os.getenv("NEO4J_USER", "neo4j")
+        self.password = os.getenv("NEO4J_PASSWORD", "password")
+        self.batch_size = batch_size or int(
+            os.getenv("NEO4J_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        )
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("NEO4J_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+
+        self.driver = None
+        self.use_mock = False
+        self.mock_graph = CompactGraph()
+
+        # Caps in-flight transactions across ALL callers of this client
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        # Mutation events and cache token, as in Neo4jClient
+        self._listeners: List[GraphListener] = []
+        self.version = 0
+        self._instance = uuid.uuid4().hex[:12]
+
+        # Canonical Skill / Need names, as in Neo4jClient (see entity_resolution)
+        self.resolver = resolver or EntityResolver.from_env()
+        self._resolved_labels = set()
+
+    @classmethod
+    async def connect(cls, **kwargs) -> "AsyncNeo4jClient":
+        client = cls(**kwargs)
+        try:
+            client.driver = AsyncGraphDatabase.driver(
+                client.uri, auth=(client.user, client.password)
+            )
+            await client.driver.verify_connectivity()
+            print("✅ Connected to Neo4j (async) successfully.")
+        except Exception as e:
+            print(
+                f"⚠️ WARNING: Neo4j unavailable ({e}). "
+                "Switching to IN-MEMORY MOCK mode."
+            )
+            client.use_mock = True
+
+        if not client.use_mock:
+            await client.ensure_schema()
+        return client
+
+    async def close(self):
+        if self.driver:
+            await self.driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def ensure_schema(self):
+        if self.use_mock:
+            return
+
+        async with self.driver.session() as session:
+            for label, key, query in cypher.constraint_queries():
+                try:
+                    await (await session.run(query)).consume()
+                except Exception as e:
+                    print(f"⚠️ WARNING: Could not create {label}.{key} constraint ({e}).")
+
+    # -----------------------------
+    # Mutation Events
+    # -----------------------------
+
+    def subscribe(self, listener: GraphListener) -> Callable[[], None]:
+        """See Neo4jClient.subscribe."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @property
+    def cache_token(self) -> str:
+        """See Neo4jClient.cache_token."""
+        return f"{self._instance}:{self.version}"
+
+    def invalidate(self):
+        self.version += 1
+
+    def _emit(self, events: Iterable[GraphEvent]):
+        """
+        One committed write: the only place the version is bumped (once),
+        then each event goes to every listener. `events` is only iterated
+        when someone is listening.
+        """
+        self.version += 1
+        if self._listeners:
+            for event in events:
+                for listener in list(self._listeners):
+                    listener(event)
+
+    def _emit_nodes(self, label: str, rows: Iterable[Dict[str, Any]]):
+        key = NODE_KEYS[label]
+        self._emit(GraphEvent(NODE_ADDED, label=label, key=row[key], props=row) for row in rows)
+
+    def _emit_edges(self, rows: Iterable[Dict[str, Any]]):
+        self._emit(
+            GraphEvent(
+                EDGE_ADDED,
+                from_id=row["from"],
+                to_id=row["to"],
+                rel_type=row["type"],
+                props=row.get("props") or {}
+            )
+            for row in rows
+        )
+
+    # -----------------------------
+    # Transactions
+    # -----------------------------
+
+    @staticmethod
+    async def _run_statements(tx, statements):
+        for query, params in statements:
+            await (await tx.run(query, **params)).consume()
+
+    async def _write(self, statements: List[Tuple[str, Dict[str, Any]]]):
+        """One write transaction, holding a concurrency slot while in flight."""
+        async with self._slots:
+            with METRICS.timer("neo4j_async.write_tx"):
+                async with self.driver.session() as session:
+                    await session.execute_write(self._run_statements, statements)
+
+    async def _read(self, query: str, **params) -> List[Any]:
+        async with self._slots:
+            with METRICS.timer("neo4j_async.read"):
+                async with self.driver.session() as session:
+                    result = await session.run(query, **params)
+                    return [record async for record in result]
+
+    async def _write_batches(
+        self,
+        rows,
+        build_queries,
+        batch_size: int | None,
+        on_commit: Callable[[List[Any]], None] | None = None
+    ) -> int:
+        """
+        Pipeline batches: keep up to max_concurrency transactions in flight,
+        pulling the next batch from `rows` only when a slot frees up, so
+        memory stays bounded for generator inputs. `on_commit(batch)` runs
+        after each batch's transaction commits.
+        """
+        written = 0
+        in_flight = set()
+
+        async def write_batch(batch):
+            await self._write([
+                (query, {"rows": params}) for query, params in build_queries(batch)
+            ])
+            if on_commit:
+                on_commit(batch)
+            return len(batch)
+
+        try:
+            for batch in cypher.chunked(rows, batch_size or self.batch_size):
+                if len(in_flight) >= self.max_concurrency:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    written += sum(task.result() for task in done)
+                in_flight.add(asyncio.create_task(write_batch(batch)))
+
+            if in_flight:
+                written += sum(await asyncio.gather(*in_flight))
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+        return written
+
+    # -----------------------------
+    # Node Upserts
+    # -----------------------------
+
+    @METRICS.timed("neo4j_async.upsert_person")
+    async def upsert_person(self, person_data: Dict[str, Any]):
+        await self.bulk_upsert_people([person_data])
+
+    @METRICS.timed("neo4j_async.upsert_skill")
+    async def upsert_skill(self, skill_name: str):
+        await self.bulk_upsert_skills([skill_name])
+
+    @METRICS.timed("neo4j_async.upsert_need")
+    async def upsert_need(self, need_name: str):
+        await self.bulk_upsert_needs([need_name])
+
+    @METRICS.timed("neo4j_async.bulk_upsert_people")
+    async def bulk_upsert_people(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int | None = None
+    ) -> int:
+        on_commit = lambda batch: self._emit_nodes(LABEL_PERSON, batch)
+        if self.use_mock:
+            return await self._mock_bulk(
+                rows,
+                lambda person: self.mock_graph.add_node(person["id"], LABEL_PERSON, person),
+                batch_size,
+                on_commit,
+            )
+
+        query = cypher.upsert_people_query()
+        return await self._write_batches(rows, lambda batch: [(query, batch)], batch_size, on_commit)
+
+    @METRICS.timed("neo4j_async.bulk_upsert_skills")
+    async def bulk_upsert_skills(
+        self,
+        names: Iterable[str],
+        batch_size: int | None = None
+    ) -> int:
+        return await self._bulk_upsert_named(LABEL_SKILL, names, batch_size)
+
+    @METRICS.timed("neo4j_async.bulk_upsert_needs")
+    async def bulk_upsert_needs(
+        self,
+        names: Iterable[str],
+        batch_size: int | None = None
+    ) -> int:
+        return await self._bulk_upsert_named(LABEL_NEED, names, batch_size)
+
+    async def _bulk_upsert_named(self, label: str, names, batch_size):
+        names = await self._canonical_names(label, names)
+        on_commit = lambda batch: self._emit_nodes(label, [{"name": name} for name in batch])
+        if self.use_mock:
+            return await self._mock_bulk(
+                names,
+                lambda name: self.mock_graph.add_node(name, label, {"name": name}),
+                batch_size,
+                on_commit,
+            )
+
+        query = cypher.upsert_named_query(label)
+        return await self._write_batches(names, lambda batch: [(query, batch)], batch_size, on_commit)
+
+    @METRICS.timed("neo4j_async.delete_node")
+    async def delete_node(self, label: str, key: str):
+        """DETACH DELETE the node with this label + key property."""
+        if self.use_mock:
+            self.mock_graph.remove_node(key)
+        else:
+            await self._write([(cypher.delete_node_query(label), {"key": key})])
+
+        self._emit([GraphEvent(NODE_REMOVED, label=label, key=key)])
+
+    # -----------------------------
+    # Relationships
+    # -----------------------------
+
+    @METRICS.timed("neo4j_async.create_relationship")
+    async def create_relationship(
+        self,
+        from_id: str,
+        to_id: str,
+        rel_type: str,
+        props: Dict[str, Any] | None = None
+    ):
+        await self.bulk_create_relationships(
+            [{"from": from_id, "to": to_id, "type": rel_type, "props": props}]
+        )
+
+    @METRICS.timed("neo4j_async.create_typed_relationship")
+    async def create_typed_relationship(
+        self,
+        from_label: str,
+        from_id: str,
+        to_label: str,
+        to_id: str,
+        rel_type: str,
+        props: Dict[str, Any] | None = None
+    ):
+        """See Neo4jClient.create_typed_relationship."""
+        if props is None:
+            props = {}
+        if to_label in (LABEL_SKILL, LABEL_NEED):
+            names = await self._canonical_names(to_label, [to_id])
+            to_id = next(iter(names))
+
+        if self.use_mock:
+            self.mock_graph.add_edge(from_id, to_id, rel_type, props)
+        else:
+            query = cypher.typed_relationship_query(from_label, to_label, rel_type, unwind=True)
+            await self._write([(query, {"rows": [{"from": from_id, "to": to_id, "props": props}]})])
+
+        self._emit_edges([{"from": from_id, "to": to_id, "type": rel_type, "props": props}])
+
+    @METRICS.timed("neo4j_async.delete_relationship")
+    async def delete_relationship(self, from_id: str, to_id: str, rel_type: str):
+        if self.use_mock:
+            self.mock_graph.remove_edge(from_id, to_id, rel_type)
+        else:
+            await self._write([
+                (cypher.delete_relationship_query(rel_type), {"from_id": from_id, "to_id": to_id})
+            ])
+
+        self._emit([GraphEvent(
+            EDGE_REMOVED, from_id=from_id, to_id=to_id, rel_type=rel_type
+        )])
+
+    async def link_person_skill(self, person_id: str, skill_name: str, props=None):
+        await self.create_relationship(person_id, skill_name, REL_HAS_SKILL, props)
+
+    async def link_person_need(self, person_id: str, need_name: str, props=None):
+        await self.create_relationship(person_id, need_name, REL_HAS_NEED, props)
+
+    async def link_mentor(self, mentor_id: str, mentee_id: str, props=None):
+        await self.create_relationship(mentor_id, mentee_id, REL_MENTORS, props)
+
+    @METRICS.timed("neo4j_async.bulk_create_relationships")
+    async def bulk_create_relationships(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int | None = None
+    ) -> int:
+        """rows: dicts with "from", "to", "type" and optional "props"."""
+        rows = await self._canonical_rows(rows)
+        if self.use_mock:
+            return await self._mock_bulk(
+                rows,
+                lambda row: self.mock_graph.add_edge(
+                    row["from"], row["to"], row["type"], row.get("props")
+                ),
+                batch_size,
+                self._emit_edges,
+            )
+
+        return await self._write_batches(rows, cypher.relationship_statements, batch_size, self._emit_edges)
+
+    # -----------------------------
+    # Fetching and Streaming Iteration
+    # -----------------------------
+    # Same shapes and keyset pagination as Neo4jClient; one page in memory.
+
+    @METRICS.timed("neo4j_async.get_all_nodes")
+    async def get_all_nodes(self):
+        if self.use_mock:
+            return list(self.mock_graph.nodes(data=True))
+
+        return [record["n"] for record in await self._read(cypher.all_nodes_query())]
+
+    async def iter_nodes(
+        self,
+        label: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (key, {"labels": label, **props}); see Neo4jClient.iter_nodes."""
+        if label is not None:
+            cypher.check_label(label)
+        if self.use_mock:
+            for row in self.mock_graph.iter_nodes(label, properties):
+                yield row
+            return
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for node_label in [label] if label else list(NODE_KEYS):
+            query = cypher.node_page_query(node_label, properties)
+            after = ""
+            while after is not None:
+                page = await self._read(query, after=after, limit=page_size)
+                for record in page:
+                    yield record["key"], {"labels": node_label, **record["props"]}
+                after = cypher.next_node_page([record["key"] for record in page], page_size)
+
+    async def iter_edges(
+        self,
+        rel_type: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> AsyncIterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (from_key, to_key, {"type": rel_type, **props}); see Neo4jClient.iter_edges."""
+        if self.use_mock:
+            for row in self.mock_graph.edges(data=True, rel_type=rel_type, properties=properties):
+                yield row
+            return
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for from_label, type_filter in cypher.edge_page_sources(rel_type):
+            query = cypher.edge_page_query(from_label, type_filter, properties)
+            after = ""
+            while after is not None:
+                page = await self._read(query, after=after, limit=page_size)
+                for record in page:
+                    if record["type"] is not None:
+                        yield record["from_key"], record["to_key"], {"type": record["type"], **record["props"]}
+                after = cypher.next_edge_page([record["from_key"] for record in page], page_size)
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+
+    @METRICS.timed("neo4j_async.get_nodes_by_label")
+    async def get_nodes_by_label(self, label: str) -> List[Tuple[str, Dict[str, Any]]]:
+        cypher.check_label(label)
+        if self.use_mock:
+            return list(self.mock_graph.iter_nodes(label=label))
+
+        records = await self._read(cypher.label_nodes_query(label))
+        return [cypher.node_row(record["n"]) for record in records]
+
+    @METRICS.timed("neo4j_async.count_nodes")
+    async def count_nodes(self, label: str | None = None) -> int:
+        query = cypher.count_nodes_query(label)
+        if self.use_mock:
+            if label is None:
+                return self.mock_graph.number_of_nodes()
+            return self.mock_graph.count_label(label)
+
+        records = await self._read(query)
+        return records[0]["c"]
+
+    @METRICS.timed("neo4j_async.people_with_skill")
+    async def people_with_skill(self, skill_name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return await self._people_linked_to(self.resolver.lookup(skill_name, LABEL_SKILL), REL_HAS_SKILL)
+
+    @METRICS.timed("neo4j_async.people_with_need")
+    async def people_with_need(self, need_name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return await self._people_linked_to(self.resolver.lookup(need_name, LABEL_NEED), REL_HAS_NEED)
+
+    async def _people_linked_to(self, name: str, rel_type: str):
+        if self.use_mock:
+            graph = self.mock_graph
+            return [
+                (person_id, graph.get_node(person_id))
+                for person_id in graph.predecessors(name, rel_type)
+                if graph.label_of(person_id) == LABEL_PERSON
+            ]
+
+        records = await self._read(cypher.people_linked_query(rel_type), name=name)
+        return [cypher.node_row(record["p"]) for record in records]
+
+    # -----------------------------
+    # Columnar export
+    # -----------------------------
+    # Same shapes as Neo4jClient.node_columns / edge_columns.
+
+    @METRICS.timed("neo4j_async.node_columns")
+    async def node_columns(
+        self,
+        label: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Dict[str, List[Any]]:
+        if label is not None:
+            cypher.check_label(label)
+        if self.use_mock:
+            return self.mock_graph.node_columns(label, properties)
+
+        labels = [label] if label else list(NODE_KEYS)
+        if properties is None:
+            properties = sorted({key for node_label in labels for key in await self._property_keys(label=node_label)})
+        keys: List[Any] = []
+        label_column: List[str] = []
+        values = [[] for _ in properties]
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for node_label in labels:
+            query = cypher.node_columns_query(node_label, properties)
+            start = len(keys)
+            after = ""
+            while after is not None:
+                page = [record.values() for record in await self._read(query, after=after, limit=page_size)]
+                cypher.extend_columns([keys, *values], page)
+                after = cypher.next_node_page([row[0] for row in page], page_size)
+            label_column.extend([node_label] * (len(keys) - start))
+
+        columns: Dict[str, List[Any]] = {"key": keys}
+        if label is None:
+            columns["labels"] = label_column
+        columns.update(zip(properties, values))
+        return columns
+
+    @METRICS.timed("neo4j_async.edge_columns")
+    async def edge_columns(
+        self,
+        rel_type: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Dict[str, List[Any]]:
+        if self.use_mock:
+            return self.mock_graph.edge_columns(rel_type, properties)
+
+        if properties is None:
+            properties = sorted(await self._property_keys(rel_type=rel_type))
+        sources: List[Any] = []
+        targets: List[Any] = []
+        types: List[str] = []
+        values = [[] for _ in properties]
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for from_label, type_filter in cypher.edge_page_sources(rel_type):
+            query = cypher.edge_columns_query(from_label, type_filter, properties)
+            after = ""
+            while after is not None:
+                page = [record.values() for record in await self._read(query, after=after, limit=page_size)]
+                cypher.extend_columns([sources, types, targets, *values], [row for row in page if row[1] is not None])
+                after = cypher.next_edge_page([row[0] for row in page], page_size)
+
+        return {"from": sources, "to": targets, "type": types, **dict(zip(properties, values))}
+
+    async def _property_keys(self, label: str | None = None, rel_type: str | None = None) -> List[str]:
+        records = await self._read(cypher.property_keys_query(label, rel_type))
+        return records[0]["keys"]
+
+    # -----------------------------
+    # Entity resolution
+    # -----------------------------
+
+    async def _seed(self, label: str):
+        """Seed the resolver from the label's keys (paged, no properties), as Neo4jClient does."""
+        if label not in self._resolved_labels:
+            self._resolved_labels.add(label)
+            keys = [key async for key, _ in self.iter_nodes(label, properties=[])]
+            self.resolver.seed(label, keys)
+
+    async def _canonical_names(self, label: str, names: Iterable[str]) -> Iterable[str]:
+        if not self.resolver.enabled:
+            return names
+        await self._seed(label)
+        return (self.resolver.resolve(name, label) for name in names)
+
+    async def _canonical_rows(self, rows: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Relationship rows with HAS_SKILL / HAS_NEED targets resolved."""
+        if not self.resolver.enabled:
+            return rows
+        for label in RESOLVED_RELATIONSHIPS.values():
+            await self._seed(label)
+
+        def resolved():
+            for row in rows:
+                label = RESOLVED_RELATIONSHIPS.get(row["type"])
+                if label is not None:
+                    canonical = self.resolver.resolve(row["to"], label)
+                    if canonical != row["to"]:
+                        row = dict(row, to=canonical)
+                yield row
+        return resolved()
+
+    # -----------------------------
+    # In-memory backend
+    # -----------------------------
+
+    async def _mock_bulk(
+        self,
+        rows,
+        apply,
+        batch_size: int | None,
+        on_commit: Callable[[List[Any]], None] | None = None
+    ) -> int:
+        """
+        Apply rows to the in-memory graph batch by batch, yielding to the
+        event loop between batches so concurrent jobs interleave the way
+        they would against Neo4j. Each batch is applied atomically, then
+        `on_commit(batch)` runs.
+        """
+        count = 0
+        for batch in cypher.chunked(rows, batch_size or self.batch_size):
+            for row in batch:
+                apply(row)
+            if on_commit:
+                on_commit(batch)
+            count += len(batch)
+            await asyncio.sleep(0)
+        return count
@@ -0,0 +1,595 @@
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from operator import sub
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Label id marking a removed node handle (handles are never reused)
+DELETED = -1
+
+# Tail edges / tombstones tolerated before a relationship type is re-packed
+COMPACT_MIN_TAIL = 4096
+
+
+def _merge_csr(
+    ptr: array,
+    idx: array,
+    tail: Dict[int, List[int]],
+    removed: set,
+    n: int,
+    reverse: bool
+) -> Tuple[array, array]:
+    """
+    Re-pack one CSR direction to `n` rows: rows with tail entries or
+    tombstones are rebuilt (sorted); the untouched spans between them are
+    copied as whole array slices, so a re-pack never sorts the full graph.
+    """
+    rows = len(ptr) - 1
+    lengths = list(map(sub, ptr[1:], ptr[:-1]))
+    lengths.extend([0] * (n - rows))
+
+    dropped: Dict[int, set] = {}
+    for src, dst in removed:
+        node, other = (dst, src) if reverse else (src, dst)
+        dropped.setdefault(node, set()).add(other)
+
+    new_idx = array("i")
+    copied = 0
+    for node in sorted(tail.keys() | dropped.keys()):
+        lo, hi = (ptr[node], ptr[node + 1]) if node < rows else (len(idx), len(idx))
+        new_idx.extend(idx[copied:lo])
+        row = idx[lo:hi].tolist()
+        gone = dropped.get(node)
+        if gone:
+            row = [other for other in row if other not in gone]
+        extra = tail.get(node)
+        if extra:
+            row += extra
+            row.sort()
+        new_idx.extend(row)
+        lengths[node] = len(row)
+        copied = hi
+    new_idx.extend(idx[copied:])
+
+    return array("q", accumulate(lengths, initial=0)), new_idx
+
+
+def _gather(values: Sequence[Any], handles: Sequence[int]) -> List[Any]:
+    """values[h] for every handle, in one C-level pass (no per-row Python frames)."""
+    return list(map(values.__getitem__, handles))
+
+
+def _as_numpy(values: array) -> np.ndarray:
+    """Zero-copy numpy view of an array.array."""
+    return np.frombuffer(values, dtype=f"i{values.itemsize}")
+
+
+class _Adjacency:
+    """
+    All edges of ONE relationship type.
+    Packed edges live in forward (out) and reverse (in) CSR arrays with
+    sorted rows; new edges land in an append tail and removed packed
+    edges are tombstoned. Both are folded back in by compact().
+    """
+    __slots__ = (
+        "out_ptr", "out_idx", "in_ptr", "in_idx",
+        "tail_out", "tail_in", "tail_size", "removed", "props", "size",
+    )
+
+    def __init__(self):
+        self.out_ptr = array("q", [0])
+        self.out_idx = array("i")
+        self.in_ptr = array("q", [0])
+        self.in_idx = array("i")
+        self.tail_out: Dict[int, List[int]] = {}
+        self.tail_in: Dict[int, List[int]] = {}
+        self.tail_size = 0
+        self.removed: set = set()
+        # Edge properties are sparse: only edges that carry any are stored
+        self.props: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.size = 0
+
+    @staticmethod
+    def _row(ptr: array, node: int) -> Tuple[int, int]:
+        if node + 1 >= len(ptr):
+            return 0, 0
+        return ptr[node], ptr[node + 1]
+
+    def _packed(self, src: int, dst: int) -> bool:
+        lo, hi = self._row(self.out_ptr, src)
+        i = bisect_left(self.out_idx, dst, lo, hi)
+        return i < hi and self.out_idx[i] == dst
+
+    def has(self, src: int, dst: int) -> bool:
+        if (src, dst) in self.removed:
+            return False
+        return dst in self.tail_out.get(src, ()) or self._packed(src, dst)
+
+    def add(self, src: int, dst: int) -> bool:
+        """Returns True if the edge is new."""
+        if (src, dst) in self.removed:
+            self.removed.discard((src, dst))
+            self.size += 1
+            return True
+        if self.has(src, dst):
+            return False
+
+        self.tail_out.setdefault(src, []).append(dst)
+        self.tail_in.setdefault(dst, []).append(src)
+        self.tail_size += 1
+        self.size += 1
+        return True
+
+    def remove(self, src: int, dst: int) -> bool:
+        if (src, dst) in self.removed:
+            return False
+
+        tail = self.tail_out.get(src)
+        if tail and dst in tail:
+            tail.remove(dst)
+            if not tail:
+                del self.tail_out[src]
+            tail = self.tail_in[dst]
+            tail.remove(src)
+            if not tail:
+                del self.tail_in[dst]
+            self.tail_size -= 1
+        elif self._packed(src, dst):
+            self.removed.add((src, dst))
+        else:
+            return False
+
+        self.props.pop((src, dst), None)
+        self.size -= 1
+        return True
+
+    def successors(self, src: int) -> List[int]:
+        lo, hi = self._row(self.out_ptr, src)
+        row = self.out_idx[lo:hi].tolist()
+        if self.removed:
+            row = [dst for dst in row if (src, dst) not in self.removed]
+        return row + self.tail_out.get(src, [])
+
+    def predecessors(self, dst: int) -> List[int]:
+        lo, hi = self._row(self.in_ptr, dst)
+        row = self.in_idx[lo:hi].tolist()
+        if self.removed:
+            row = [src for src in row if (src, dst) not in self.removed]
+        return row + self.tail_in.get(dst, [])
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        for src in range(len(self.out_ptr) - 1):
+            lo, hi = self.out_ptr[src], self.out_ptr[src + 1]
+            for k in range(lo, hi):
+                dst = self.out_idx[k]
+                if (src, dst) not in self.removed:
+                    yield src, dst
+        for src, dsts in self.tail_out.items():
+            for dst in dsts:
+                yield src, dst
+
+    def pair_lists(self) -> Tuple[List[int], List[int]]:
+        """
+        (sources, targets) of every live edge, in pairs() order. The packed
+        part is expanded from the CSR arrays with numpy instead of walking
+        rows in Python.
+        """
+        ptr = _as_numpy(self.out_ptr)
+        dst = _as_numpy(self.out_idx)
+        src = np.repeat(np.arange(len(ptr) - 1, dtype=np.int64), np.diff(ptr))
+        if self.removed:
+            # Packed targets are < rows, so src * rows + dst is a unique edge code
+            rows = max(len(ptr) - 1, 1)
+            gone = np.fromiter((s * rows + d for s, d in self.removed), dtype=np.int64, count=len(self.removed))
+            keep = ~np.isin(src * rows + dst, gone)
+            src, dst = src[keep], dst[keep]
+
+        sources, targets = src.tolist(), dst.tolist()
+        for node, tail in self.tail_out.items():
+            sources.extend([node] * len(tail))
+            targets.extend(tail)
+        return sources, targets
+
+    def needs_compaction(self) -> bool:
+        # Pending work may grow to the packed size before a re-pack, which
+        # keeps the amortized cost of inserts O(1) during bulk loads.
+        pending = self.tail_size + len(self.removed)
+        return pending > max(COMPACT_MIN_TAIL, len(self.out_idx))
+
+    def compact(self, n: int):
+        self.out_ptr, self.out_idx = _merge_csr(
+            self.out_ptr, self.out_idx, self.tail_out, self.removed, n, reverse=False
+        )
+        self.in_ptr, self.in_idx = _merge_csr(
+            self.in_ptr, self.in_idx, self.tail_in, self.removed, n, reverse=True
+        )
+        self.tail_out = {}
+        self.tail_in = {}
+        self.tail_size = 0
+        self.removed = set()
+
+
+class _NodeView:
+    """networkx-style `graph.nodes` / `graph.nodes(data=True)` / `graph.nodes[id]`."""
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: "CompactGraph"):
+        self._graph = graph
+
+    def __call__(self, data: bool = False):
+        if data:
+            return self._graph.iter_nodes()
+        return (node_id for node_id, _ in self._graph.iter_nodes())
+
+    def __getitem__(self, node_id: str) -> Dict[str, Any]:
+        node = self._graph.get_node(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        return node
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._graph._index
+
+    def __iter__(self):
+        return self(data=False)
+
+    def __len__(self) -> int:
+        return self._graph.number_of_nodes()
+
+
+class CompactGraph:
+    """
+    Memory-compact in-memory property graph used by Neo4jClient mock mode.
+
+    - Node ids are interned strings mapped to integer handles.
+    - Labels are a small-int array into a label table.
+    - Properties are columnar: one list per property key, indexed by handle.
+    - Edges are stored per relationship type as CSR arrays (see _Adjacency).
+
+    Read APIs mirror the parts of networkx.DiGraph the app relies on
+    (nodes(data=True), nodes[id], edges(data=True), has_edge).
+    """
+
+    def __init__(self):
+        self._ids: List[Optional[str]] = []
+        self._index: Dict[str, int] = {}
+        self._label_names: List[str] = [""]  # 0 = unlabeled
+        self._label_ids: Dict[str, int] = {"": 0}
+        self._node_label = array("h")
+        # Label index: label id -> handles carrying it
+        self._by_label: List[set] = [set()]
+        self._columns: Dict[str, List[Any]] = {}
+        self._rels: Dict[str, _Adjacency] = {}
+        self._live = 0
+
+        # Optional mutation hook (see graph_store.MockGraphStore): called
+        # with a JSON-able record after every add/remove is applied.
+        self.journal: Optional[Callable[[list], None]] = None
+
+    # -----------------------------
+    # Nodes
+    # -----------------------------
+
+    def _label_id(self, label: str) -> int:
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self._label_names)
+            self._label_names.append(label)
+            self._label_ids[label] = label_id
+            self._by_label.append(set())
+        return label_id
+
+    def add_node(
+        self,
+        node_id: str,
+        label: Optional[str] = None,
+        props: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Insert or update a node (MERGE + SET +=). Returns its handle."""
+        handle = self._index.get(node_id)
+        if handle is None:
+            handle = len(self._ids)
+            self._ids.append(sys.intern(node_id))
+            self._index[self._ids[handle]] = handle
+            label_id = self._label_id(label) if label else 0
+            self._node_label.append(label_id)
+            self._by_label[label_id].add(handle)
+            for column in self._columns.values():
+                column.append(None)
+            self._live += 1
+        elif label:
+            label_id = self._label_id(label)
+            self._by_label[self._node_label[handle]].discard(handle)
+            self._by_label[label_id].add(handle)
+            self._node_label[handle] = label_id
+
+        for key, value in (props or {}).items():
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = [None] * len(self._ids)
+            column[handle] = value
+
+        if self.journal is not None:
+            self.journal(["n", node_id, label, props])
+        return handle
+
+    def remove_node(self, node_id: str) -> bool:
+        """Remove a node and every relationship touching it (DETACH DELETE)."""
+        handle = self._index.pop(node_id, None)
+        if handle is None:
+            return False
+
+        for adjacency in self._rels.values():
+            for dst in adjacency.successors(handle):
+                adjacency.remove(handle, dst)
+            for src in adjacency.predecessors(handle):
+                adjacency.remove(src, handle)
+
+        self._by_label[self._node_label[handle]].discard(handle)
+        self._node_label[handle] = DELETED
+        self._ids[handle] = None
+        for column in self._columns.values():
+            column[handle] = None
+        self._live -= 1
+
+        if self.journal is not None:
+            self.journal(["rn", node_id])
+        return True
+
+    def _node_data(
+        self,
+        handle: int,
+        properties: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        label_id = self._node_label[handle]
+        if label_id > 0:
+            data["labels"] = self._label_names[label_id]
+        if properties is None:
+            columns = self._columns.items()
+        else:
+            # Projection only touches the requested columns
+            columns = [(key, self._columns[key]) for key in properties if key in self._columns]
+        for key, column in columns:
+            value = column[handle]
+            if value is not None:
+                data[key] = value
+        return data
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        handle = self._index.get(node_id)
+        if handle is None:
+            return None
+        return self._node_data(handle)
+
+    def iter_nodes(
+        self,
+        label: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Lazily yield (node_id, data) in insertion order.
+        With a label, only that label's handles are visited (label index);
+        with properties, data holds only those keys (plus "labels").
+        """
+        if label is None:
+            handles = (h for h, node_id in enumerate(self._ids) if node_id is not None)
+        else:
+            label_id = self._label_ids.get(label)
+            if label_id is None:
+                return
+            handles = sorted(self._by_label[label_id])
+        for handle in handles:
+            yield self._ids[handle], self._node_data(handle, properties)
+
+    def count_label(self, label: str) -> int:
+        label_id = self._label_ids.get(label)
+        return len(self._by_label[label_id]) if label_id is not None else 0
+
+    def label_of(self, node_id: str) -> Optional[str]:
+        handle = self._index.get(node_id)
+        if handle is None:
+            return None
+        return self._label_names[self._node_label[handle]] or None
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    def number_of_nodes(self) -> int:
+        return self._live
+
+    # -----------------------------
+    # Relationships
+    # -----------------------------
+
+    def add_edge(
+        self,
+        from_id: str,
+        to_id: str,
+        rel_type: str,
+        props: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        MERGE (a)-[:rel_type]->(b) SET r += props.
+        Missing endpoints are created unlabeled, like networkx.add_edge.
+        Returns True if the edge is new.
+        """
+        src = self._index.get(from_id)
+        if src is None:
+            src = self.add_node(from_id)
+        dst = self._index.get(to_id)
+        if dst is None:
+            dst = self.add_node(to_id)
+
+        adjacency = self._rels.get(rel_type)
+        if adjacency is None:
+            adjacency = self._rels[rel_type] = _Adjacency()
+
+        created = adjacency.add(src, dst)
+        if props:
+            adjacency.props.setdefault((src, dst), {}).update(props)
+        if adjacency.needs_compaction():
+            adjacency.compact(len(self._ids))
+
+        if self.journal is not None:
+            self.journal(["e", from_id, to_id, rel_type, props])
+        return created
+
+    def remove_edge(self, from_id: str, to_id: str, rel_type: str) -> bool:
+        src = self._index.get(from_id)
+        dst = self._index.get(to_id)
+        adjacency = self._rels.get(rel_type)
+        if src is None or dst is None or adjacency is None:
+            return False
+        if not adjacency.remove(src, dst):
+            return False
+        if self.journal is not None:
+            self.journal(["re", from_id, to_id, rel_type])
+        return True
+
+    def has_edge(self, from_id: str, to_id: str, rel_type: Optional[str] = None) -> bool:
+        src = self._index.get(from_id)
+        dst = self._index.get(to_id)
+        if src is None or dst is None:
+            return False
+        if rel_type is not None:
+            adjacency = self._rels.get(rel_type)
+            return adjacency is not None and adjacency.has(src, dst)
+        return any(adj.has(src, dst) for adj in self._rels.values())
+
+    def edges(
+        self,
+        data: bool = False,
+        rel_type: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple]:
+        """
+        Yields (from_id, to_id) or (from_id, to_id, {"type": ..., **props}).
+        With properties, only those edge properties are included.
+        """
+        ids = self._ids
+        for name, adjacency in self._rel_items(rel_type):
+            edge_props = adjacency.props
+            for src, dst in adjacency.pairs():
+                if not data:
+                    yield ids[src], ids[dst]
+                    continue
+                props = edge_props.get((src, dst), {}) if edge_props else {}
+                if properties is not None:
+                    props = {key: props[key] for key in properties if key in props}
+                yield ids[src], ids[dst], {"type": name, **props}
+
+    # -----------------------------
+    # Columnar export
+    # -----------------------------
+    # Whole columns at once, for DataFrame / Arrow construction: handles are
+    # gathered with C-level map passes over the property columns, and edge
+    # endpoints come straight from the CSR arrays. No per-row dicts.
+
+    def _handles(self, label: Optional[str]) -> List[int]:
+        if label is None:
+            return [h for h, node_id in enumerate(self._ids) if node_id is not None]
+        label_id = self._label_ids.get(label)
+        return sorted(self._by_label[label_id]) if label_id is not None else []
+
+    def node_columns(
+        self,
+        label: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        {"key": [...], **{prop: [...]}} in iter_nodes order; missing values
+        are None. Without a label a "labels" column is added.
+        """
+        handles = self._handles(label)
+        columns: Dict[str, List[Any]] = {"key": _gather(self._ids, handles)}
+        if label is None:
+            columns["labels"] = [
+                name or None
+                for name in _gather(self._label_names, _gather(self._node_label, handles))
+            ]
+        for key in self._columns if properties is None else properties:
+            column = self._columns.get(key)
+            columns[key] = _gather(column, handles) if column is not None else [None] * len(handles)
+        return columns
+
+    def edge_columns(
+        self,
+        rel_type: Optional[str] = None,
+        properties: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        {"from": [...], "to": [...], "type": [...], **{prop: [...]}} in
+        edges() order. properties=None exports every edge property key.
+        """
+        items = self._rel_items(rel_type)
+        if properties is None:
+            properties = sorted({key for _, adj in items for props in adj.props.values() for key in props})
+
+        columns: Dict[str, List[Any]] = {"from": [], "to": [], "type": []}
+        columns.update((key, []) for key in properties)
+        ids = self._ids
+        for name, adjacency in items:
+            sources, targets = adjacency.pair_lists()
+            columns["from"].extend(_gather(ids, sources))
+            columns["to"].extend(_gather(ids, targets))
+            columns["type"].extend([name] * len(sources))
+            edge_props = adjacency.props
+            for key in properties:
+                if edge_props:
+                    columns[key].extend(edge_props.get(pair, {}).get(key) for pair in zip(sources, targets))
+                else:
+                    columns[key].extend([None] * len(sources))
+        return columns
+
+    def _rel_items(self, rel_type: Optional[str]) -> Iterable[Tuple[str, _Adjacency]]:
+        if rel_type is None:
+            return list(self._rels.items())
+        adjacency = self._rels.get(rel_type)
+        return [(rel_type, adjacency)] if adjacency is not None else []
+
+    def successors(self, node_id: str, rel_type: Optional[str] = None) -> List[str]:
+        handle = self._index.get(node_id)
+        if handle is None:
+            return []
+        ids = self._ids
+        return [
+            ids[dst]
+            for _, adjacency in self._rel_items(rel_type)
+            for dst in adjacency.successors(handle)
+        ]
+
+    def predecessors(self, node_id: str, rel_type: Optional[str] = None) -> List[str]:
+        handle = self._index.get(node_id)
+        if handle is None:
+            return []
+        ids = self._ids
+        return [
+            ids[src]
+            for _, adjacency in self._rel_items(rel_type)
+            for src in adjacency.predecessors(handle)
+        ]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Undirected neighbours over every relationship type (repeats kept)."""
+        handle = self._index.get(node_id)
+        if handle is None:
+            return []
+        ids = self._ids
+        return [
+            ids[other]
+            for adjacency in self._rels.values()
+            for other in adjacency.successors(handle) + adjacency.predecessors(handle)
+        ]
+
+    def number_of_edges(self) -> int:
+        return sum(adjacency.size for adjacency in self._rels.values())
+
+    def compact(self):
+        """Fold append tails and tombstones of every type back into CSR."""
+        for adjacency in self._rels.values():
+            adjacency.compact(len(self._ids))
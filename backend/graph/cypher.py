@@ -0,0 +1,309 @@
+"""
+Cypher builders and row helpers shared by the sync and async Neo4j clients.
+Labels, relationship types and property names cannot be parameters in
+Cypher, so they are interpolated here and validated against the schema.
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .schema import LABEL_PERSON, NODE_KEYS, REL_ENDPOINTS
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items from any iterable."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def check_label(label: str):
+    if label not in NODE_KEYS:
+        raise ValueError(f"Unknown node label: {label}")
+
+
+def check_rel_type(rel_type: str):
+    if not _IDENTIFIER.match(rel_type):
+        raise ValueError(f"Invalid relationship type: {rel_type}")
+
+
+# -----------------------------
+# Schema
+# -----------------------------
+
+def constraint_queries() -> Iterator[Tuple[str, str, str]]:
+    """(label, key, query) for the uniqueness constraint of every label."""
+    for label, key in NODE_KEYS.items():
+        yield label, key, (
+            f"CREATE CONSTRAINT {label.lower()}_{key}_unique "
+            f"IF NOT EXISTS FOR (n:{label}) "
+            f"REQUIRE n.{key} IS UNIQUE"
+        )
+
+
+# -----------------------------
+# Writes
+# -----------------------------
+
+def upsert_people_query() -> str:
+    return (
+        f"UNWIND $rows AS row "
+        f"MERGE (p:{LABEL_PERSON} {{id: row.id}}) "
+        f"SET p += row"
+    )
+
+
+def upsert_named_query(label: str) -> str:
+    check_label(label)
+    return (
+        "UNWIND $rows AS name "
+        f"MERGE (:{label} {{{NODE_KEYS[label]}: name}})"
+    )
+
+
+def typed_relationship_query(
+    from_label: str, to_label: str, rel_type: str, unwind: bool
+) -> str:
+    """Both endpoints matched by label + key property: two index seeks."""
+    check_rel_type(rel_type)
+    from_key = NODE_KEYS[from_label]
+    to_key = NODE_KEYS[to_label]
+    if unwind:
+        head = (
+            "UNWIND $rows AS row "
+            f"MATCH (a:{from_label} {{{from_key}: row.from}}) "
+            f"MATCH (b:{to_label} {{{to_key}: row.to}}) "
+        )
+        props = "row.props"
+    else:
+        head = (
+            f"MATCH (a:{from_label} {{{from_key}: $from_id}}) "
+            f"MATCH (b:{to_label} {{{to_key}: $to_id}}) "
+        )
+        props = "$props"
+    return head + f"MERGE (a)-[r:{rel_type}]->(b) SET r += {props}"
+
+
+def relationship_query(rel_type: str, unwind: bool) -> str:
+    """
+    Index-backed query for types in schema.REL_ENDPOINTS; label-less
+    id/name scan for ad-hoc types.
+    """
+    if rel_type in REL_ENDPOINTS:
+        from_label, to_label = REL_ENDPOINTS[rel_type]
+        return typed_relationship_query(from_label, to_label, rel_type, unwind)
+
+    check_rel_type(rel_type)
+    if unwind:
+        return (
+            "UNWIND $rows AS row "
+            "MATCH (a), (b) "
+            "WHERE (a.id = row.from OR a.name = row.from) "
+            "AND (b.id = row.to OR b.name = row.to) "
+            f"MERGE (a)-[r:{rel_type}]->(b) "
+            "SET r += row.props"
+        )
+    return (
+        "MATCH (a), (b) "
+        "WHERE (a.id = $from_id OR a.name = $from_id) "
+        "AND (b.id = $to_id OR b.name = $to_id) "
+        f"MERGE (a)-[r:{rel_type}]->(b) "
+        "SET r += $props"
+    )
+
+
+def relationship_statements(batch: List[Dict[str, Any]]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Relationship types cannot be parameterized, so a batch of
+    {"from", "to", "type", "props"} rows becomes one UNWIND per type.
+    """
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for row in batch:
+        by_type.setdefault(row["type"], []).append({
+            "from": row["from"],
+            "to": row["to"],
+            "props": row.get("props") or {}
+        })
+    return [
+        (relationship_query(rel_type, unwind=True), typed_rows)
+        for rel_type, typed_rows in by_type.items()
+    ]
+
+
+def delete_node_query(label: str) -> str:
+    check_label(label)
+    return f"MATCH (n:{label} {{{NODE_KEYS[label]}: $key}}) DETACH DELETE n"
+
+
+def delete_relationship_query(rel_type: str) -> str:
+    check_rel_type(rel_type)
+    if rel_type in REL_ENDPOINTS:
+        from_label, to_label = REL_ENDPOINTS[rel_type]
+        return (
+            f"MATCH (a:{from_label} {{{NODE_KEYS[from_label]}: $from_id}})"
+            f"-[r:{rel_type}]->"
+            f"(b:{to_label} {{{NODE_KEYS[to_label]}: $to_id}}) DELETE r"
+        )
+    return (
+        f"MATCH (a)-[r:{rel_type}]->(b) "
+        "WHERE (a.id = $from_id OR a.name = $from_id) "
+        "AND (b.id = $to_id OR b.name = $to_id) DELETE r"
+    )
+
+
+# -----------------------------
+# Reads
+# -----------------------------
+
+def projection(var: str, properties: Sequence[str] | None) -> str:
+    if properties is None:
+        return f"properties({var})"
+    if not properties:
+        return "{}"
+    for prop in properties:
+        if not _IDENTIFIER.match(prop):
+            raise ValueError(f"Invalid property name: {prop}")
+    return f"{var} {{{', '.join('.' + p for p in properties)}}}"
+
+
+def all_nodes_query() -> str:
+    return "MATCH (n) RETURN n"
+
+
+def label_nodes_query(label: str) -> str:
+    check_label(label)
+    return f"MATCH (n:{label}) RETURN n"
+
+
+def count_nodes_query(label: str | None = None) -> str:
+    if label is not None:
+        check_label(label)
+    pattern = f"(n:{label})" if label else "(n)"
+    return f"MATCH {pattern} RETURN count(n) AS c"
+
+
+def node_row(node) -> Tuple[str, Dict[str, Any]]:
+    """Neo4j Node -> (key, {"labels": label, **props}), the mock-mode shape."""
+    props = dict(node)
+    label = next(iter(node.labels), None)
+    data = {"labels": label, **props} if label else props
+    key = props.get(NODE_KEYS.get(label, "id")) or props.get("name") or node.element_id
+    return key, data
+
+
+def node_page_query(label: str, properties: Sequence[str] | None) -> str:
+    """Keyset page over one label, ordered by its constrained key."""
+    key = NODE_KEYS[label]
+    return (
+        f"MATCH (n:{label}) WHERE n.{key} > $after "
+        f"RETURN n.{key} AS key, {projection('n', properties)} AS props "
+        f"ORDER BY n.{key} LIMIT $limit"
+    )
+
+
+def edge_page_query(from_label: str, rel_type: str | None, properties: Sequence[str] | None) -> str:
+    """Keyset page over source nodes, expanded to their outgoing edges."""
+    key = NODE_KEYS[from_label]
+    type_filter = f":{rel_type}" if rel_type else ""
+    return (
+        f"MATCH (a:{from_label}) WHERE a.{key} > $after "
+        f"WITH a ORDER BY a.{key} LIMIT $limit "
+        f"OPTIONAL MATCH (a)-[r{type_filter}]->(b) "
+        f"RETURN a.{key} AS from_key, type(r) AS type, "
+        f"coalesce(b.id, b.name) AS to_key, "
+        f"CASE WHEN r IS NULL THEN {{}} ELSE {projection('r', properties)} END AS props"
+    )
+
+
+def next_node_page(keys: List[Any], page_size: int) -> Any | None:
+    """Keyset cursor after a node page (its keys, in order); None after the last page."""
+    return keys[-1] if len(keys) == page_size else None
+
+
+def next_edge_page(from_keys: List[Any], page_size: int) -> Any | None:
+    """
+    Keyset cursor after an edge page (the source key of every row); None
+    after the last page. A page expands `page_size` sources, so fewer
+    distinct sources than that means the label is exhausted.
+    """
+    if len(set(from_keys)) < page_size:
+        return None
+    return max(from_keys)
+
+
+def edge_page_sources(rel_type: str | None) -> List[Tuple[str, str | None]]:
+    """(source label, type filter) pairs that iter_edges pages over."""
+    if rel_type is not None:
+        if rel_type not in REL_ENDPOINTS:
+            raise ValueError(f"Unknown relationship type: {rel_type}")
+        return [(REL_ENDPOINTS[rel_type][0], rel_type)]
+    return [(label, None) for label in dict.fromkeys(f for f, _ in REL_ENDPOINTS.values())]
+
+
+# -----------------------------
+# Columnar reads
+# -----------------------------
+# Scalar columns instead of Node objects or property maps: pages come back
+# as value lists and are transposed into per-column lists with zip.
+
+def _columns(var: str, properties: Sequence[str]) -> str:
+    for prop in properties:
+        if not _IDENTIFIER.match(prop):
+            raise ValueError(f"Invalid property name: {prop}")
+    return "".join(f", {var}.{prop} AS c{i}" for i, prop in enumerate(properties))
+
+
+def node_columns_query(label: str, properties: Sequence[str]) -> str:
+    """Keyset page of one label as (key, *properties) value rows."""
+    key = NODE_KEYS[label]
+    return (
+        f"MATCH (n:{label}) WHERE n.{key} > $after "
+        f"RETURN n.{key} AS key{_columns('n', properties)} "
+        f"ORDER BY n.{key} LIMIT $limit"
+    )
+
+
+def edge_columns_query(from_label: str, rel_type: str | None, properties: Sequence[str]) -> str:
+    """Like edge_page_query, as (from_key, type, to_key, *properties) value rows."""
+    key = NODE_KEYS[from_label]
+    type_filter = f":{rel_type}" if rel_type else ""
+    return (
+        f"MATCH (a:{from_label}) WHERE a.{key} > $after "
+        f"WITH a ORDER BY a.{key} LIMIT $limit "
+        f"OPTIONAL MATCH (a)-[r{type_filter}]->(b) "
+        f"RETURN a.{key} AS from_key, type(r) AS type, "
+        f"coalesce(b.id, b.name) AS to_key{_columns('r', properties)}"
+    )
+
+
+def property_keys_query(label: str | None = None, rel_type: str | None = None) -> str:
+    """Distinct property keys of one label or relationship type (all columns)."""
+    if label is not None:
+        check_label(label)
+        pattern = f"(x:{label})"
+    else:
+        if rel_type is not None:
+            check_rel_type(rel_type)
+        pattern = f"()-[x{':' + rel_type if rel_type else ''}]->()"
+    return f"MATCH {pattern} UNWIND keys(x) AS k RETURN collect(DISTINCT k) AS keys"
+
+
+def extend_columns(columns: List[List[Any]], rows: List[List[Any]]):
+    """Append value rows to parallel column lists (one transpose per page)."""
+    if rows:
+        for column, values in zip(columns, zip(*rows)):
+            column.extend(values)
+
+
+def people_linked_query(rel_type: str) -> str:
+    _, to_label = REL_ENDPOINTS[rel_type]
+    return (
+        f"MATCH (p:{LABEL_PERSON})-[:{rel_type}]->"
+        f"(:{to_label} {{{NODE_KEYS[to_label]}: $name}}) RETURN p"
+    )
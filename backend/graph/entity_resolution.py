@@ -0,0 +1,348 @@
+"""
+Canonical names for Skill and Need nodes.
+
+Names are MERGEd by value, so "React", "React.js" and "ReactJS" would
+otherwise become three Skill nodes. EntityResolver maps every incoming
+name to one canonical spelling, in this order:
+
+    1. exact      a name already seen (dict hit, the common case)
+    2. key        normalized key: case-folded, punctuation and spacing
+                  removed, a trailing "js" dropped ("React.js" -> "react")
+    3. alias      data/entity_aliases.json ("JS" -> "JavaScript")
+
+A name that matches nothing becomes a new canonical name. Neo4jClient
+resolves names in front of every Skill / Need upsert and HAS_SKILL /
+HAS_NEED write; `recanonicalize` merges fragments already in a graph.
+
+Fuzzy matches are never merged automatically: "Product Management" and
+"Project Management" are different skills. A character-trigram index
+finds candidates, scored by similarity ratio >= threshold (short keys
+and keys with different numbers never match, "Python 2" / "Python 3"),
+and they are only offered as suggestions through `candidates`,
+`suggest` and `fuzzy_suggestions` for someone to add to the alias table.
+
+    python -m backend.graph.entity_resolution --dry-run
+"""
+import os
+import re
+import json
+import argparse
+import threading
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..metrics import METRICS
+from .schema import LABEL_NEED, LABEL_SKILL, REL_HAS_NEED, REL_HAS_SKILL
+
+DEFAULT_ALIASES_PATH = os.getenv(
+    "EDUMESH_ENTITY_ALIASES",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "entity_aliases.json")
+)
+DEFAULT_THRESHOLD = 0.85
+# Keys shorter than this are matched exactly only ("Go", "SQL", "Sales" / "Scales")
+FUZZY_MIN_CHARS = 7
+# Trigram candidates scored per fuzzy lookup
+FUZZY_CANDIDATES = 8
+# Trigrams shared by more keys than this are too common to discriminate
+# (like stop words) and are skipped at lookup, which bounds its cost
+MAX_POSTINGS = 64
+
+# Relationship type -> label of the node its "to" end names
+RESOLVED_RELATIONSHIPS = {REL_HAS_SKILL: LABEL_SKILL, REL_HAS_NEED: LABEL_NEED}
+
+_SEPARATORS = re.compile(r"[^\w+#]|_")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_key(name: str) -> str:
+    key = unicodedata.normalize("NFKC", name).casefold().replace("&", "and")
+    key = _SEPARATORS.sub("", key)
+    if len(key) > 4 and key.endswith("js"):
+        key = key[:-2]
+    return key or name.strip().casefold()
+
+
+def display_name(name: str) -> str:
+    """Spelling kept for a new canonical name: trimmed, single spaces."""
+    return " ".join(name.split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Vocabulary:
+    """Canonical names of one label, by exact name, key and trigram."""
+    def __init__(self):
+        self.exact: Dict[str, str] = {}
+        self.by_key: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = {}
+
+    def add(self, key: str, canonical: str):
+        if key in self.by_key:
+            return
+        self.by_key[key] = canonical
+        for gram in _trigrams(key):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def shared(self, key: str) -> Counter:
+        """Keys sharing informative trigrams with `key`, by count."""
+        shared: Counter = Counter()
+        for gram in _trigrams(key):
+            keys = self.postings.get(gram)
+            if keys and len(keys) <= MAX_POSTINGS:
+                shared.update(keys)
+        return shared
+
+    def fuzzy(self, key: str, threshold: float) -> Optional[Tuple[str, float]]:
+        if len(key) < FUZZY_MIN_CHARS:
+            return None
+        digits = _DIGITS.findall(key)
+        best = None
+        for other, _ in self.shared(key).most_common(FUZZY_CANDIDATES):
+            if other == key or len(other) < FUZZY_MIN_CHARS or _DIGITS.findall(other) != digits:
+                continue
+            ratio = SequenceMatcher(None, key, other).ratio()
+            if ratio >= threshold and (best is None or ratio > best[1]):
+                best = (self.by_key[other], ratio)
+        return best
+
+
+class EntityResolver:
+    """
+    Maps Skill / Need names to canonical names (see module docstring).
+    `aliases` is {label: {canonical: [alias, ...]}}. Safe to share between
+    threads; `enabled=False` passes names through untouched.
+    """
+    def __init__(
+        self,
+        aliases: Dict[str, Dict[str, List[str]]] | None = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        enabled: bool = True
+    ):
+        self.aliases = aliases or {}
+        self.threshold = threshold
+        self.enabled = enabled
+        self._vocab: Dict[str, _Vocabulary] = {}
+        self._lock = threading.Lock()
+
+        self.merged = 0     # names resolved to a different spelling
+
+        for label, table in self.aliases.items():
+            for canonical, names in table.items():
+                self.add_alias(canonical, canonical, label)
+                for alias in names:
+                    self.add_alias(alias, canonical, label)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_ALIASES_PATH, **kwargs) -> "EntityResolver":
+        aliases = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                aliases = json.load(f)
+        return cls(aliases, **kwargs)
+
+    @classmethod
+    def from_env(cls) -> "EntityResolver":
+        """EDUMESH_ENTITY_RESOLUTION=0 disables; EDUMESH_ENTITY_THRESHOLD tunes fuzzy suggestions."""
+        return cls.from_file(
+            threshold=float(os.getenv("EDUMESH_ENTITY_THRESHOLD", DEFAULT_THRESHOLD)),
+            enabled=os.getenv("EDUMESH_ENTITY_RESOLUTION", "1") != "0",
+        )
+
+    def fresh(self) -> "EntityResolver":
+        """Same aliases and settings, nothing learned yet."""
+        return EntityResolver(self.aliases, self.threshold, self.enabled)
+
+    def _vocabulary(self, label: str) -> _Vocabulary:
+        vocab = self._vocab.get(label)
+        if vocab is None:
+            vocab = self._vocab[label] = _Vocabulary()
+        return vocab
+
+    def add_alias(self, alias: str, canonical: str, label: str = LABEL_SKILL):
+        with self._lock:
+            vocab = self._vocabulary(label)
+            vocab.exact[alias] = canonical
+            vocab.exact.setdefault(canonical, canonical)
+            vocab.add(normalize_key(canonical), canonical)
+            # The alias' key points at the canonical name too ("Java Script" -> JavaScript)
+            vocab.by_key.setdefault(normalize_key(alias), canonical)
+
+    def seed(self, label: str, names: Iterable[str]):
+        """Register names already in the graph as canonical (they keep their spelling)."""
+        with self._lock:
+            vocab = self._vocabulary(label)
+            for name in names:
+                vocab.exact.setdefault(name, name)
+                vocab.add(normalize_key(name), name)
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+
+    def resolve(self, name: str, label: str = LABEL_SKILL) -> str:
+        """Canonical name for `name`, registering it as new if nothing matches."""
+        if not self.enabled:
+            return name
+        vocab = self._vocabulary(label)
+        canonical = vocab.exact.get(name)
+        if canonical is not None:
+            return canonical
+
+        with self._lock:
+            canonical = self._match(vocab, name)
+            if canonical is None:
+                canonical = display_name(name)
+                vocab.add(normalize_key(name), canonical)
+            elif canonical != name:
+                self.merged += 1
+            vocab.exact[name] = canonical
+            return canonical
+
+    def lookup(self, name: str, label: str = LABEL_SKILL) -> str:
+        """Canonical name if one matches, else `name`; learns nothing (for queries)."""
+        if not self.enabled:
+            return name
+        vocab = self._vocabulary(label)
+        canonical = vocab.exact.get(name)
+        if canonical is None:
+            with self._lock:
+                canonical = self._match(vocab, name)
+        return canonical or name
+
+    def _match(self, vocab: _Vocabulary, name: str) -> Optional[str]:
+        return vocab.by_key.get(normalize_key(name))
+
+    def suggest(self, name: str, label: str = LABEL_SKILL) -> Optional[Tuple[str, float]]:
+        """Closest other canonical name scoring >= threshold, with its ratio; never merged."""
+        with self._lock:
+            return self._vocabulary(label).fuzzy(normalize_key(name), self.threshold)
+
+    def candidates(self, name: str, label: str = LABEL_SKILL, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        """Similar canonical names with their ratio, best first (for review UIs)."""
+        key = normalize_key(name)
+        vocab = self._vocabulary(label)
+        scored = [
+            (vocab.by_key[other], SequenceMatcher(None, key, other).ratio())
+            for other, _ in vocab.shared(key).most_common(FUZZY_CANDIDATES)
+        ]
+        return sorted((s for s in scored if s[1] >= threshold), key=lambda s: -s[1])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "canonical": sum(len(set(v.by_key.values())) for v in self._vocab.values()),
+            "names": sum(len(v.exact) for v in self._vocab.values()),
+            "merged": self.merged,
+        }
+
+
+# -----------------------------
+# Bulk re-canonicalization
+# -----------------------------
+
+@METRICS.timed("offline.recanonicalize")
+def recanonicalize(
+    db,
+    resolver: EntityResolver | None = None,
+    labels: Sequence[str] = (LABEL_SKILL, LABEL_NEED),
+    dry_run: bool = False
+) -> Dict[str, Dict[str, str]]:
+    """
+    Merge Skill / Need nodes that resolve to the same canonical name.
+
+    Names are resolved most-linked first, so the most used spelling of a
+    group wins unless the alias table names another. Each merged node's
+    edges are re-created on the canonical node (properties kept), then the
+    old node is DETACH DELETEd; every step goes through the client, so its
+    mutation events keep listeners current. The client adopts the new
+    resolver. Returns {label: {old name: canonical name}}.
+    """
+    resolver = (resolver or db.resolver).fresh()
+    relationship = {label: rel for rel, label in RESOLVED_RELATIONSHIPS.items()}
+    merges: Dict[str, Dict[str, str]] = {}
+
+    for label in labels:
+        rel_type = relationship[label]
+        links = Counter(to_id for _, to_id, _ in db.iter_edges(rel_type, properties=[]))
+        names = [key for key, _ in db.iter_nodes(label, properties=[])]
+        names.sort(key=lambda name: (-links[name], name))
+        merges[label] = {
+            name: canonical
+            for name in names
+            if (canonical := resolver.resolve(name, label)) != name
+        }
+
+    if dry_run:
+        return merges
+
+    db.resolver = resolver
+    db._resolved_labels = set(labels)
+    for label, mapping in merges.items():
+        if not mapping:
+            continue
+        rel_type = relationship[label]
+        upsert = db.bulk_upsert_skills if label == LABEL_SKILL else db.bulk_upsert_needs
+        # Collected before writing: the paged edge iterator must not see its own writes
+        moved = [
+            {
+                "from": from_id,
+                "to": mapping[to_id],
+                "type": rel_type,
+                "props": {k: v for k, v in props.items() if k != "type"},
+            }
+            for from_id, to_id, props in db.iter_edges(rel_type)
+            if to_id in mapping
+        ]
+        upsert(sorted(set(mapping.values())))
+        db.bulk_create_relationships(moved)
+        for name in mapping:
+            db.delete_node(label, name)
+        print(f"🔗 Merged {len(mapping)} {label} names into {len(set(mapping.values()))} canonical nodes")
+    return merges
+
+
+def fuzzy_suggestions(
+    db,
+    resolver: EntityResolver | None = None,
+    labels: Sequence[str] = (LABEL_SKILL, LABEL_NEED)
+) -> Dict[str, Dict[str, Tuple[str, float]]]:
+    """
+    Near-duplicate canonical names in the graph, for review only:
+    {label: {name: (similar canonical name, ratio)}}. Nothing is written;
+    confirmed pairs belong in the alias table, after which
+    `recanonicalize` merges them.
+    """
+    resolver = (resolver or db.resolver).fresh()
+    suggestions: Dict[str, Dict[str, Tuple[str, float]]] = {}
+    for label in labels:
+        names = sorted({resolver.resolve(key, label) for key, _ in db.iter_nodes(label, properties=[])})
+        pairs = suggestions[label] = {}
+        for name in names:
+            match = resolver.suggest(name, label)
+            # Each similar pair is reported once
+            if match is not None and pairs.get(match[0], ("",))[0] != name:
+                pairs[name] = match
+    return suggestions
+
+
+if __name__ == "__main__":
+    from .neo4j_client import Neo4jClient
+
+    parser = argparse.ArgumentParser(description="Merge fragmented Skill / Need nodes.")
+    parser.add_argument("--dry-run", action="store_true", help="only print the planned merges")
+    parser.add_argument("--mock-store", help="mock graph directory (when Neo4j is unavailable)")
+    args = parser.parse_args()
+
+    db = Neo4jClient(mock_store=args.mock_store)
+    for label, mapping in recanonicalize(db, dry_run=args.dry_run).items():
+        for old, canonical in sorted(mapping.items()):
+            print(f"{label}: {old} -> {canonical}")
+    if args.dry_run:
+        for label, suggestions in fuzzy_suggestions(db).items():
+            for name, (similar, ratio) in sorted(suggestions.items()):
+                print(f"{label}: {name} ~ {similar} ({ratio:.2f}, not merged; add an alias to merge)")
+    db.close()
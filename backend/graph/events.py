@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+# Event kinds
+NODE_ADDED = "node_added"       # MERGE / upsert (may also be an update)
+NODE_REMOVED = "node_removed"   # DETACH DELETE: its relationships go too
+EDGE_ADDED = "edge_added"
+EDGE_REMOVED = "edge_removed"
+
+
+@dataclass(frozen=True)
+class GraphEvent:
+    kind: str
+    label: Optional[str] = None     # node events
+    key: Optional[str] = None       # node events: Person.id / Skill.name / ...
+    props: Dict[str, Any] = field(default_factory=dict)
+    from_id: Optional[str] = None   # edge events
+    to_id: Optional[str] = None
+    rel_type: Optional[str] = None
+
+
+GraphListener = Callable[[GraphEvent], None]
@@ -0,0 +1,278 @@
+import os
+import io
+import json
+import mmap
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from .compact_graph import DELETED, CompactGraph, _Adjacency
+
+MAGIC = b"EMGS"
+VERSION = 1
+_HEADER = struct.Struct("<4sIQI")   # magic, version, log offset, section count
+_SECTION = struct.Struct("<IQ")     # name length, data length
+
+SNAPSHOT_FILE = "graph.snap"
+LOG_FILE = "graph.log"
+
+# Log records tolerated before the log is folded into a new snapshot
+DEFAULT_SNAPSHOT_EVERY = 50_000
+
+_CSR_FIELDS = ("out_ptr", "out_idx", "in_ptr", "in_idx")
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+# -----------------------------
+# Snapshot (binary, 8-byte aligned sections)
+# -----------------------------
+
+def write_snapshot(graph: CompactGraph, path: str, log_offset: int):
+    """
+    Serialize `graph` into named sections: id table, label array, one JSON
+    column per property, and the raw CSR arrays of every relationship type.
+    Written to a temp file and renamed, so readers never see a partial file.
+    """
+    graph.compact()
+    sections: Dict[str, bytes] = {}
+
+    ids = [node_id or "" for node_id in graph._ids]
+    encoded = [node_id.encode("utf-8") for node_id in ids]
+    offsets = array("q", [0])
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk))
+    sections["ids.offsets"] = offsets.tobytes()
+    sections["ids.blob"] = b"".join(encoded)
+    sections["nodes.label"] = graph._node_label.tobytes()
+
+    for key, column in graph._columns.items():
+        sections[f"col:{key}"] = json.dumps(column, default=str).encode("utf-8")
+
+    for name, adjacency in graph._rels.items():
+        for field in _CSR_FIELDS:
+            sections[f"rel:{name}:{field}"] = getattr(adjacency, field).tobytes()
+        sections[f"rel:{name}:props"] = json.dumps(
+            [[src, dst, props] for (src, dst), props in adjacency.props.items()],
+            default=str,
+        ).encode("utf-8")
+
+    sections["meta"] = json.dumps({
+        "labels": graph._label_names,
+        "columns": list(graph._columns),
+        "rels": {name: adjacency.size for name, adjacency in graph._rels.items()},
+        "live": graph._live,
+    }).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, log_offset, len(sections)))
+        f.write(b"\0" * _pad(_HEADER.size))
+        for name, data in sections.items():
+            encoded_name = name.encode("utf-8")
+            head = _SECTION.pack(len(encoded_name), len(data)) + encoded_name
+            f.write(head + b"\0" * _pad(len(head)))
+            f.write(data + b"\0" * _pad(len(data)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str):
+    """
+    Map the snapshot into memory and rebuild a CompactGraph.
+    CSR arrays are zero-copy read-only views into the mapping; they are
+    only copied when a later compaction re-packs that relationship type.
+    The id index, label index, property columns and edge properties are
+    still decoded eagerly, so loading is O(nodes + edge props), not O(1).
+    Returns (graph, log offset the snapshot covers, mmap to keep open).
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    magic, version, log_offset, count = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported graph snapshot: {path}")
+
+    sections: Dict[str, memoryview] = {}
+    pos = _HEADER.size + _pad(_HEADER.size)
+    for _ in range(count):
+        name_len, data_len = _SECTION.unpack_from(view, pos)
+        head_len = _SECTION.size + name_len
+        name = bytes(view[pos + _SECTION.size:pos + head_len]).decode("utf-8")
+        pos += head_len + _pad(head_len)
+        sections[name] = view[pos:pos + data_len]
+        pos += data_len + _pad(data_len)
+
+    meta = json.loads(bytes(sections["meta"]))
+    graph = CompactGraph()
+
+    node_label = array("h")
+    node_label.frombytes(sections["nodes.label"])
+    offsets = sections["ids.offsets"].cast("q")
+    blob = bytes(sections["ids.blob"])
+    ids: List[Optional[str]] = []
+    index: Dict[str, int] = {}
+    for handle, label_id in enumerate(node_label):
+        if label_id == DELETED:
+            ids.append(None)
+            continue
+        node_id = blob[offsets[handle]:offsets[handle + 1]].decode("utf-8")
+        ids.append(node_id)
+        index[node_id] = handle
+
+    graph._ids = ids
+    graph._index = index
+    graph._node_label = node_label
+    graph._label_names = meta["labels"]
+    graph._label_ids = {label: i for i, label in enumerate(meta["labels"])}
+    graph._by_label = [set() for _ in meta["labels"]]
+    for handle, label_id in enumerate(node_label):
+        if label_id != DELETED:
+            graph._by_label[label_id].add(handle)
+    graph._columns = {
+        key: json.loads(bytes(sections[f"col:{key}"])) for key in meta["columns"]
+    }
+    graph._live = meta["live"]
+
+    for name, size in meta["rels"].items():
+        adjacency = _Adjacency()
+        for field, code in zip(_CSR_FIELDS, "qiqi"):
+            setattr(adjacency, field, sections[f"rel:{name}:{field}"].cast(code))
+        adjacency.props = {
+            (src, dst): props
+            for src, dst, props in json.loads(bytes(sections[f"rel:{name}:props"]))
+        }
+        adjacency.size = size
+        graph._rels[name] = adjacency
+
+    return graph, log_offset, mapped
+
+
+# -----------------------------
+# Append-only mutation log
+# -----------------------------
+
+def apply_record(graph: CompactGraph, record: List[Any]):
+    op = record[0]
+    if op == "n":
+        graph.add_node(record[1], record[2], record[3])
+    elif op == "e":
+        graph.add_edge(record[1], record[2], record[3], record[4])
+    elif op == "rn":
+        graph.remove_node(record[1])
+    elif op == "re":
+        graph.remove_edge(record[1], record[2], record[3])
+
+
+def replay_log(graph: CompactGraph, path: str, offset: int) -> Tuple[int, int]:
+    """
+    Apply log records written after `offset`.
+    Returns (records replayed, byte offset just past the last good record).
+    Replay stops at the first torn or unterminated line; the caller must
+    truncate the log there before appending, or later records would land
+    behind the garbage and be skipped on every future replay.
+    """
+    if not os.path.exists(path):
+        return 0, 0
+
+    replayed = 0
+    end = offset
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            apply_record(graph, record)
+            replayed += 1
+            end += len(line)
+    return replayed, end
+
+
+class MockGraphStore:
+    """
+    Persistence for the mock-mode CompactGraph: a binary snapshot plus an
+    append-only JSONL mutation log in `directory`.
+
+    Startup maps the snapshot and replays only the log written after it.
+    Every mutation is appended (and flushed) as it happens; once the log
+    holds `snapshot_every` records it is folded into a fresh snapshot and
+    truncated. Replaying a record twice is harmless (all ops are MERGE /
+    idempotent deletes), so a crash between snapshot and truncate is safe.
+    """
+    def __init__(self, directory: str, snapshot_every: int = DEFAULT_SNAPSHOT_EVERY):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.snapshot_every = snapshot_every
+
+        self.graph: Optional[CompactGraph] = None
+        self._log: Optional[io.BufferedWriter] = None
+        self._mapped: Optional[mmap.mmap] = None
+        self._pending = 0
+
+    def load(self) -> CompactGraph:
+        os.makedirs(self.directory, exist_ok=True)
+
+        log_offset = 0
+        if os.path.exists(self.snapshot_path):
+            graph, log_offset, self._mapped = load_snapshot(self.snapshot_path)
+        else:
+            graph = CompactGraph()
+
+        self._pending, end = replay_log(graph, self.log_path, log_offset)
+        if self._pending:
+            print(f"↩️ Replayed {self._pending} logged mutations onto the mock graph")
+
+        self.graph = graph
+        self._log = open(self.log_path, "ab")
+        if self._log.tell() > end:
+            # Drop a torn tail so new records follow the last good one
+            print(f"⚠️ WARNING: Discarding {self._log.tell() - end} bytes of torn mock graph log")
+            self._log.truncate(end)
+            self._log.seek(end)
+        graph.journal = self.append
+        return graph
+
+    def append(self, record: List[Any]):
+        self._log.write(json.dumps(record, default=str).encode("utf-8") + b"\n")
+        self._log.flush()
+        self._pending += 1
+        if self._pending >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Fold the log into a new snapshot and start an empty log."""
+        self._log.flush()
+        write_snapshot(self.graph, self.snapshot_path, log_offset=0)
+        self._log.truncate(0)
+        self._log.seek(0)
+        self._pending = 0
+        # write_snapshot re-packed every relationship type into owned arrays
+        self._release_mapping()
+
+    def _release_mapping(self):
+        if self._mapped is None:
+            return
+        self._mapped.close()
+        self._mapped = None
+
+    def close(self):
+        if self._log is None:
+            return
+        if self._pending:
+            self.snapshot()
+        elif self._mapped is not None:
+            # Copy the CSR views out of the mapping before unmapping it
+            self.graph.compact()
+            self._release_mapping()
+        self.graph.journal = None
+        self._log.close()
+        self._log = None
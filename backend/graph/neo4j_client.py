@@ -1,24 +1,69 @@
 import os
-from typing import Dict, Any
+import uuid
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Sequence, Tuple
 from dotenv import load_dotenv
-import networkx as nx
 from neo4j import GraphDatabase
 
+from ..metrics import METRICS
+from . import cypher
+from .compact_graph import CompactGraph
+from .entity_resolution import RESOLVED_RELATIONSHIPS, EntityResolver
+from .events import (
+    EDGE_ADDED,
+    EDGE_REMOVED,
+    NODE_ADDED,
+    NODE_REMOVED,
+    GraphEvent,
+    GraphListener,
+)
+from .graph_store import MockGraphStore
+from .schema import (
+    LABEL_NEED,
+    LABEL_PERSON,
+    LABEL_SKILL,
+    NODE_KEYS,
+    REL_HAS_NEED,
+    REL_HAS_SKILL,
+    REL_MENTORS,
+)
+
 load_dotenv()
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 1000
+
 
 class Neo4jClient:
-    def __init__(self):
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        mock_store: str | None = None,
+        resolver: EntityResolver | None = None
+    ):
         # Load environment variables with local fallbacks
         self.uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
         self.user = os.getenv("NEO4J_USER", "neo4j")
         self.password = os.getenv("NEO4J_PASSWORD", "password")
+        self.batch_size = batch_size or int(
+            os.getenv("NEO4J_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        )
 
         self.driver = None
         self.use_mock = False
 
-        # In-memory fallback graph (demo-safe)
-        self.mock_graph = nx.DiGraph()
+        # In-memory fallback graph (demo-safe, array-backed)
+        self.mock_graph = CompactGraph()
+        # Optional on-disk snapshot + mutation log for the fallback graph
+        self.mock_store = None
+        # Mutation event subscribers (see subscribe())
+        self._listeners: List[GraphListener] = []
+        # Bumped by every write through this client (see cache_token)
+        self.version = 0
+        self._instance = uuid.uuid4().hex[:12]
+        # Canonical Skill / Need names (see entity_resolution); each label's
+        # vocabulary is seeded from the graph on its first resolved write
+        self.resolver = resolver or EntityResolver.from_env()
+        self._resolved_labels = set()
 
         try:
             self.driver = GraphDatabase.driver(
@@ -33,67 +78,181 @@ class Neo4jClient:
             )
             self.use_mock = True
 
+        if not self.use_mock:
+            self.ensure_schema()
+        elif mock_store:
+            # Survive restarts: map the last snapshot, replay the log tail
+            self.mock_store = MockGraphStore(mock_store)
+            self.mock_graph = self.mock_store.load()
+
     def close(self):
         if self.driver:
             self.driver.close()
+        if self.mock_store:
+            self.mock_store.close()
+
+    # -----------------------------
+    # Schema Bootstrap
+    # -----------------------------
+
+    def ensure_schema(self):
+        """
+        Create uniqueness constraints on the key property of every label
+        (Person.id, Skill.name, Need.name, ...). Each constraint is backed
+        by an index, so MERGE / MATCH on the key becomes an index seek.
+        Idempotent: safe to call on every startup.
+        """
+        if self.use_mock:
+            return
+
+        with self.driver.session() as session:
+            for label, key, query in cypher.constraint_queries():
+                try:
+                    session.run(query).consume()
+                except Exception as e:
+                    # Existing duplicate data blocks the constraint; keep
+                    # running, queries still work, just without the seek.
+                    print(f"⚠️ WARNING: Could not create {label}.{key} constraint ({e}).")
+
+    # -----------------------------
+    # Mutation Events
+    # -----------------------------
+
+    def subscribe(self, listener: GraphListener) -> Callable[[], None]:
+        """
+        Call `listener(GraphEvent)` after every write made through this
+        client, in both modes. Returns a function that unsubscribes.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @property
+    def cache_token(self) -> str:
+        """
+        "<client instance>:<version>": changes whenever this client writes,
+        so views derived from the graph can be memoized on it. Writes made
+        by other processes are not seen; call invalidate() after those.
+        """
+        return f"{self._instance}:{self.version}"
+
+    def invalidate(self):
+        """Mark the graph as changed (e.g. after an external import)."""
+        self.version += 1
+
+    def _emit(self, events: Iterable[GraphEvent]):
+        """
+        One committed write: the only place the version is bumped (once),
+        then each event goes to every listener. `events` is only iterated
+        when someone is listening.
+        """
+        self.version += 1
+        if self._listeners:
+            for event in events:
+                for listener in list(self._listeners):
+                    listener(event)
+
+    def _emit_nodes(self, label: str, rows: Iterable[Dict[str, Any]]):
+        key = NODE_KEYS[label]
+        self._emit(GraphEvent(NODE_ADDED, label=label, key=row[key], props=row) for row in rows)
+
+    def _emit_edges(self, rows: Iterable[Dict[str, Any]]):
+        self._emit(
+            GraphEvent(
+                EDGE_ADDED,
+                from_id=row["from"],
+                to_id=row["to"],
+                rel_type=row["type"],
+                props=row.get("props") or {}
+            )
+            for row in rows
+        )
 
     # -----------------------------
     # Node Upserts
     # -----------------------------
 
+    @METRICS.timed("neo4j.upsert_person")
     def upsert_person(self, person_data: Dict[str, Any]):
         if self.use_mock:
             self.mock_graph.add_node(
                 person_data["id"],
-                labels="Person",
-                **person_data
+                "Person",
+                person_data
             )
-            return
-
-        query = (
-            "MERGE (p:Person {id: $id}) "
-            "SET p += $props"
-        )
+        else:
+            with self.driver.session() as session:
+                session.run(cypher.upsert_people_query(), rows=[person_data])
 
-        with self.driver.session() as session:
-            session.run(
-                query,
-                id=person_data["id"],
-                props=person_data
-            )
+        self._emit_nodes(LABEL_PERSON, [person_data])
 
+    @METRICS.timed("neo4j.upsert_skill")
     def upsert_skill(self, skill_name: str):
+        skill_name = self._canonical(LABEL_SKILL, skill_name)
         if self.use_mock:
             self.mock_graph.add_node(
                 skill_name,
-                labels="Skill",
-                name=skill_name
+                "Skill",
+                {"name": skill_name}
             )
-            return
+        else:
+            with self.driver.session() as session:
+                session.run(cypher.upsert_named_query(LABEL_SKILL), rows=[skill_name])
 
-        query = "MERGE (s:Skill {name: $name})"
-
-        with self.driver.session() as session:
-            session.run(query, name=skill_name)
+        self._emit_nodes(LABEL_SKILL, [{"name": skill_name}])
 
+    @METRICS.timed("neo4j.upsert_need")
     def upsert_need(self, need_name: str):
+        need_name = self._canonical(LABEL_NEED, need_name)
         if self.use_mock:
             self.mock_graph.add_node(
                 need_name,
-                labels="Need",
-                name=need_name
+                "Need",
+                {"name": need_name}
             )
-            return
+        else:
+            with self.driver.session() as session:
+                session.run(cypher.upsert_named_query(LABEL_NEED), rows=[need_name])
 
-        query = "MERGE (n:Need {name: $name})"
+        self._emit_nodes(LABEL_NEED, [{"name": need_name}])
 
-        with self.driver.session() as session:
-            session.run(query, name=need_name)
+    # -----------------------------
+    # Entity resolution
+    # -----------------------------
+
+    def _canonical(self, label: str, name: str) -> str:
+        if not self.resolver.enabled:
+            return name
+        if label not in self._resolved_labels:
+            self._resolved_labels.add(label)
+            self.resolver.seed(label, (key for key, _ in self.iter_nodes(label, properties=[])))
+        return self.resolver.resolve(name, label)
+
+    def _canonical_rows(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Relationship rows with HAS_SKILL / HAS_NEED targets resolved."""
+        for row in rows:
+            label = RESOLVED_RELATIONSHIPS.get(row["type"])
+            if label is not None:
+                canonical = self._canonical(label, row["to"])
+                if canonical != row["to"]:
+                    row = dict(row, to=canonical)
+            yield row
+
+    @METRICS.timed("neo4j.delete_node")
+    def delete_node(self, label: str, key: str):
+        """DETACH DELETE the node with this label + key property."""
+        if self.use_mock:
+            self.mock_graph.remove_node(key)
+        else:
+            with self.driver.session() as session:
+                session.run(cypher.delete_node_query(label), key=key)
+
+        self._emit([GraphEvent(NODE_REMOVED, label=label, key=key)])
 
     # -----------------------------
     # Relationships
     # -----------------------------
 
+    @METRICS.timed("neo4j.create_relationship")
     def create_relationship(
         self,
         from_id: str,
@@ -103,42 +262,438 @@ class Neo4jClient:
     ):
         if props is None:
             props = {}
+        if rel_type in RESOLVED_RELATIONSHIPS:
+            to_id = self._canonical(RESOLVED_RELATIONSHIPS[rel_type], to_id)
 
         if self.use_mock:
             self.mock_graph.add_edge(
                 from_id,
                 to_id,
-                type=rel_type,
-                **props
+                rel_type,
+                props
             )
-            return
+        else:
+            # Known relationship types get the index-backed query;
+            # ad-hoc types fall back to a label-less id/name scan
+            query = cypher.relationship_query(rel_type, unwind=False)
 
-        query = (
-            "MATCH (a), (b) "
-            "WHERE (a.id = $from_id OR a.name = $from_id) "
-            "AND (b.id = $to_id OR b.name = $to_id) "
-            f"MERGE (a)-[r:{rel_type}]->(b) "
-            "SET r += $props"
-        )
+            with self.driver.session() as session:
+                session.run(
+                    query,
+                    from_id=from_id,
+                    to_id=to_id,
+                    props=props
+                )
 
-        with self.driver.session() as session:
-            session.run(
-                query,
-                from_id=from_id,
-                to_id=to_id,
-                props=props
+        self._emit_edges([{"from": from_id, "to": to_id, "type": rel_type, "props": props}])
+
+    @METRICS.timed("neo4j.create_typed_relationship")
+    def create_typed_relationship(
+        self,
+        from_label: str,
+        from_id: str,
+        to_label: str,
+        to_id: str,
+        rel_type: str,
+        props: Dict[str, Any] | None = None
+    ):
+        """
+        Create a relationship between two nodes matched by label + key
+        property (see schema.NODE_KEYS), so both endpoints are index seeks.
+        """
+        if props is None:
+            props = {}
+        if to_label in (LABEL_SKILL, LABEL_NEED):
+            to_id = self._canonical(to_label, to_id)
+
+        if self.use_mock:
+            self.mock_graph.add_edge(
+                from_id,
+                to_id,
+                rel_type,
+                props
             )
+        else:
+            with self.driver.session() as session:
+                session.run(
+                    cypher.typed_relationship_query(
+                        from_label, to_label, rel_type, unwind=False
+                    ),
+                    from_id=from_id,
+                    to_id=to_id,
+                    props=props
+                )
+
+        self._emit_edges([{"from": from_id, "to": to_id, "type": rel_type, "props": props}])
+
+    @METRICS.timed("neo4j.delete_relationship")
+    def delete_relationship(self, from_id: str, to_id: str, rel_type: str):
+        if self.use_mock:
+            self.mock_graph.remove_edge(from_id, to_id, rel_type)
+        else:
+            with self.driver.session() as session:
+                session.run(
+                    cypher.delete_relationship_query(rel_type),
+                    from_id=from_id,
+                    to_id=to_id
+                )
+
+        self._emit([GraphEvent(
+            EDGE_REMOVED, from_id=from_id, to_id=to_id, rel_type=rel_type
+        )])
+
+    def link_person_skill(
+        self, person_id: str, skill_name: str, props: Dict[str, Any] | None = None
+    ):
+        self.create_relationship(person_id, skill_name, REL_HAS_SKILL, props)
+
+    def link_person_need(
+        self, person_id: str, need_name: str, props: Dict[str, Any] | None = None
+    ):
+        self.create_relationship(person_id, need_name, REL_HAS_NEED, props)
+
+    def link_mentor(
+        self, mentor_id: str, mentee_id: str, props: Dict[str, Any] | None = None
+    ):
+        self.create_relationship(mentor_id, mentee_id, REL_MENTORS, props)
+
+    # -----------------------------
+    # Bulk Writes (UNWIND batches)
+    # -----------------------------
+
+    def _write_batches(
+        self,
+        rows,
+        build_queries,
+        batch_size: int | None,
+        on_commit: Callable[[List[Any]], None] | None = None
+    ):
+        """
+        Send rows in batches over ONE session, one transaction per batch.
+        `build_queries(batch)` returns the (query, rows) pairs to run
+        inside that transaction; `on_commit(batch)` runs after it commits.
+        Returns the number of rows written.
+        """
+        written = 0
+        with self.driver.session() as session:
+            for batch in cypher.chunked(rows, batch_size or self.batch_size):
+                with METRICS.timer("neo4j.write_tx"):
+                    session.execute_write(
+                        self._run_statements, build_queries(batch)
+                    )
+                written += len(batch)
+                if on_commit:
+                    on_commit(batch)
+        return written
+
+    @staticmethod
+    def _run_statements(tx, statements):
+        for query, params in statements:
+            tx.run(query, rows=params).consume()
+
+    @METRICS.timed("neo4j.bulk_upsert_people")
+    def bulk_upsert_people(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int | None = None
+    ) -> int:
+        if self.use_mock:
+            count = 0
+            for person_data in rows:
+                self.mock_graph.add_node(
+                    person_data["id"],
+                    "Person",
+                    person_data
+                )
+                self._emit_nodes(LABEL_PERSON, [person_data])
+                count += 1
+            return count
+
+        query = cypher.upsert_people_query()
+        return self._write_batches(
+            rows,
+            lambda batch: [(query, batch)],
+            batch_size,
+            lambda batch: self._emit_nodes(LABEL_PERSON, batch)
+        )
+
+    @METRICS.timed("neo4j.bulk_upsert_skills")
+    def bulk_upsert_skills(
+        self,
+        names: Iterable[str],
+        batch_size: int | None = None
+    ) -> int:
+        return self._bulk_upsert_named(LABEL_SKILL, names, batch_size)
+
+    @METRICS.timed("neo4j.bulk_upsert_needs")
+    def bulk_upsert_needs(
+        self,
+        names: Iterable[str],
+        batch_size: int | None = None
+    ) -> int:
+        return self._bulk_upsert_named(LABEL_NEED, names, batch_size)
+
+    def _bulk_upsert_named(self, label: str, names, batch_size):
+        names = (self._canonical(label, name) for name in names)
+        if self.use_mock:
+            count = 0
+            for name in names:
+                self.mock_graph.add_node(name, label, {"name": name})
+                self._emit_nodes(label, [{"name": name}])
+                count += 1
+            return count
+
+        query = cypher.upsert_named_query(label)
+        return self._write_batches(
+            names,
+            lambda batch: [(query, batch)],
+            batch_size,
+            lambda batch: self._emit_nodes(label, [{"name": name} for name in batch])
+        )
+
+    @METRICS.timed("neo4j.bulk_create_relationships")
+    def bulk_create_relationships(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int | None = None
+    ) -> int:
+        """
+        rows: dicts with "from", "to", "type" and optional "props".
+        Each batch is split per relationship type (one UNWIND per type),
+        all inside the same transaction. HAS_SKILL / HAS_NEED targets are
+        resolved to canonical names first.
+        """
+        rows = self._canonical_rows(rows)
+        if self.use_mock:
+            count = 0
+            for row in rows:
+                self.mock_graph.add_edge(
+                    row["from"],
+                    row["to"],
+                    row["type"],
+                    row.get("props")
+                )
+                self._emit_edges([row])
+                count += 1
+            return count
+
+        return self._write_batches(
+            rows, cypher.relationship_statements, batch_size, self._emit_edges
+        )
 
     # -----------------------------
     # Fetching (for visualization)
     # -----------------------------
 
+    @METRICS.timed("neo4j.get_all_nodes")
     def get_all_nodes(self):
         if self.use_mock:
             return list(self.mock_graph.nodes(data=True))
 
-        query = "MATCH (n) RETURN n"
-
         with self.driver.session() as session:
-            result = session.run(query)
+            result = session.run(cypher.all_nodes_query())
             return [record["n"] for record in result]
+
+    # -----------------------------
+    # Streaming Iteration
+    # -----------------------------
+    # Lazy, paginated views over the whole graph. Neo4j mode pages with
+    # keyset pagination on each label's key property (constraint index:
+    # range seek + ordered, no SKIP), so memory stays at one page.
+    # Only nodes carrying a schema label are visited in Neo4j mode.
+
+    def iter_nodes(
+        self,
+        label: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (key, {"labels": label, **props}) lazily.
+        label: restrict to one label; properties: project only these keys.
+        """
+        if label is not None:
+            cypher.check_label(label)
+        if self.use_mock:
+            yield from self.mock_graph.iter_nodes(label, properties)
+            return
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for node_label in [label] if label else list(NODE_KEYS):
+            query = cypher.node_page_query(node_label, properties)
+            after = ""
+            while after is not None:
+                with self.driver.session() as session:
+                    page = list(session.run(query, after=after, limit=page_size))
+                for record in page:
+                    yield record["key"], {"labels": node_label, **record["props"]}
+                after = cypher.next_node_page([record["key"] for record in page], page_size)
+
+    def iter_edges(
+        self,
+        rel_type: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Yield (from_key, to_key, {"type": rel_type, **props}) lazily.
+        Neo4j mode pages over source nodes by key (each page expands the
+        outgoing relationships of `page_size` sources).
+        """
+        if self.use_mock:
+            yield from self.mock_graph.edges(
+                data=True, rel_type=rel_type, properties=properties
+            )
+            return
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for from_label, type_filter in cypher.edge_page_sources(rel_type):
+            query = cypher.edge_page_query(from_label, type_filter, properties)
+            after = ""
+            while after is not None:
+                with self.driver.session() as session:
+                    page = list(session.run(query, after=after, limit=page_size))
+                for record in page:
+                    if record["type"] is not None:
+                        yield record["from_key"], record["to_key"], {"type": record["type"], **record["props"]}
+                after = cypher.next_edge_page([record["from_key"] for record in page], page_size)
+
+    # -----------------------------
+    # Columnar Export
+    # -----------------------------
+    # One list per column, per label or relationship type, ready for
+    # pd.DataFrame(columns) or pyarrow.table(columns). Neo4j mode pages like
+    # the iterators but returns scalar values (no Node objects or property
+    # maps); mock mode gathers straight from the CompactGraph columns / CSR.
+
+    @METRICS.timed("neo4j.node_columns")
+    def node_columns(
+        self,
+        label: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Dict[str, List[Any]]:
+        """
+        {"key": [...], **{prop: [...]}}; missing values are None.
+        Without a label every schema label is exported, with a "labels"
+        column; properties=None exports every property key.
+        """
+        if label is not None:
+            cypher.check_label(label)
+        if self.use_mock:
+            return self.mock_graph.node_columns(label, properties)
+
+        labels = [label] if label else list(NODE_KEYS)
+        if properties is None:
+            properties = sorted({key for node_label in labels for key in self._property_keys(label=node_label)})
+        keys: List[Any] = []
+        label_column: List[str] = []
+        values = [[] for _ in properties]
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for node_label in labels:
+            query = cypher.node_columns_query(node_label, properties)
+            start = len(keys)
+            after = ""
+            while after is not None:
+                with self.driver.session() as session:
+                    page = session.run(query, after=after, limit=page_size).values()
+                cypher.extend_columns([keys, *values], page)
+                after = cypher.next_node_page([row[0] for row in page], page_size)
+            label_column.extend([node_label] * (len(keys) - start))
+
+        columns: Dict[str, List[Any]] = {"key": keys}
+        if label is None:
+            columns["labels"] = label_column
+        columns.update(zip(properties, values))
+        return columns
+
+    @METRICS.timed("neo4j.edge_columns")
+    def edge_columns(
+        self,
+        rel_type: str | None = None,
+        properties: Sequence[str] | None = None,
+        page_size: int | None = None
+    ) -> Dict[str, List[Any]]:
+        """
+        {"from": [...], "to": [...], "type": [...], **{prop: [...]}} for one
+        relationship type (all types if None); properties=None exports
+        every property key.
+        """
+        if self.use_mock:
+            return self.mock_graph.edge_columns(rel_type, properties)
+
+        if properties is None:
+            properties = sorted(self._property_keys(rel_type=rel_type))
+        sources: List[Any] = []
+        targets: List[Any] = []
+        types: List[str] = []
+        values = [[] for _ in properties]
+
+        page_size = page_size or DEFAULT_PAGE_SIZE
+        for from_label, type_filter in cypher.edge_page_sources(rel_type):
+            query = cypher.edge_columns_query(from_label, type_filter, properties)
+            after = ""
+            while after is not None:
+                with self.driver.session() as session:
+                    page = session.run(query, after=after, limit=page_size).values()
+                # Rows with no type are sources without matching edges
+                cypher.extend_columns([sources, types, targets, *values], [row for row in page if row[1] is not None])
+                after = cypher.next_edge_page([row[0] for row in page], page_size)
+
+        return {"from": sources, "to": targets, "type": types, **dict(zip(properties, values))}
+
+    def _property_keys(self, label: str | None = None, rel_type: str | None = None) -> List[str]:
+        with self.driver.session() as session:
+            return session.run(cypher.property_keys_query(label, rel_type)).single()["keys"]
+
+    # -----------------------------
+    # Indexed Queries
+    # -----------------------------
+    # Mock mode answers these from the label index and the reverse CSR
+    # adjacency (skill -> people); Neo4j mode from label scans and the
+    # Skill.name / Need.name constraint indexes. Both are O(result), and
+    # both return (key, data) tuples shaped like mock get_all_nodes().
+
+    @METRICS.timed("neo4j.get_nodes_by_label")
+    def get_nodes_by_label(self, label: str) -> List[Tuple[str, Dict[str, Any]]]:
+        cypher.check_label(label)
+        if self.use_mock:
+            return list(self.mock_graph.iter_nodes(label=label))
+
+        with self.driver.session() as session:
+            result = session.run(cypher.label_nodes_query(label))
+            return [cypher.node_row(record["n"]) for record in result]
+
+    @METRICS.timed("neo4j.count_nodes")
+    def count_nodes(self, label: str | None = None) -> int:
+        query = cypher.count_nodes_query(label)
+        if self.use_mock:
+            if label is None:
+                return self.mock_graph.number_of_nodes()
+            return self.mock_graph.count_label(label)
+
+        with self.driver.session() as session:
+            return session.run(query).single()["c"]
+
+    @METRICS.timed("neo4j.people_with_skill")
+    def people_with_skill(self, skill_name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._people_linked_to(self.resolver.lookup(skill_name, LABEL_SKILL), REL_HAS_SKILL)
+
+    @METRICS.timed("neo4j.people_with_need")
+    def people_with_need(self, need_name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._people_linked_to(self.resolver.lookup(need_name, LABEL_NEED), REL_HAS_NEED)
+
+    def _people_linked_to(self, name: str, rel_type: str):
+        if self.use_mock:
+            graph = self.mock_graph
+            return [
+                (person_id, graph.get_node(person_id))
+                for person_id in graph.predecessors(name, rel_type)
+                if graph.label_of(person_id) == LABEL_PERSON
+            ]
+
+        query = cypher.people_linked_query(rel_type)
+        with self.driver.session() as session:
+            result = session.run(query, name=name)
+            return [cypher.node_row(record["p"]) for record in result]
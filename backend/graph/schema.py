@@ -30,3 +30,40 @@ REL_HAS_SKILL = "HAS_SKILL"
 REL_HAS_NEED = "HAS_NEED"
 REL_MENTORS = "MENTORS" # Person -> Person
 REL_CAN_FILL = "CAN_FILL" # Person -> Opportunity
+
+# A need asks for help with one skill and is named after it: "<skill> Support".
+# The names must differ because mock mode keys nodes by name alone (a Need
+# "Python" would relabel the Skill).
+NEED_SUFFIX = " Support"
+
+
+def need_name(skill: str) -> str:
+    return f"{skill}{NEED_SUFFIX}"
+
+
+def needed_skill(need: str) -> str:
+    """The skill a need asks for; needs named without the suffix are the skill itself."""
+    return need[:-len(NEED_SUFFIX)] if need.endswith(NEED_SUFFIX) else need
+
+# Node Labels
+LABEL_PERSON = "Person"
+LABEL_SKILL = "Skill"
+LABEL_NEED = "Need"
+LABEL_OPPORTUNITY = "Opportunity"
+
+# Unique key property per label. Backed by uniqueness constraints
+# (see Neo4jClient.ensure_schema) so every MERGE / MATCH is an index seek.
+NODE_KEYS = {
+    LABEL_PERSON: "id",
+    LABEL_SKILL: "name",
+    LABEL_NEED: "name",
+    LABEL_OPPORTUNITY: "name",
+}
+
+# (from label, to label) per relationship type
+REL_ENDPOINTS = {
+    REL_HAS_SKILL: (LABEL_PERSON, LABEL_SKILL),
+    REL_HAS_NEED: (LABEL_PERSON, LABEL_NEED),
+    REL_MENTORS: (LABEL_PERSON, LABEL_PERSON),
+    REL_CAN_FILL: (LABEL_PERSON, LABEL_OPPORTUNITY),
+}
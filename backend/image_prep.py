@@ -0,0 +1,177 @@
+"""
+Image preprocessing for multimodal Gemini calls.
+
+Phone photos of paper surveys are multi-megabyte; the model reads them
+just as well at a fraction of the size. `ImagePreprocessor.prepare` turns
+an image file into upload-ready bytes:
+
+    1. sha256 of the file bytes (plus the settings) is the cache key
+    2. EXIF orientation applied, converted to RGB (or grayscale)
+    3. downscaled so the longest side is at most `max_side`
+    4. re-encoded as JPEG at `quality`; the original bytes are kept when
+       they are already small enough and smaller than the re-encode
+
+Prepared images are cached in memory (LRU) and on disk under
+`.edumesh/image_cache` (see bounded_store), bounded to `max_disk_bytes`, so repeated calls on
+the same scan skip decoding and resizing entirely.
+"""
+import io
+import os
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+
+from .bounded_store import BoundedStore
+
+DEFAULT_IMAGE_CACHE_DIR = os.getenv(
+    "EDUMESH_IMAGE_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), "..", ".edumesh", "image_cache")
+)
+DEFAULT_MAX_SIDE = 1600
+DEFAULT_QUALITY = 85
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_DISK_MB = 512
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif", ".tif", ".tiff")
+MIME_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    digest: str             # sha256 of the source file bytes
+    source_bytes: int
+
+
+def image_files(folder: str) -> List[str]:
+    """Image files directly inside `folder`, sorted by name."""
+    return sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+class ImagePreprocessor:
+    def __init__(
+        self,
+        max_side: int = DEFAULT_MAX_SIDE,
+        quality: int = DEFAULT_QUALITY,
+        grayscale: bool = False,
+        directory: Optional[str] = DEFAULT_IMAGE_CACHE_DIR,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_MB * 2**20
+    ):
+        self.max_side = max_side
+        self.quality = quality
+        self.grayscale = grayscale
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+        self._store = BoundedStore(directory, ".img", memory_entries, max_disk_bytes)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ImagePreprocessor":
+        """EDUMESH_IMAGE_MAX_SIDE / EDUMESH_IMAGE_QUALITY / EDUMESH_IMAGE_GRAYSCALE=1."""
+        return cls(
+            max_side=int(os.getenv("EDUMESH_IMAGE_MAX_SIDE", DEFAULT_MAX_SIDE)),
+            quality=int(os.getenv("EDUMESH_IMAGE_QUALITY", DEFAULT_QUALITY)),
+            grayscale=os.getenv("EDUMESH_IMAGE_GRAYSCALE", "0") == "1",
+        )
+
+    def _key(self, digest: str) -> str:
+        settings = f"{digest}:{self.max_side}:{self.quality}:{int(self.grayscale)}"
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def prepare(self, image_path: str) -> PreparedImage:
+        """Upload-ready bytes for `image_path` (cached by content hash)."""
+        with open(image_path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        key = self._key(digest)
+
+        with self._lock:
+            prepared = self._store.recall(key)
+            if prepared is None:
+                prepared = self._read_disk(key, digest, len(source))
+            if prepared is not None:
+                self.hits += 1
+                return prepared
+
+        # Decode / resize outside the lock: concurrent batches prepare in parallel
+        prepared = self._encode(source, digest)
+        with self._lock:
+            self.misses += 1
+            self.bytes_in += len(source)
+            self.bytes_out += len(prepared.data)
+            self._store.remember(key, prepared)
+            self._write_disk(key, prepared)
+        return prepared
+
+    def _encode(self, source: bytes, digest: str) -> PreparedImage:
+        with Image.open(io.BytesIO(source)) as original:
+            source_format = original.format
+            image = ImageOps.exif_transpose(original)
+            image = image.convert("L" if self.grayscale else "RGB")
+
+        small_enough = max(image.size) <= self.max_side
+        image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=self.quality, optimize=True)
+        data, mime_type = out.getvalue(), "image/jpeg"
+
+        # Already small and compact: the original is the better upload
+        if small_enough and not self.grayscale and source_format in MIME_TYPES and len(source) <= len(data):
+            data, mime_type = source, MIME_TYPES[source_format]
+        return PreparedImage(data, mime_type, image.width, image.height, digest, len(source))
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "disk_entries": len(self._store.disk),
+        }
+
+    # -----------------------------
+    # Disk tier
+    # -----------------------------
+    # One file per key: "<mime subtype>\n<width>x<height>\n" + image bytes
+
+    def _read_disk(self, key: str, digest: str, source_bytes: int) -> Optional[PreparedImage]:
+        data = self._store.read(key)
+        if data is None:
+            return None
+        try:
+            subtype, size, data = data.split(b"\n", 2)
+            width, height = map(int, size.decode("ascii").split("x"))
+        except ValueError:
+            self._store.remove(key)
+            return None
+
+        prepared = PreparedImage(data, f"image/{subtype.decode('ascii')}", width, height, digest, source_bytes)
+        self._store.remember(key, prepared)
+        return prepared
+
+    def _write_disk(self, key: str, prepared: PreparedImage):
+        if not self.directory:
+            return
+        header = f"{prepared.mime_type.split('/', 1)[1]}\n{prepared.width}x{prepared.height}\n"
+        self._store.write(key, header.encode("ascii") + prepared.data)
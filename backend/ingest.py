@@ -0,0 +1,293 @@
+import os
+import json
+import time
+import argparse
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Callable
+
+from .tokens import DEFAULT_BATCH_TOKENS
+from .graph.cypher import chunked
+from .graph.schema import REL_HAS_SKILL, REL_HAS_NEED
+
+# A record paired with the byte offset just past it in the source file.
+# Committing a batch means "everything before this offset is in the graph".
+OffsetRecord = Tuple[int, Dict[str, Any]]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# -----------------------------
+# Parse
+# -----------------------------
+
+def read_jsonl(path: str, start_offset: int = 0) -> Iterator[OffsetRecord]:
+    """
+    Stream line-delimited community records ({"id", "name", "skills", ...}).
+    Only one line is held in memory at a time.
+    """
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for line in f:
+            line_start = offset
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield offset, json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping malformed JSONL record at byte {line_start}")
+
+
+def read_survey_lines(path: str, start_offset: int = 0) -> Iterator[OffsetRecord]:
+    """
+    Stream free-text surveys (one per line, like data/mock_surveys.txt).
+    Each line becomes a respondent Person keyed by its byte offset, so ids
+    are stable across resumed runs. Skills/needs are left to extraction.
+    """
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for line in f:
+            line_start = offset
+            offset += len(line)
+            text = line.decode("utf-8", errors="replace").strip()
+            if not text:
+                continue
+            yield offset, {
+                "id": f"survey-{line_start}",
+                "name": f"Respondent {line_start}",
+                "role": "Respondent",
+                "bio": text,
+            }
+
+
+READERS: Dict[str, Callable[[str, int], Iterator[OffsetRecord]]] = {
+    "jsonl": read_jsonl,
+    "surveys": read_survey_lines,
+}
+
+
+# -----------------------------
+# Normalize
+# -----------------------------
+
+def _clean_names(values) -> List[str]:
+    names = (str(value).strip() for value in values or [])
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def normalize_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Trim strings, dedupe skill/need lists and drop records without an id."""
+    person_id = str(record.get("id", "")).strip()
+    if not person_id:
+        return None
+
+    person = dict(record)
+    person["id"] = person_id
+    person["name"] = str(record.get("name") or person_id).strip()
+    person["skills"] = _clean_names(record.get("skills"))
+    person["needs"] = _clean_names(record.get("needs"))
+    return person
+
+
+def normalize(records: Iterable[OffsetRecord]) -> Iterator[OffsetRecord]:
+    for offset, record in records:
+        person = normalize_record(record)
+        if person is not None:
+            yield offset, person
+
+
+# -----------------------------
+# Extract (surveys)
+# -----------------------------
+
+def _extracted_names(entities) -> List[str]:
+    """Non-empty string names of extracted skill/need dicts."""
+    return [
+        entity["name"]
+        for entity in entities or []
+        if isinstance(entity, dict) and isinstance(entity.get("name"), str) and entity["name"].strip()
+    ]
+
+
+def merge_extraction(record: Dict[str, Any], extraction: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold extracted skill/need names (and the respondent's role) into a record."""
+    person = dict(record)
+    person["skills"] = list(record.get("skills") or []) + _extracted_names(extraction.get("skills"))
+    person["needs"] = list(record.get("needs") or []) + _extracted_names(extraction.get("needs"))
+    people = extraction.get("people") or []
+    if people and isinstance(people[0], dict) and people[0].get("role"):
+        person["role"] = people[0]["role"]
+    return person
+
+
+def extract_entities(
+    records: Iterable[OffsetRecord],
+    extractor,
+    token_budget: int,
+) -> Iterator[OffsetRecord]:
+    """
+    Run each record's bio through EntityExtractor.extract_many and yield
+    the merged records as batches come back, in source order (so offsets
+    stay monotonic for checkpointing). Only the batch in flight is held.
+    Records without an id are dropped here, as normalize() would drop them.
+    Documents are keyed by sequence number, so duplicate ids are fine.
+    """
+    pending: Dict[str, OffsetRecord] = {}
+
+    def documents():
+        for seq, (offset, record) in enumerate(records):
+            if not str(record.get("id", "")).strip():
+                continue
+            doc_id = str(seq)
+            pending[doc_id] = (offset, record)
+            yield doc_id, record.get("bio", "")
+
+    for doc_id, extraction in extractor.extract_many(documents(), token_budget):
+        offset, record = pending.pop(doc_id)
+        yield offset, merge_extraction(record, extraction)
+
+
+# -----------------------------
+# Write
+# -----------------------------
+
+def write_people(db, people: List[Dict[str, Any]]) -> int:
+    """Write one chunk of people, their skills/needs and relationships."""
+    skills = sorted({s for p in people for s in p.get("skills", [])})
+    needs = sorted({n for p in people for n in p.get("needs", [])})
+
+    rows = db.bulk_upsert_people(people)
+    rows += db.bulk_upsert_skills(skills)
+    rows += db.bulk_upsert_needs(needs)
+    rows += db.bulk_create_relationships(
+        [
+            {"from": p["id"], "to": s, "type": REL_HAS_SKILL}
+            for p in people
+            for s in p.get("skills", [])
+        ]
+        + [
+            {"from": p["id"], "to": n, "type": REL_HAS_NEED}
+            for p in people
+            for n in p.get("needs", [])
+        ]
+    )
+    return rows
+
+
+# -----------------------------
+# Checkpoint
+# -----------------------------
+
+class IngestCheckpoint:
+    """
+    Sidecar file holding the byte offset of the last committed chunk.
+    Written atomically (write + rename) after each commit.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path, "r") as f:
+                return int(json.load(f).get("offset", 0))
+        except (FileNotFoundError, ValueError, json.JSONDecodeError):
+            return 0
+
+    def save(self, offset: int, records: int):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": offset, "records": records}, f)
+        os.replace(tmp_path, self.path)
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+
+def ingest_stream(
+    db,
+    path: str,
+    fmt: str = "jsonl",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    extractor=None,
+    token_budget: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    parse -> [extract] -> normalize -> batch -> write, one chunk in memory
+    at a time. With an EntityExtractor, survey texts are sent to the model
+    in token-budgeted multi-document requests before normalization.
+    After each chunk is written its end offset is checkpointed, so an
+    interrupted run resumes from the last committed chunk, and a rerun on
+    an export that has grown only ingests the appended tail.
+    """
+    checkpoint = IngestCheckpoint(checkpoint_path or f"{path}.offset")
+    start_offset = checkpoint.load() if resume else 0
+    total_bytes = os.path.getsize(path)
+
+    if start_offset:
+        print(f"↩️ Resuming {path} from byte {start_offset:,}")
+
+    stats = {"records": 0, "rows": 0, "offset": start_offset, "elapsed": 0.0}
+    start = time.perf_counter()
+
+    records = READERS[fmt](path, start_offset)
+    if extractor is not None:
+        records = extract_entities(records, extractor, token_budget or DEFAULT_BATCH_TOKENS)
+    records = normalize(records)
+    for batch in chunked(records, chunk_size):
+        stats["rows"] += write_people(db, [person for _, person in batch])
+        stats["records"] += len(batch)
+        stats["offset"] = batch[-1][0]
+        checkpoint.save(stats["offset"], stats["records"])
+
+        stats["elapsed"] = time.perf_counter() - start
+        if on_progress:
+            on_progress(stats)
+        else:
+            rate = stats["records"] / stats["elapsed"] if stats["elapsed"] else 0
+            done = stats["offset"] / total_bytes if total_bytes else 1
+            print(f"📥 {stats['records']:,} records • {done:.0%} • {rate:,.0f} records/sec")
+
+    stats["elapsed"] = time.perf_counter() - start
+    print(f"✅ Ingested {stats['records']:,} records ({stats['rows']:,} rows) in {stats['elapsed']:.2f}s")
+    return stats
+
+
+if __name__ == "__main__":
+    from .graph.neo4j_client import Neo4jClient
+
+    parser = argparse.ArgumentParser(description="Stream a community export into the graph.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(READERS), default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-resume", action="store_true")
+    parser.add_argument(
+        "--extract",
+        action="store_true",
+        help="Extract skills/needs from each record's bio with Gemini (batched)",
+    )
+    parser.add_argument("--batch-tokens", type=int, default=DEFAULT_BATCH_TOKENS)
+    args = parser.parse_args()
+
+    extractor = None
+    if args.extract:
+        from .entity_extractor import EntityExtractor
+        from .gemini_client import EduMeshGemini
+        extractor = EntityExtractor(EduMeshGemini())
+
+    client = Neo4jClient()
+    ingest_stream(
+        client,
+        args.path,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        resume=not args.no_resume,
+        extractor=extractor,
+        token_budget=args.batch_tokens,
+    )
+    client.close()
@@ -0,0 +1,126 @@
+import json
+from typing import Any, List, Optional
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a streamed JSON array of objects.
+
+    Text is fed as it arrives; `feed` returns the elements that completed
+    in that chunk. The array is a "[" at the top level, after any leading
+    prose or code fence, or the value of a member of a top-level object
+    such as {"gaps": [...]}: the member named `key`, or the first one whose
+    value is an array (as _array_items picks from a whole reply). Brackets
+    inside strings or nested values never start it. Scanning is a single
+    pass over each character (string / escape / depth tracking); only
+    completed elements are handed to json.loads. Only the unfinished tail
+    is kept for scanning, so long streams are not re-concatenated.
+    """
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self._chunks: List[str] = []   # everything fed so far (see .text)
+        self._buf = ""          # unfinished tail: element in progress + unscanned
+        self._pos = 0           # next character of _buf to scan
+        self._in_array = False
+        self._outer = 0         # nesting depth before the array opens
+        self._after_colon = False  # last significant character before the array was ":"
+        self._member = None     # name of the latest top-level object member
+        self._depth = 0         # nesting depth inside the array element
+        self._start = None      # start index in _buf of the element (or member name) being scanned
+        self._in_string = False
+        self._escape = False
+        self.done = False       # closing "]" of the array seen
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far (for a final full parse); joined on demand."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> List[Any]:
+        self._chunks.append(chunk)
+        items: List[Any] = []
+        text = self._buf = self._buf + chunk
+
+        while self._pos < len(text) and not self.done:
+            ch = text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._in_array and self._start is not None:
+                        self._member = json.loads(text[self._start:self._pos + 1])
+                        self._start = None
+            elif not self._in_array:
+                self._scan_outside(ch)
+            elif ch == '"':
+                self._in_string = True
+                if self._start is None:
+                    self._start = self._pos
+            elif ch in "{[":
+                if self._start is None:
+                    self._start = self._pos
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # "]" closing the array itself
+                    self._flush_scalar(text, items)
+                    self.done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._emit(text[self._start:self._pos + 1], items)
+            elif ch == "," and self._depth == 0:
+                self._flush_scalar(text, items)
+            elif self._start is None and not ch.isspace():
+                self._start = self._pos
+
+            self._pos += 1
+
+        # Drop what is scanned and no longer needed
+        cut = self._pos if self._start is None else self._start
+        if cut:
+            self._buf = text[cut:]
+            self._pos -= cut
+            if self._start is not None:
+                self._start -= cut
+        return items
+
+    def _scan_outside(self, ch: str):
+        """One character before the array opens: find the "[" that starts it."""
+        if ch == '"':
+            self._in_string = True
+            # A string directly inside the top-level object, not after ":", names a member
+            if self._outer == 1 and not self._after_colon:
+                self._start = self._pos
+        elif ch == "[" and (
+            self._outer == 0
+            or self._outer == 1 and self._after_colon and self.key in (None, self._member)
+        ):
+            self._in_array = True
+        elif ch in "{[":
+            self._outer += 1
+        elif ch in "}]":
+            self._outer = max(0, self._outer - 1)
+        if not ch.isspace():
+            self._after_colon = ch == ":"
+
+    def _flush_scalar(self, text: str, items: List[Any]):
+        """Top-level numbers / strings / literals end at "," or "]"."""
+        if self._start is not None:
+            self._emit(text[self._start:self._pos], items)
+
+    def _emit(self, raw: str, items: List[Any]):
+        self._start = None
+        raw = raw.strip()
+        if not raw:
+            return
+        try:
+            items.append(json.loads(raw))
+        except json.JSONDecodeError:
+            print(f"⚠️ Skipping malformed streamed element: {raw[:80]}")
@@ -0,0 +1,139 @@
+"""
+Deterministic lead pre-ranking from graph signals.
+
+Every person gets a score from three signals:
+
+    rarity      skills few others hold: sum of log((N + 1) / holders)
+    mentorship  outgoing MENTORS edges: log(1 + mentees)
+    coverage    demand their skills meet: log(1 + sum of needers / holders),
+                where a need counts for the skill it names (schema.needed_skill)
+
+A heap keeps the top `k * DIVERSITY_POOL` people (O(N log k)), then the
+shortlist is picked greedily from that pool, discounting each candidate by
+ROLE_DECAY for every already-picked person with the same role. The result
+is small and stable, so only it goes to the model, and it doubles as the
+answer when AI is disabled.
+"""
+import math
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from .graph.schema import needed_skill
+from .metrics import METRICS
+from .people import people_from_graph
+
+DEFAULT_SHORTLIST = 12
+DEFAULT_WEIGHTS = {"rarity": 1.0, "mentorship": 1.5, "coverage": 1.0}
+
+# Role diversity: the pool is DIVERSITY_POOL times the shortlist, and each
+# earlier pick with the same role multiplies a candidate's score by ROLE_DECAY
+DIVERSITY_POOL = 4
+ROLE_DECAY = 0.7
+
+
+@dataclass
+class LeadCandidate:
+    id: str
+    name: str
+    role: str
+    score: float
+    rarity: float
+    mentorship: float
+    coverage: float
+    skills: List[str] = field(default_factory=list)
+    mentees: int = 0
+
+    def reason(self) -> str:
+        parts = []
+        if self.skills:
+            parts.append(f"holds {', '.join(self.skills[:3])}")
+        if self.mentees:
+            parts.append(f"mentors {self.mentees} member{'s' if self.mentees != 1 else ''}")
+        if self.coverage:
+            parts.append("covers open community needs")
+        return ("Graph signals: " + "; ".join(parts) + ".") if parts else "Graph signals: active member."
+
+    def as_lead(self) -> Dict[str, Any]:
+        """Same shape as a model-selected lead ({"id", "name", "reason"})."""
+        return {"id": self.id, "name": self.name, "reason": self.reason(), "score": round(self.score, 3)}
+
+
+# -----------------------------
+# Sources
+# -----------------------------
+
+# Graph source: people.people_from_graph
+
+def people_from_candidates(candidates) -> List[Dict[str, Any]]:
+    """people_from_graph's shape from raw candidate dicts or a community JSON ({"people": [...]})."""
+    if isinstance(candidates, dict):
+        candidates = candidates.get("people", [])
+    return [
+        {
+            "id": p.get("id") or p.get("name", ""),
+            "name": p.get("name") or p.get("id", ""),
+            "role": p.get("role") or "",
+            "skills": list(p.get("skills") or []),
+            "needs": list(p.get("needs") or []),
+            "mentees": int(p.get("mentees") or 0),
+        }
+        for p in candidates
+    ]
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+
+def score_people(people: List[Dict[str, Any]], weights: Dict[str, float] | None = None) -> List[LeadCandidate]:
+    weights = weights or DEFAULT_WEIGHTS
+    holders = Counter(s for p in people for s in set(p["skills"]))
+    needers = Counter(s for p in people for s in {needed_skill(n) for n in p["needs"]})
+    total = len(people)
+
+    scored = []
+    for p in people:
+        skills = list(dict.fromkeys(p["skills"]))
+        rarity = sum(math.log((total + 1) / holders[s]) for s in skills)
+        mentorship = math.log1p(p["mentees"])
+        coverage = math.log1p(sum(needers[s] / holders[s] for s in skills))
+        score = (
+            weights["rarity"] * rarity
+            + weights["mentorship"] * mentorship
+            + weights["coverage"] * coverage
+        )
+        # Rarest skills first, so the reason and prompt lead with them
+        skills.sort(key=lambda s: (holders[s], s))
+        scored.append(LeadCandidate(
+            p["id"], p["name"], p["role"], score, rarity, mentorship, coverage, skills, p["mentees"]
+        ))
+    return scored
+
+
+@METRICS.timed("offline.rank_leads")
+def rank_leads(
+    people: List[Dict[str, Any]],
+    k: int = DEFAULT_SHORTLIST,
+    weights: Dict[str, float] | None = None
+) -> List[LeadCandidate]:
+    """Top `k` candidates, role-diverse, best first. Ties keep input order."""
+    scored = score_people(people, weights)
+    pool = heapq.nlargest(
+        k * DIVERSITY_POOL, range(len(scored)), key=lambda i: (scored[i].score, -i)
+    )
+
+    picked: List[LeadCandidate] = []
+    roles: Counter = Counter()
+    while pool and len(picked) < k:
+        best = max(pool, key=lambda i: (scored[i].score * ROLE_DECAY ** roles[scored[i].role], -i))
+        pool.remove(best)
+        picked.append(scored[best])
+        roles[scored[best].role] += 1
+    return picked
+
+
+def rank_leads_from_graph(db, k: int = DEFAULT_SHORTLIST, weights: Dict[str, float] | None = None) -> List[LeadCandidate]:
+    """Rank the live graph behind a Neo4jClient (or its mock fallback)."""
+    return rank_leads(people_from_graph(db), k, weights)
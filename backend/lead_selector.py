@@ -1,34 +1,75 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .gemini_client import EduMeshGemini
+from .lead_ranking import (
+    DEFAULT_SHORTLIST,
+    LeadCandidate,
+    people_from_candidates,
+    rank_leads,
+    rank_leads_from_graph,
+)
+
+# Thought-store namespace for this agent's reasoning history
+THOUGHT_NAMESPACE = "lead_selector"
 
 class LeadSelector:
     """
     Role: HR / Talent Scout
     Selects community leads based on trust and skill signals.
+
+    Candidates are pre-ranked from graph signals (see lead_ranking) and
+    only the top `shortlist` go to the model, so the prompt stays the same
+    size however large the community is.
     """
-    def __init__(self, gemini: EduMeshGemini):
+    def __init__(self, gemini: EduMeshGemini, shortlist: int = DEFAULT_SHORTLIST):
         self.gemini = gemini
+        self.shortlist = shortlist
+
+    def rank(self, candidates) -> List[LeadCandidate]:
+        """Deterministic shortlist from candidate dicts or a community JSON."""
+        return rank_leads(people_from_candidates(candidates), self.shortlist)
+
+    def rank_graph(self, db) -> List[LeadCandidate]:
+        return rank_leads_from_graph(db, self.shortlist)
+
+    def select_leads(self, candidates) -> List[Dict[str, Any]]:
+        return self.select_from_shortlist(self.rank(candidates))
+
+    def select_leads_from_graph(self, db) -> List[Dict[str, Any]]:
+        return self.select_from_shortlist(self.rank_graph(db))
+
+    def select_from_shortlist(self, shortlist: List[LeadCandidate]) -> List[Dict[str, Any]]:
+        result = self.gemini.generate_json(self.build_prompt(shortlist), thinking_level="HIGH", namespace=THOUGHT_NAMESPACE)
+        if isinstance(result, dict) and "leads" in result:
+            return result["leads"]
+        if isinstance(result, list):
+            return result
+        return []
+
+    def stream_leads(self, candidates) -> Iterator[Dict[str, Any]]:
+        """Yield each selected lead as soon as the model finishes writing it."""
+        return self.stream_from_shortlist(self.rank(candidates))
+
+    def stream_from_shortlist(self, shortlist: List[LeadCandidate]) -> Iterator[Dict[str, Any]]:
+        for lead in self.gemini.stream_json(self.build_prompt(shortlist), namespace=THOUGHT_NAMESPACE):
+            if isinstance(lead, dict):
+                yield lead
 
-    def select_leads(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        candidate_str = json.dumps(candidates, indent=2)
+    def build_prompt(self, shortlist: List[LeadCandidate]) -> str:
+        rows = "\n".join(
+            f"{c.id}|{c.name}|{c.role}|{c.score:.2f}|{c.mentees}|{', '.join(c.skills[:5])}"
+            for c in shortlist
+        )
         prompt = f"""
         Task: Select the top 3 candidates for "Community Lead" roles for a "Train-the-Trainer" program.
         Criteria: High skill level, willingness to share (mentorship signals), and diverse background.
-        
-        Candidates:
-        {candidate_str}
-        
+
+        Shortlist, pre-ranked by graph signals (skill rarity, mentees, need coverage, role diversity):
+        CANDIDATES (id|name|role|score|mentees|skills, rarest first):
+{rows}
+
         Output Schema (JSON List):
         [
              {{ "id": "user_id", "name": "str", "reason": "Why selected?" }}
         ]
         """
-        
-        result = self.gemini.generate_json(prompt, thinking_level="HIGH")
-        if isinstance(result, dict) and "leads" in result:
-            return result["leads"]
-        if isinstance(result, list):
-            return result
-        return []
-
-import json
+        return prompt
@@ -0,0 +1,318 @@
+"""
+Process-wide latency, token and cache instrumentation.
+
+    from backend.metrics import METRICS
+
+    with METRICS.timer("neo4j.count_nodes"):
+        ...
+
+    @METRICS.timed("offline.detect_skill_gaps")
+    def detect_skill_gaps(db): ...
+
+Every operation name gets a latency histogram (count, sum, max and
+p50 / p95 / p99 over the most recent RESERVOIR_SIZE samples) and an error
+count. `record_usage` adds prompt / response / thought token counters from a
+Gemini response's usage_metadata, and registered stat sources (the response
+and image caches, GeminiPool) contribute hit rates and totals at export.
+
+`snapshot()` is the dict view; `prometheus()` renders the text exposition
+format and `write_jsonl(path)` appends one line per operation. With
+EDUMESH_METRICS=0 timers are a shared no-op object and decorated functions
+are called straight through after a single flag check.
+"""
+import os
+import re
+import json
+import inspect
+import time
+import threading
+import functools
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+RESERVOIR_SIZE = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+# usage_metadata field -> token counter kind
+USAGE_FIELDS = {
+    "prompt_token_count": "prompt",
+    "candidates_token_count": "response",
+    "thoughts_token_count": "thoughts",
+    "cached_content_token_count": "cached",
+}
+
+_NON_METRIC = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class Histogram:
+    """Totals over every sample, quantiles over the newest RESERVOIR_SIZE."""
+    __slots__ = ("count", "total", "max", "errors", "_samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self._samples: deque = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._samples.append(seconds)
+
+    def quantiles(self) -> Dict[float, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {q: 0.0 for q in QUANTILES}
+        last = len(samples) - 1
+        return {q: samples[min(last, int(q * len(samples)))] for q in QUANTILES}
+
+    def summary(self) -> Dict[str, Any]:
+        quantiles = self.quantiles()
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "max_s": self.max,
+            "p50_s": quantiles[0.5],
+            "p95_s": quantiles[0.95],
+            "p99_s": quantiles[0.99],
+        }
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.observe(self._name, time.perf_counter() - self._start, error=exc_type is not None)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.time()
+        self._histograms: Dict[str, Histogram] = {}
+        # (counter name, operation) -> value
+        self._counters: Dict[tuple, float] = {}
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "Metrics":
+        """EDUMESH_METRICS=0 disables collection."""
+        return cls(enabled=os.getenv("EDUMESH_METRICS", "1") != "0")
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+
+    def timer(self, name: str):
+        """Context manager timing one `name` operation (errors are counted too)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: Optional[str] = None):
+        """Decorator form of timer() for functions and coroutines; the name defaults to module.qualname."""
+        def decorate(fn):
+            op = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await fn(*args, **kwargs)
+                    with _Timer(self, op):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, op):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+            if error:
+                histogram.errors += 1
+
+    def count(self, counter: str, op: str, amount: float = 1):
+        if not self.enabled or not amount:
+            return
+        with self._lock:
+            key = (counter, op)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def record_usage(self, op: str, response) -> Dict[str, int]:
+        """Token counters from a response's usage_metadata; returns {kind: tokens}."""
+        usage = getattr(response, "usage_metadata", None)
+        if not self.enabled or usage is None:
+            return {}
+        tokens = {
+            kind: value
+            for field, kind in USAGE_FIELDS.items()
+            if (value := getattr(usage, field, None))
+        }
+        for kind, value in tokens.items():
+            self.count(f"tokens_{kind}", op, value)
+        return tokens
+
+    def register_source(self, name: str, stats: Callable[[], Dict[str, Any]]):
+        """`stats()` (e.g. ResponseCache.stats) is read at export time; numbers only are kept."""
+        self._sources[name] = stats
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = {name: h.summary() for name, h in self._histograms.items()}
+            counters: Dict[str, Dict[str, float]] = {}
+            for (counter, op), value in self._counters.items():
+                counters.setdefault(counter, {})[op] = value
+
+        sources = {}
+        for name, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception:
+                continue
+            sources[name] = {
+                key: value for key, value in values.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            }
+        return {
+            "enabled": self.enabled,
+            "uptime_s": time.time() - self.started,
+            "operations": dict(sorted(histograms.items())),
+            "counters": counters,
+            "sources": sources,
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One flat row per operation (latencies in ms), for tables."""
+        snapshot = self.snapshot()
+        tokens = {
+            kind: snapshot["counters"].get(f"tokens_{kind}", {})
+            for kind in USAGE_FIELDS.values()
+        }
+        return [
+            {
+                "Operation": op,
+                "Calls": summary["count"],
+                "Errors": summary["errors"],
+                "p50 ms": round(summary["p50_s"] * 1000, 2),
+                "p95 ms": round(summary["p95_s"] * 1000, 2),
+                "p99 ms": round(summary["p99_s"] * 1000, 2),
+                "Total s": round(summary["sum_s"], 3),
+                "Prompt tokens": int(tokens["prompt"].get(op, 0)),
+                "Response tokens": int(tokens["response"].get(op, 0)),
+            }
+            for op, summary in snapshot["operations"].items()
+        ]
+
+    def prometheus(self, prefix: str = "edumesh") -> str:
+        """Prometheus text exposition format (summaries, counters, gauges)."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_operation_seconds Operation latency.",
+            f"# TYPE {prefix}_operation_seconds summary",
+        ]
+        for op, summary in snapshot["operations"].items():
+            label = _escape(op)
+            for q in QUANTILES:
+                lines.append(f'{prefix}_operation_seconds{{op="{label}",quantile="{q}"}} {summary[f"p{int(q * 100)}_s"]:.6f}')
+            lines.append(f'{prefix}_operation_seconds_sum{{op="{label}"}} {summary["sum_s"]:.6f}')
+            lines.append(f'{prefix}_operation_seconds_count{{op="{label}"}} {summary["count"]}')
+        lines += [
+            f"# HELP {prefix}_operation_errors_total Operations that raised.",
+            f"# TYPE {prefix}_operation_errors_total counter",
+        ]
+        for op, summary in snapshot["operations"].items():
+            lines.append(f'{prefix}_operation_errors_total{{op="{_escape(op)}"}} {summary["errors"]}')
+
+        for counter, by_op in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            for op, value in sorted(by_op.items()):
+                lines.append(f'{prefix}_{counter}_total{{op="{_escape(op)}"}} {value:g}')
+
+        for source, values in sorted(snapshot["sources"].items()):
+            for key, value in sorted(values.items()):
+                metric = f"{prefix}_{_metric_name(source)}_{_metric_name(key)}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def jsonl(self) -> str:
+        """One JSON object per operation plus one per stat source, timestamped."""
+        snapshot = self.snapshot()
+        now = time.time()
+        records = [
+            {"ts": now, "op": op, **summary, **{
+                counter: by_op[op] for counter, by_op in snapshot["counters"].items() if op in by_op
+            }}
+            for op, summary in snapshot["operations"].items()
+        ]
+        records += [{"ts": now, "source": name, **values} for name, values in snapshot["sources"].items()]
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+    def write_jsonl(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.jsonl())
+
+
+def _metric_name(value: str) -> str:
+    return _NON_METRIC.sub("_", value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared by every client, agent and analysis in the process
+METRICS = Metrics.from_env()
@@ -1,36 +1,327 @@
-def detect_skill_gaps(nodes):
+import os
+import json
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set
+
+from .metrics import METRICS
+from .graph.events import EDGE_ADDED, EDGE_REMOVED, NODE_ADDED, NODE_REMOVED, GraphEvent
+from .graph.schema import LABEL_PERSON, LABEL_SKILL, REL_HAS_SKILL
+from .people import community_of, people_from_graph
+
+# Declarative prerequisite -> successor rules (see data/skill_gap_rules.json):
+# a gap fires when a community has ALL "requires" skills but not "missing".
+DEFAULT_RULES_PATH = os.getenv(
+    "EDUMESH_GAP_RULES",
+    os.path.join(os.path.dirname(__file__), "..", "data", "skill_gap_rules.json")
+)
+
+
+class GapRuleSet:
     """
-    Deterministic skill gap detection.
-    This runs WITHOUT Gemini and is always available.
+    Gap rules compiled to bitsets.
+
+    Every skill named by a rule gets a bit position. A rule becomes a
+    `requires` mask plus a `missing` bit index, so checking one community is two
+    integer ops per rule. For many communities the bitsets are transposed:
+    each skill maps to a mask over communities, and one pass over the rules
+    evaluates all communities at once.
     """
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = rules
+        self.skill_bits: Dict[str, int] = {}
+        self.requires: List[int] = []
+        self.missing: List[int] = []
 
-    skills = set()
-    people = set()
+        for rule in rules:
+            mask = 0
+            for skill in rule["requires"]:
+                mask |= 1 << self._bit(skill)
+            self.requires.append(mask)
+            self.missing.append(self._bit(rule["missing"]))
 
-    for _, data in nodes:
-        label = data.get("labels")
+    def _bit(self, skill: str) -> int:
+        bit = self.skill_bits.get(skill)
+        if bit is None:
+            bit = self.skill_bits[skill] = len(self.skill_bits)
+        return bit
 
-        if label == "Skill":
-            skills.add(data.get("name"))
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_RULES_PATH) -> "GapRuleSet":
+        with open(path, "r") as f:
+            data = json.load(f)
+        rules = data.get("rules", data) if isinstance(data, dict) else data
+        return cls(rules)
 
-        elif label == "Person":
-            people.add(data.get("name"))
+    def skill_mask(self, skills: Iterable[str]) -> int:
+        """Bitset of the rule-relevant skills present; others are ignored."""
+        mask = 0
+        for skill in skills:
+            bit = self.skill_bits.get(skill)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
 
-    gaps = []
+    def evaluate(self, skills: Iterable[str]) -> List[int]:
+        """Indexes of the rules that fire for one community."""
+        present = self.skill_mask(skills)
+        return [
+            i for i, (requires, missing) in enumerate(zip(self.requires, self.missing))
+            if present & requires == requires and not present >> missing & 1
+        ]
+
+    def evaluate_batch(self, communities: Dict[str, Iterable[str]]) -> Dict[str, List[int]]:
+        """
+        Evaluate every rule against every community in one pass.
+        Returns community -> indexes of the rules that fire.
+        """
+        names = list(communities)
+        everyone = (1 << len(names)) - 1
+
+        # Transpose: skill bit -> bitset of communities holding that skill
+        holders = [0] * len(self.skill_bits)
+        for c, skills in enumerate(communities.values()):
+            for skill in set(skills):
+                bit = self.skill_bits.get(skill)
+                if bit is not None:
+                    holders[bit] |= 1 << c
+
+        fired: Dict[str, List[int]] = {name: [] for name in names}
+        for i, (requires, missing) in enumerate(zip(self.requires, self.missing)):
+            hit = everyone & ~holders[missing]
+            for bit in _bits(requires):
+                hit &= holders[bit]
+                if not hit:
+                    break
+            for c in _bits(hit):
+                fired[names[c]].append(i)
+        return fired
 
-    # Example deterministic gaps for demo clarity
-    if "Solar Installation" in skills and "Solar Maintenance" not in skills:
-        gaps.append({
-            "Missing Skill": "Solar Maintenance",
-            "Reason": "Solar installation exists but no maintenance expertise",
-            "Suggested Action": "Train an existing installer as maintenance lead"
-        })
 
-    if "Basic Math" in skills and "Advanced Math" not in skills:
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+_rule_cache: Dict[str, tuple] = {}
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> GapRuleSet:
+    """Compile the rule file once; recompiled only when the file changes."""
+    mtime = os.path.getmtime(path)
+    cached = _rule_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _rule_cache[path] = (mtime, GapRuleSet.from_file(path))
+    return cached[1]
+
+
+@METRICS.timed("offline.detect_skill_gaps")
+def detect_skill_gaps(db, rules: Optional[GapRuleSet] = None):
+    """
+    Deterministic skill gap detection.
+    This runs WITHOUT Gemini and is always available.
+    Reads Skill nodes straight from the client's label index and evaluates
+    the compiled rule table; each gap carries who holds its prerequisites.
+    """
+    rules = rules or load_rules()
+    skills = {data.get("name") for _, data in db.get_nodes_by_label("Skill")}
+    total_people = db.count_nodes("Person")
+
+    gaps = []
+    for i in rules.evaluate(skills):
+        rule = rules.rules[i]
+        holders = {
+            data.get("name") or person_id
+            for skill in rule["requires"]
+            for person_id, data in db.people_with_skill(skill)
+        }
         gaps.append({
-            "Missing Skill": "Advanced Math",
-            "Reason": "Only foundational math skills present",
-            "Suggested Action": "Upskill senior students or teachers"
+            "Missing Skill": rule["missing"],
+            "Reason": rule["reason"],
+            "Suggested Action": rule["action"],
+            "Prerequisite Holders": ", ".join(sorted(holders)),
+            "Coverage": f"{len(holders)} of {total_people} people",
         })
 
     return gaps
+
+
+@METRICS.timed("offline.detect_community_gaps")
+def detect_community_gaps(db, rules: Optional[GapRuleSet] = None) -> List[Dict[str, Any]]:
+    """
+    Skill gaps per community (people grouped by people.community_of). A
+    community has a skill when any member holds it; every rule is checked
+    against every community in one GapRuleSet.evaluate_batch pass.
+    Rows are detect_skill_gaps rows plus "Community", with holders and
+    coverage counted within the community.
+    """
+    rules = rules or load_rules()
+    communities: Dict[str, List[Dict[str, Any]]] = {}
+    for person in people_from_graph(db):
+        communities.setdefault(community_of(person), []).append(person)
+
+    fired = rules.evaluate_batch({
+        name: [skill for person in members for skill in person["skills"]]
+        for name, members in communities.items()
+    })
+
+    gaps = []
+    for name in sorted(fired):
+        members = communities[name]
+        for i in fired[name]:
+            rule = rules.rules[i]
+            requires = set(rule["requires"])
+            holders = {person["name"] for person in members if requires.intersection(person["skills"])}
+            gaps.append({
+                "Community": name,
+                "Missing Skill": rule["missing"],
+                "Reason": rule["reason"],
+                "Suggested Action": rule["action"],
+                "Prerequisite Holders": ", ".join(sorted(holders)),
+                "Coverage": f"{len(holders)} of {len(members)} people",
+            })
+    return gaps
+
+
+class IncrementalGapTracker:
+    """
+    Live skill-gap view maintained from graph mutation events.
+
+    Instead of rescanning Skill nodes and prerequisite holders on every
+    call, the tracker keeps the bitset of rule-relevant skills present,
+    the holders of each relevant skill and the people count, updating them
+    as the client reports writes. `current_gaps()` returns the cached
+    result in O(1) until an event touches something a rule depends on;
+    the list is then rebuilt once, in the same shape as detect_skill_gaps.
+    """
+    def __init__(self, rules: Optional[GapRuleSet] = None):
+        self.rules = rules or load_rules()
+        self._present = 0                       # skill_mask of existing Skill nodes
+        self._people: Dict[str, str] = {}       # person id -> display name
+        self._holders: Dict[str, Set[str]] = {  # relevant skill -> person ids
+            skill: set() for skill in self.rules.skill_bits
+        }
+        self._held: Dict[str, Set[str]] = {}    # person id -> relevant skills held
+        self._gaps: Optional[List[Dict[str, Any]]] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+
+    @METRICS.timed("offline.gap_tracker_attach")
+    def attach(self, db) -> "IncrementalGapTracker":
+        """Prime from one pass over the graph, then follow `db`'s events."""
+        self.detach()
+        for person_id, data in db.iter_nodes(LABEL_PERSON, properties=["name"]):
+            self._people[person_id] = data.get("name") or person_id
+        for name, _ in db.iter_nodes(LABEL_SKILL, properties=[]):
+            self._present |= self.rules.skill_mask([name])
+        for person_id, skill, _ in db.iter_edges(REL_HAS_SKILL, properties=[]):
+            self._hold(person_id, skill)
+        self._gaps = None
+        self._unsubscribe = db.subscribe(self.on_event)
+        return self
+
+    async def attach_async(self, db) -> "IncrementalGapTracker":
+        """attach() for AsyncNeo4jClient (its iterators are async generators)."""
+        self.detach()
+        async for person_id, data in db.iter_nodes(LABEL_PERSON, properties=["name"]):
+            self._people[person_id] = data.get("name") or person_id
+        async for name, _ in db.iter_nodes(LABEL_SKILL, properties=[]):
+            self._present |= self.rules.skill_mask([name])
+        async for person_id, skill, _ in db.iter_edges(REL_HAS_SKILL, properties=[]):
+            self._hold(person_id, skill)
+        self._gaps = None
+        self._unsubscribe = db.subscribe(self.on_event)
+        return self
+
+    def detach(self):
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    # -----------------------------
+    # Event handling
+    # -----------------------------
+
+    def on_event(self, event: GraphEvent):
+        if event.kind == NODE_ADDED:
+            if event.label == LABEL_PERSON:
+                name = event.props.get("name") or event.key
+                if self._people.get(event.key) != name:
+                    self._people[event.key] = name
+                    self._gaps = None
+            elif event.label == LABEL_SKILL:
+                self._set_present(event.key, True)
+
+        elif event.kind == NODE_REMOVED:
+            if event.label == LABEL_PERSON:
+                if self._people.pop(event.key, None) is not None:
+                    self._gaps = None
+                for skill in self._held.pop(event.key, ()):
+                    self._holders[skill].discard(event.key)
+            elif event.label == LABEL_SKILL:
+                self._set_present(event.key, False)
+                # DETACH DELETE drops its HAS_SKILL edges as well
+                for person_id in self._holders.get(event.key, ()):
+                    self._held[person_id].discard(event.key)
+                if event.key in self._holders:
+                    self._holders[event.key] = set()
+
+        elif event.rel_type == REL_HAS_SKILL:
+            if event.kind == EDGE_ADDED:
+                self._hold(event.from_id, event.to_id)
+            elif event.kind == EDGE_REMOVED:
+                holders = self._holders.get(event.to_id)
+                if holders and event.from_id in holders:
+                    holders.discard(event.from_id)
+                    self._held[event.from_id].discard(event.to_id)
+                    self._gaps = None
+
+    def _set_present(self, skill: str, present: bool):
+        mask = self.rules.skill_mask([skill])
+        if not mask:
+            return
+        updated = self._present | mask if present else self._present & ~mask
+        if updated != self._present:
+            self._present = updated
+            self._gaps = None
+
+    def _hold(self, person_id: str, skill: str):
+        holders = self._holders.get(skill)
+        if holders is None or person_id in holders:
+            return
+        holders.add(person_id)
+        self._held.setdefault(person_id, set()).add(skill)
+        self._gaps = None
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+
+    def current_gaps(self) -> List[Dict[str, Any]]:
+        if self._gaps is None:
+            self._gaps = self._build_gaps()
+        return self._gaps
+
+    @METRICS.timed("offline.gap_tracker_build")
+    def _build_gaps(self) -> List[Dict[str, Any]]:
+        rules = self.rules
+        total_people = len(self._people)
+
+        gaps = []
+        for i, (requires, missing) in enumerate(zip(rules.requires, rules.missing)):
+            if self._present & requires != requires or self._present >> missing & 1:
+                continue
+            rule = rules.rules[i]
+            holders = {
+                self._people[person_id]
+                for skill in rule["requires"]
+                for person_id in self._holders[skill]
+                if person_id in self._people
+            }
+            gaps.append({
+                "Missing Skill": rule["missing"],
+                "Reason": rule["reason"],
+                "Suggested Action": rule["action"],
+                "Prerequisite Holders": ", ".join(sorted(holders)),
+                "Coverage": f"{len(holders)} of {total_people} people",
+            })
+        return gaps
@@ -0,0 +1,42 @@
+"""
+Per-person view of the community graph, shared by the prompt encoder
+(prompt_encoding) and the lead pre-ranker (lead_ranking).
+"""
+from typing import Any, Dict, List
+
+from .graph.schema import LABEL_PERSON, REL_HAS_NEED, REL_HAS_SKILL, REL_MENTORS
+
+PERSON_PROPERTIES = ["name", "role", "region", "location"]
+
+
+def community_of(person: Dict[str, Any]) -> str:
+    """Grouping used for per-community views: region, else role."""
+    return person["region"] or person["role"] or "Unassigned"
+
+
+def people_from_graph(db) -> List[Dict[str, Any]]:
+    """
+    {id, name, role, region, skills, needs, mentees} per Person, via the
+    paged iterators (one pass over people, HAS_SKILL, HAS_NEED, MENTORS).
+    """
+    people: Dict[str, Dict[str, Any]] = {}
+    for person_id, data in db.iter_nodes(LABEL_PERSON, properties=PERSON_PROPERTIES):
+        people[person_id] = {
+            "id": person_id,
+            "name": data.get("name") or person_id,
+            "role": data.get("role") or "",
+            "region": data.get("region") or data.get("location"),
+            "skills": [],
+            "needs": [],
+            "mentees": 0,
+        }
+    for rel_type, key in ((REL_HAS_SKILL, "skills"), (REL_HAS_NEED, "needs")):
+        for person_id, name, _ in db.iter_edges(rel_type, properties=[]):
+            person = people.get(person_id)
+            if person is not None:
+                person[key].append(name)
+    for mentor_id, _, _ in db.iter_edges(REL_MENTORS, properties=[]):
+        person = people.get(mentor_id)
+        if person is not None:
+            person["mentees"] += 1
+    return list(people.values())
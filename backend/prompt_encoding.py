@@ -0,0 +1,177 @@
+"""
+Compact, graph-derived community encoding for LLM prompts.
+
+Instead of pasting raw community JSON (and then repeating its people and
+skill lists), the encoding is:
+
+    TERMS     one deduplicated dictionary of skill / need names, most
+              common first, each with holder / needer counts
+    COVERAGE  aggregate stats: single-holder skills, unmet needs, ...
+    PEOPLE    one "name|role|skill idx|need idx" row per person
+
+When the rows would exceed the token budget, people are replaced by
+cluster summaries (by region, else role): size, top skills and needs, and
+a few named members, so the model can still cite real people.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+from .metrics import METRICS
+from .people import community_of, people_from_graph
+from .tokens import estimate_tokens
+
+DEFAULT_PROMPT_TOKENS = 4000
+
+# Cluster mode: terms and named members listed per cluster
+CLUSTER_TOP_TERMS = 8
+CLUSTER_SAMPLE_PEOPLE = 5
+# Coverage lists (single-holder skills, unmet needs) are capped to this many names
+COVERAGE_LIST_LIMIT = 15
+
+@dataclass
+class CommunityEncoding:
+    text: str
+    mode: str                   # "rows" or "clusters"
+    tokens: int                 # estimated tokens of `text`
+    people: int                 # people described
+    names: List[str] = field(default_factory=list)   # names that appear in `text`
+    terms: List[str] = field(default_factory=list)   # skill / need dictionary
+
+
+# -----------------------------
+# Sources
+# -----------------------------
+
+# Graph source: people.people_from_graph
+
+def people_from_state(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """people_from_graph's fields used here, from a raw community JSON ({"people": [...]})."""
+    return [
+        {
+            "name": p.get("name") or p.get("id", ""),
+            "role": p.get("role") or "",
+            "region": p.get("region") or p.get("location"),
+            "skills": list(p.get("skills") or []),
+            "needs": list(p.get("needs") or []),
+        }
+        for p in state.get("people", [])
+    ]
+
+
+# -----------------------------
+# Encoding
+# -----------------------------
+
+def _names(values: Iterable[str]) -> str:
+    values = list(values)
+    shown = ", ".join(values[:COVERAGE_LIST_LIMIT])
+    extra = len(values) - COVERAGE_LIST_LIMIT
+    return f"{shown} (+{extra} more)" if extra > 0 else (shown or "none")
+
+
+def encode_people(people: List[Dict[str, Any]], token_budget: int = DEFAULT_PROMPT_TOKENS) -> CommunityEncoding:
+    holders = Counter(s for p in people for s in set(p["skills"]))
+    needers = Counter(n for p in people for n in set(p["needs"]))
+
+    # One dictionary for skills and needs, most referenced first
+    usage = holders + needers
+    terms = sorted(usage, key=lambda t: (-usage[t], t))
+    index = {term: i for i, term in enumerate(terms)}
+
+    coverage = [
+        "COVERAGE:",
+        f"- {len(people)} people, {len(holders)} distinct skills, {len(needers)} distinct needs",
+        f"- people without skills: {sum(1 for p in people if not p['skills'])}",
+        f"- single-holder skills: {_names(t for t in terms if holders[t] == 1)}",
+        f"- unmet needs (nobody holds it): {_names(t for t in terms if needers[t] and not holders[t])}",
+    ]
+
+    rows = ["PEOPLE (name|role|skill ids|need ids):"] + [
+        "|".join((
+            p["name"],
+            p["role"],
+            ",".join(str(index[s]) for s in dict.fromkeys(p["skills"])),
+            ",".join(str(index[n]) for n in dict.fromkeys(p["needs"])),
+        ))
+        for p in people
+    ]
+    dictionary = _dictionary(terms, holders, needers)
+
+    text = "\n".join(dictionary + coverage + rows)
+    tokens = estimate_tokens(text)
+    if tokens <= token_budget:
+        return CommunityEncoding(
+            text, "rows", tokens, len(people), [p["name"] for p in people], terms
+        )
+    return _encode_clusters(people, holders, needers, coverage, token_budget)
+
+
+def _dictionary(terms: List[str], holders: Counter, needers: Counter) -> List[str]:
+    return ["TERMS (id: name [h=holders n=needers]):"] + [
+        f"{i}: {term} [h={holders[term]} n={needers[term]}]" for i, term in enumerate(terms)
+    ]
+
+
+def _encode_clusters(
+    people: List[Dict[str, Any]],
+    holders: Counter,
+    needers: Counter,
+    coverage: List[str],
+    token_budget: int
+) -> CommunityEncoding:
+    """Cluster summaries, largest first, added while they fit the budget."""
+    clusters: Dict[str, List[Dict[str, Any]]] = {}
+    for p in people:
+        clusters.setdefault(community_of(p), []).append(p)
+    ordered = sorted(clusters.items(), key=lambda item: (-len(item[1]), item[0]))
+
+    # Terms are numbered by first use so the dictionary only lists what is cited
+    index: Dict[str, int] = {}
+    names: List[str] = []
+    lines = ["CLUSTERS (name (size): top skill ids xholders; top need ids xneeders; members):"]
+    used = estimate_tokens("\n".join(coverage + lines))
+    shown = 0
+
+    for cluster, members in ordered:
+        skills = Counter(s for p in members for s in set(p["skills"])).most_common(CLUSTER_TOP_TERMS)
+        needs = Counter(n for p in members for n in set(p["needs"])).most_common(CLUSTER_TOP_TERMS)
+        sample = [
+            p["name"] for p in sorted(members, key=lambda p: -len(p["skills"]))[:CLUSTER_SAMPLE_PEOPLE]
+        ]
+        tentative = dict(index)
+        def ref(term: str) -> int:
+            return tentative.setdefault(term, len(tentative))
+
+        line = (
+            f"{cluster} ({len(members)}): "
+            + " ".join(f"{ref(t)}x{c}" for t, c in skills) + "; "
+            + " ".join(f"{ref(t)}x{c}" for t, c in needs) + "; "
+            + ", ".join(sample)
+        )
+        new_terms = list(tentative)[len(index):]
+        cost = estimate_tokens(line) + sum(estimate_tokens(f"{t} [h=0 n=0]") + 2 for t in new_terms)
+        if used + cost > token_budget and shown:
+            break
+
+        index = tentative
+        lines.append(line)
+        names.extend(sample)
+        used += cost
+        shown += 1
+
+    if shown < len(ordered):
+        rest = sum(len(members) for _, members in ordered[shown:])
+        lines.append(f"(+{len(ordered) - shown} smaller clusters, {rest} people)")
+
+    terms = list(index)
+    text = "\n".join(_dictionary(terms, holders, needers) + coverage + lines)
+    return CommunityEncoding(
+        text, "clusters", estimate_tokens(text), len(people), names, terms
+    )
+
+
+@METRICS.timed("offline.encode_community")
+def encode_community(db, token_budget: int = DEFAULT_PROMPT_TOKENS) -> CommunityEncoding:
+    """Encode the live graph behind a Neo4jClient (or its mock fallback)."""
+    return encode_people(people_from_graph(db), token_budget)
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from .bounded_store import BoundedStore
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EDUMESH_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), "..", ".edumesh", "llm_cache")
+)
+DEFAULT_TTL_S = 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_MB = 256
+
+
+def cache_key(model: str, config: Any, prompt: str) -> str:
+    """
+    sha256 over model, generation config and the prompt BEFORE
+    thought-context injection: each answer adds thoughts to the store, so
+    keying on the injected prompt would turn every repeat into a miss.
+    """
+    if hasattr(config, "model_dump"):
+        config = config.model_dump(mode="json", exclude_none=True)
+    payload = json.dumps(
+        {"model": model, "config": config, "prompt": prompt},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for model responses.
+
+    Tier 1 is an in-process LRU of `memory_entries` entries. Tier 2 is one
+    JSON file per key under `directory`, bounded to `max_disk_bytes` (see
+    bounded_store). Entries older than `ttl` seconds are treated as misses
+    in both tiers. Values are plain JSON-able dicts. Safe to share between
+    Streamlit sessions.
+    """
+    def __init__(
+        self,
+        directory: Optional[str] = DEFAULT_CACHE_DIR,
+        ttl: float | None = DEFAULT_TTL_S,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_MB * 2**20,
+        enabled: bool = True
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.enabled = enabled
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._store = BoundedStore(directory, ".json", memory_entries, max_disk_bytes)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """EDUMESH_CACHE=0 disables caching; TTL / size come from env too."""
+        ttl = float(os.getenv("EDUMESH_CACHE_TTL", DEFAULT_TTL_S))
+        return cls(
+            directory=DEFAULT_CACHE_DIR,
+            ttl=ttl if ttl > 0 else None,
+            memory_entries=int(os.getenv("EDUMESH_CACHE_ENTRIES", DEFAULT_MEMORY_ENTRIES)),
+            max_disk_bytes=int(float(os.getenv("EDUMESH_CACHE_MAX_MB", DEFAULT_DISK_MB)) * 2**20),
+            enabled=os.getenv("EDUMESH_CACHE", "1") != "0",
+        )
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._store.recall(key)
+            if entry is not None and self._fresh(entry):
+                self.hits += 1
+                return entry["value"]
+            if entry is not None:
+                self._store.forget(key)
+
+            entry = self._read_disk(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._store.remember(key, entry)
+            self.hits += 1
+            self.disk_hits += 1
+            return entry["value"]
+
+    def put(self, key: str, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+
+        entry = {"created": time.time(), "value": value}
+        with self._lock:
+            self._store.remember(key, entry)
+            if self.directory:
+                self._store.write(key, json.dumps(entry, default=str).encode("utf-8"))
+
+    def discard(self, key: str):
+        with self._lock:
+            self._store.forget(key)
+            self._store.remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._store.memory),
+            "disk_entries": len(self._store.disk),
+            "disk_bytes": self._store.disk_bytes,
+        }
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return self.ttl is None or time.time() - entry["created"] < self.ttl
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self._store.read(key)
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            self._store.remove(key)
+            return None
+
+        if not self._fresh(entry):
+            self._store.remove(key)
+            return None
+        return entry
@@ -0,0 +1,147 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from .tokens import estimate_tokens, truncate_to_tokens
+
+DEFAULT_NAMESPACE = "default"
+DEFAULT_CAPACITY = 64           # thoughts kept per namespace
+DEFAULT_CONTEXT_TOKENS = 1024   # budget for the injected context block
+DEFAULT_CONTEXT_ENTRIES = 3     # newest thoughts considered for injection
+SUMMARY_TOKENS = 256            # size of one compacted summary entry
+SUMMARY_PREFIX = "Earlier reasoning: "
+
+Compactor = Callable[[List[str]], str]
+
+
+def extractive_summary(thoughts: List[str]) -> str:
+    """
+    Model-free compaction: the first sentence of each thought (an earlier
+    summary is carried over whole), keeping the most recent SUMMARY_TOKENS.
+    Keeps the gist of old reasoning at a fixed size.
+    """
+    heads = []
+    for thought in thoughts:
+        if thought.startswith(SUMMARY_PREFIX):
+            heads.append(thought[len(SUMMARY_PREFIX):])
+            continue
+        head = thought.strip().split("\n", 1)[0]
+        end = head.find(". ")
+        heads.append(head[:end + 1] if end > 0 else head)
+
+    body = " ".join(heads)
+    limit = SUMMARY_TOKENS * 4
+    if len(body) > limit:
+        body = "… " + body[-limit:].split(" ", 1)[-1]
+    return SUMMARY_PREFIX + body
+
+
+def _digest(thought: str) -> str:
+    normalized = " ".join(thought.split()).lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class ThoughtStore:
+    """
+    Bounded, deduplicated thought signatures, one ring buffer per namespace
+    (e.g. "extractor", "gap_detector", "lead_selector").
+
+    Entries are keyed by a hash of their whitespace/case-normalized text, so
+    a repeated thought only moves to the newest position. Each namespace
+    holds at most `capacity` entries: past that, the oldest half is either
+    dropped or, with a `compactor`, folded into a single summary entry.
+    `context()` returns the newest thoughts that fit a token budget, so the
+    injected block has a predictable size however long thoughts get.
+    """
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        context_tokens: int = DEFAULT_CONTEXT_TOKENS,
+        context_entries: int = DEFAULT_CONTEXT_ENTRIES,
+        compactor: Optional[Compactor] = None
+    ):
+        self.capacity = max(2, capacity)
+        self.context_tokens = context_tokens
+        self.context_entries = context_entries
+        self.compactor = compactor
+        self._spaces: Dict[str, "OrderedDict[str, str]"] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ThoughtStore":
+        """EDUMESH_THOUGHT_CAPACITY / _TOKENS size it; EDUMESH_THOUGHT_COMPACT=1 summarizes instead of dropping."""
+        return cls(
+            capacity=int(os.getenv("EDUMESH_THOUGHT_CAPACITY", DEFAULT_CAPACITY)),
+            context_tokens=int(os.getenv("EDUMESH_THOUGHT_TOKENS", DEFAULT_CONTEXT_TOKENS)),
+            compactor=extractive_summary if os.getenv("EDUMESH_THOUGHT_COMPACT") == "1" else None,
+        )
+
+    def add(self, thought, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Store a thought; returns False if it was already present."""
+        if not isinstance(thought, str):
+            thought = str(thought)
+        if not thought.strip():
+            return False
+
+        key = _digest(thought)
+        with self._lock:
+            space = self._spaces.setdefault(namespace, OrderedDict())
+            if key in space:
+                space.move_to_end(key)
+                return False
+            space[key] = thought
+            if len(space) > self.capacity:
+                self._shrink(space)
+            return True
+
+    def _shrink(self, space: "OrderedDict[str, str]"):
+        oldest = [space.popitem(last=False)[1] for _ in range(len(space) // 2)]
+        if self.compactor is None:
+            return
+        summary = self.compactor(oldest)
+        space[_digest(summary)] = summary
+        space.move_to_end(_digest(summary), last=False)
+
+    def context(self, namespace: str = DEFAULT_NAMESPACE, token_budget: Optional[int] = None) -> List[str]:
+        """
+        Newest-last list of up to `context_entries` recent thoughts whose
+        estimated tokens fit `token_budget`. The newest thought is truncated
+        rather than skipped if it alone is over budget.
+        """
+        budget = self.context_tokens if token_budget is None else token_budget
+        with self._lock:
+            recent = list(self._spaces.get(namespace, {}).values())[-self.context_entries:]
+
+        picked: List[str] = []
+        for thought in reversed(recent):
+            cost = estimate_tokens(thought)
+            if cost > budget:
+                if not picked and budget > 0:
+                    picked.append(truncate_to_tokens(thought, budget))
+                break
+            picked.append(thought)
+            budget -= cost
+        return picked[::-1]
+
+    def thoughts(self, namespace: Optional[str] = None) -> List[str]:
+        """Oldest-first thoughts in one namespace, or in all of them."""
+        with self._lock:
+            if namespace is not None:
+                return list(self._spaces.get(namespace, {}).values())
+            return [t for space in self._spaces.values() for t in space.values()]
+
+    def snapshot(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {name: list(space.values()) for name, space in self._spaces.items()}
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace is None:
+                self._spaces.clear()
+            else:
+                self._spaces.pop(namespace, None)
+
+    def __len__(self) -> int:
+        return sum(len(space) for space in self._spaces.values())
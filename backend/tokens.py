@@ -0,0 +1,17 @@
+# Input tokens packed into one batched extraction request
+DEFAULT_BATCH_TOKENS = 8000
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token; good enough for packing and budgets, no API call."""
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cut `text` to roughly `tokens` tokens, on a word boundary when possible."""
+    limit = max(0, tokens) * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > limit // 2 else cut).rstrip() + " …"
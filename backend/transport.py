@@ -0,0 +1,158 @@
+"""
+Pluggable model transport for EduMeshGemini, chosen with GEMINI_TRANSPORT:
+
+    live    (default) the Gemini API, or GEMINI_BASE_URL if set
+    record  live, and every fresh response is appended to a cassette
+    replay  no key or network: a local FakeGeminiServer answers from the
+            cassette, with GEMINI_REPLAY_LATENCY seconds of synthetic delay
+
+The cassette (EDUMESH_CASSETTE, JSONL) maps a hash of model, prompt,
+attached images and response type to the recorded text and thoughts. Replay goes through the
+real SDK and HTTP path, so the pool, streaming and caching layers behave
+as they do live.
+"""
+import os
+import json
+import base64
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .fake_gemini import FakeGeminiServer
+
+TRANSPORTS = ("live", "record", "replay")
+DEFAULT_CASSETTE = os.path.join(os.path.dirname(__file__), "..", "data", "cassettes", "agents.jsonl")
+
+
+def cassette_key(model: str, prompt: str, json_mode: bool, media: Sequence[str] = ()) -> str:
+    """
+    Built from what both the client and the stand-in server can see: the
+    model name, the prompt text (all text parts, joined), whether JSON
+    output was requested and the sha256 of each inline image payload.
+    Text-only keys are unchanged, so older cassettes still replay.
+    """
+    fields = [model, prompt, json_mode] + ([list(media)] if media else [])
+    payload = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def request_media(request: Dict[str, Any]) -> List[str]:
+    """
+    sha256 of each inline data part of a generateContent request body
+    (the SDK sends URL-safe base64; the REST docs use the standard alphabet).
+    """
+    digests = []
+    for content in request.get("contents", []):
+        for part in content.get("parts", []):
+            inline = part.get("inlineData") or part.get("inline_data")
+            if inline:
+                data = base64.b64decode(inline.get("data", ""), altchars=b"-_")
+                digests.append(hashlib.sha256(data).hexdigest())
+    return digests
+
+
+class Cassette:
+    """Append-only JSONL of recorded responses, loaded into a dict by key."""
+    def __init__(self, path: str = DEFAULT_CASSETTE):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+
+    def record(
+        self, model: str, prompt: str, json_mode: bool, result: Dict[str, Any], media: Sequence[str] = ()
+    ):
+        key = cassette_key(model, prompt, json_mode, media)
+        entry = {
+            "key": key,
+            "model": model,
+            "json": json_mode,
+            "prompt_chars": len(prompt),
+            "media": len(media),
+            "text": result["text"],
+            "thoughts": result.get("thoughts") or [],
+        }
+        with self._lock:
+            self.entries[key] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def responder(self, prompt: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """FakeGeminiServer responder; a miss raises LookupError (served as 404)."""
+        config = request.get("generationConfig") or {}
+        json_mode = config.get("responseMimeType") == "application/json"
+        key = cassette_key(request.get("model", ""), prompt, json_mode, request_media(request))
+        entry = self.entries.get(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            raise LookupError("no recorded response for this request")
+        return {"text": entry["text"], "thoughts": entry["thoughts"]}
+
+
+@dataclass
+class Transport:
+    mode: str
+    api_key: Optional[str]
+    base_url: Optional[str]
+    recorder: Optional[Cassette] = None
+    server: Optional[FakeGeminiServer] = None
+
+    def record(self, model: str, contents, config, result: Dict[str, Any]):
+        """
+        Record under the key the replay server will rebuild: contents is the
+        prompt string, or a list of prompt strings and image Parts.
+        """
+        if self.recorder is None:
+            return
+        json_mode = getattr(config, "response_mime_type", None) == "application/json"
+        if isinstance(contents, str):
+            self.recorder.record(model, contents, json_mode, result)
+            return
+
+        texts, media = [], []
+        for part in contents:
+            inline = getattr(part, "inline_data", None)
+            if isinstance(part, str):
+                texts.append(part)
+            elif inline is not None:
+                media.append(hashlib.sha256(inline.data).hexdigest())
+            elif getattr(part, "text", None):
+                texts.append(part.text)
+        self.recorder.record(model, "".join(texts), json_mode, result, media)
+
+    def close(self):
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+
+
+def resolve_transport(mode: Optional[str] = None, cassette: Optional[str] = None) -> Transport:
+    mode = mode or os.getenv("GEMINI_TRANSPORT", "live")
+    if mode not in TRANSPORTS:
+        raise ValueError(f"Unknown GEMINI_TRANSPORT: {mode} (expected one of {', '.join(TRANSPORTS)})")
+    cassette = cassette or os.getenv("EDUMESH_CASSETTE", DEFAULT_CASSETTE)
+
+    if mode == "replay":
+        server = FakeGeminiServer(
+            latency=float(os.getenv("GEMINI_REPLAY_LATENCY", 0)),
+            responder=Cassette(cassette).responder,
+        ).start()
+        print(f"↩️ Replaying Gemini responses from {cassette} via {server.url}")
+        return Transport(mode, os.getenv("GEMINI_API_KEY") or "replay", server.url, server=server)
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    base_url = os.getenv("GEMINI_BASE_URL")
+    # A local stand-in endpoint does not check keys
+    if not api_key and base_url:
+        api_key = "local"
+    recorder = Cassette(cassette) if mode == "record" else None
+    return Transport(mode, api_key, base_url, recorder=recorder)
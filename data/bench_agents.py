@@ -0,0 +1,210 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.fake_gemini import FakeGeminiServer, synthetic_responder
+from backend.transport import DEFAULT_CASSETTE
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def configure(args):
+    """
+    Point EduMeshGemini at the chosen transport. "synthetic" serves
+    schema-shaped answers from a local FakeGeminiServer; "replay" answers
+    from a cassette; "record" calls the live API (spends quota) and writes
+    the cassette that "replay" reads back.
+    """
+    os.environ["GEMINI_TRANSPORT"] = "live" if args.transport == "synthetic" else args.transport
+    os.environ["EDUMESH_CASSETTE"] = args.cassette
+    os.environ["GEMINI_REPLAY_LATENCY"] = str(args.latency)
+    if args.transport != "synthetic":
+        return None
+
+    server = FakeGeminiServer(
+        latency=args.latency, responder=synthetic_responder, chunk_delay=args.chunk_delay
+    ).start()
+    os.environ["GEMINI_BASE_URL"] = server.url
+    os.environ.setdefault("GEMINI_API_KEY", "local")
+    return server
+
+
+def load_surveys(count: int):
+    with open(os.path.join(DATA_DIR, "mock_surveys.txt"), "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    # Repeat the sample with a suffix so every document is a distinct prompt
+    return [(f"doc-{i}", f"{lines[i % len(lines)]} (respondent {i})") for i in range(count)]
+
+
+def timed(call):
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+
+# -----------------------------
+# Sections
+# -----------------------------
+
+def bench_extraction(gemini, surveys, batch_tokens):
+    from backend.entity_extractor import EntityExtractor
+
+    extractor = EntityExtractor(gemini)
+    _, single = timed(lambda: [extractor.extract(text) for _, text in surveys])
+    before = gemini.cache.misses
+    results, batched = timed(lambda: list(extractor.extract_many(surveys, batch_tokens)))
+    return {
+        "documents": len(surveys),
+        "single": {"requests": len(surveys), "seconds": single, "docs_per_s": len(surveys) / single},
+        "batched": {
+            "requests": gemini.cache.misses - before,
+            "seconds": batched,
+            "docs_per_s": len(surveys) / batched,
+            "extracted": sum(1 for _, r in results if r),
+        },
+    }
+
+
+def bench_prompt(gemini, name, prompt):
+    """Blocking cold call, the same call warm from the cache, then an uncached stream."""
+    # The cache key ignores injected thought context, so the warm call is a hit in the same namespace
+    _, cold = timed(lambda: gemini.generate_json(prompt, namespace=f"bench-{name}"))
+    _, warm = timed(lambda: gemini.generate_json(prompt, namespace=f"bench-{name}"))
+    items = list(gemini.stream_json(prompt, use_cache=False, namespace=f"bench-{name}-stream"))
+    return {
+        "cold_s": cold,
+        "warm_s": warm,
+        "stream_ttfr_s": gemini.last_stream["ttfr_s"],
+        "stream_total_s": gemini.last_stream["total_s"],
+        "items": len(items),
+    }
+
+
+def bench_agents(gemini):
+    from backend.gap_detector import GapDetector
+    from backend.lead_selector import LeadSelector
+    from backend.prompt_encoding import encode_people, people_from_state
+
+    with open(os.path.join(DATA_DIR, "mock_community.json"), "r", encoding="utf-8") as f:
+        state = json.load(f)
+    encoding = encode_people(people_from_state(state))
+    selector = LeadSelector(gemini)
+    return {
+        "gap_detector": bench_prompt(gemini, "gaps", GapDetector(gemini).build_prompt(encoding)),
+        "lead_selector": bench_prompt(gemini, "leads", selector.build_prompt(selector.rank(state))),
+    }
+
+
+def bench_concurrency(gemini, levels, requests):
+    from backend.gemini_pool import GeminiPool
+
+    rows = []
+    for level in levels:
+        # Rate limits lifted: this measures concurrency, not the request budget
+        pool = GeminiPool(gemini, max_concurrency=level, requests_per_min=1e6, tokens_per_min=1e9)
+        latencies = []
+
+        async def call(i):
+            start = time.perf_counter()
+            result = await pool.generate_json(
+                f"Benchmark request {level}-{i}: answer with an empty JSON object.",
+                use_cache=False,
+                namespace=f"bench-pool-{level}-{i}",
+            )
+            latencies.append(time.perf_counter() - start)
+            return result
+
+        results, seconds = timed(lambda: asyncio.run(pool.map(call, range(requests))))
+        rows.append({
+            "concurrency": level,
+            "requests": requests,
+            "seconds": seconds,
+            "req_per_s": requests / seconds,
+            "p50_s": statistics.median(latencies) if latencies else None,
+            "errors": sum(1 for r in results if isinstance(r, Exception)),
+        })
+    return rows
+
+
+# -----------------------------
+# Report
+# -----------------------------
+
+def report(results):
+    ex = results["extraction"]
+    print(f"\n📄 Extraction ({ex['documents']} documents)")
+    print(f"{'mode':>8} | {'requests':>8} | {'seconds':>8} | {'docs/s':>7}")
+    for mode in ("single", "batched"):
+        row = ex[mode]
+        print(f"{mode:>8} | {row['requests']:>8} | {row['seconds']:>8.2f} | {row['docs_per_s']:>7.1f}")
+
+    print("\n🧠 Agents (seconds)")
+    print(f"{'agent':>13} | {'cold':>6} | {'warm':>6} | {'stream TTFR':>11} | {'stream total':>12} | {'items':>5}")
+    for name, row in results["agents"].items():
+        print(
+            f"{name:>13} | {row['cold_s']:>6.2f} | {row['warm_s']:>6.3f} | "
+            f"{row['stream_ttfr_s'] or 0:>11.2f} | {row['stream_total_s']:>12.2f} | {row['items']:>5}"
+        )
+
+    cache = results["cache"]
+    print(f"\n💾 Cache: {cache['hits']} hits / {cache['misses']} misses ({cache['hit_rate']:.0%})")
+
+    print("\n⚡ GeminiPool scaling")
+    print(f"{'workers':>7} | {'seconds':>8} | {'req/s':>7} | {'p50 s':>6} | {'errors':>6}")
+    for row in results["concurrency"]:
+        print(
+            f"{row['concurrency']:>7} | {row['seconds']:>8.2f} | {row['req_per_s']:>7.1f} | "
+            f"{row['p50_s'] or 0:>6.2f} | {row['errors']:>6}"
+        )
+
+
+def run(args):
+    server = configure(args)
+    from backend.gemini_client import EduMeshGemini
+    from backend.response_cache import ResponseCache
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            gemini = EduMeshGemini(cache=ResponseCache(directory=cache_dir))
+            results = {
+                "transport": args.transport,
+                "latency_s": args.latency,
+                "extraction": bench_extraction(gemini, load_surveys(args.surveys), args.batch_tokens),
+                "agents": bench_agents(gemini),
+            }
+            results["cache"] = gemini.cache.stats()
+            results["concurrency"] = bench_concurrency(
+                gemini, [int(c) for c in args.concurrency.split(",")], args.pool_requests
+            )
+            gemini.transport.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline agent latency / throughput benchmark.")
+    parser.add_argument("--transport", choices=["synthetic", "replay", "record"], default="synthetic")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE, help="cassette for replay / record")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per simulated request")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument("--surveys", type=int, default=30)
+    parser.add_argument("--batch-tokens", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,2,4,8,16")
+    parser.add_argument("--pool-requests", type=int, default=32)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    run(parser.parse_args())
@@ -0,0 +1,127 @@
+import sys
+import os
+import gc
+import time
+import argparse
+import tracemalloc
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import networkx as nx
+from backend.graph.compact_graph import CompactGraph
+from backend.graph.schema import REL_HAS_SKILL
+from data.mock_data_generator import SYNTHETIC_PROPERTIES, generate_synthetic_people
+
+TRAVERSAL_SAMPLES = 1000
+
+
+def community(size: int, seed: int = 7):
+    """(person rows, skill names, (person, skill) edges) of a seeded synthetic community."""
+    people, edges = [], []
+    for person in generate_synthetic_people(size, seed):
+        people.append({key: person[key] for key in SYNTHETIC_PROPERTIES})
+        edges.extend((person["id"], skill) for skill in person["skills"])
+    skills = list(dict.fromkeys(skill for _, skill in edges))
+    return people, skills, edges
+
+
+def build_networkx(people, skills, edges):
+    graph = nx.DiGraph()
+    for person in people:
+        graph.add_node(person["id"], labels="Person", **person)
+    for skill in skills:
+        graph.add_node(skill, labels="Skill", name=skill)
+    for person_id, skill in edges:
+        graph.add_edge(person_id, skill, type=REL_HAS_SKILL)
+    return graph
+
+
+def build_compact(people, skills, edges):
+    graph = CompactGraph()
+    for person in people:
+        graph.add_node(person["id"], "Person", person)
+    for skill in skills:
+        graph.add_node(skill, "Skill", {"name": skill})
+    for person_id, skill in edges:
+        graph.add_edge(person_id, skill, REL_HAS_SKILL)
+    graph.compact()
+    return graph
+
+
+def traverse_networkx(graph, people, skills):
+    holders = sum(1 for skill in skills for _ in graph.predecessors(skill))
+    owned = sum(1 for p in people for _ in graph.successors(p["id"]))
+    return holders + owned
+
+
+def traverse_compact(graph, people, skills):
+    holders = sum(1 for skill in skills for _ in graph.predecessors(skill, REL_HAS_SKILL))
+    owned = sum(1 for p in people for _ in graph.successors(p["id"], REL_HAS_SKILL))
+    return holders + owned
+
+
+BACKENDS = {
+    "networkx": (build_networkx, traverse_networkx),
+    "compact": (build_compact, traverse_compact),
+}
+
+
+def measure(name, size):
+    build, traverse = BACKENDS[name]
+    people, skills, edges = community(size)
+    sample = people[:TRAVERSAL_SAMPLES]
+
+    # Timed build and traversal run untraced; tracemalloc slows
+    # allocation-heavy code, so memory comes from a second, traced build.
+    gc.collect()
+    start = time.perf_counter()
+    graph = build(people, skills, edges)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    visited = traverse(graph, sample, skills)
+    traverse_s = time.perf_counter() - start
+
+    del graph
+    gc.collect()
+    tracemalloc.start()
+    graph = build(people, skills, edges)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return {
+        "backend": name,
+        "nodes": size + len(skills),
+        "edges": len(edges),
+        "memory_mb": memory / 2**20,
+        "build_s": build_s,
+        "traverse_ms": traverse_s * 1000,
+        "visited": visited,
+    }
+
+
+def bench(sizes, backends):
+    """
+    Graph memory (tracemalloc, excludes the input rows) and traversal time:
+    people-per-skill over every skill + skills-per-person over a sample.
+    """
+    print(f"{'backend':>9} | {'nodes':>10} | {'edges':>10} | {'MB':>8} | {'build s':>8} | {'traverse ms':>11}")
+    for size in sizes:
+        for name in backends:
+            r = measure(name, size)
+            print(
+                f"{r['backend']:>9} | {r['nodes']:>10,} | {r['edges']:>10,} | "
+                f"{r['memory_mb']:>8.1f} | {r['build_s']:>8.2f} | {r['traverse_ms']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock graph memory / traversal benchmark.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--backends", default="networkx,compact")
+    args = parser.parse_args()
+    bench(
+        [int(s) for s in args.sizes.split(",")],
+        args.backends.split(","),
+    )
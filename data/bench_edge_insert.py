@@ -0,0 +1,55 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.neo4j_client import Neo4jClient
+from backend.graph.schema import REL_HAS_SKILL
+
+# Node counts to grow the graph through, and edges timed at each step
+SIZES = [1_000, 10_000, 50_000]
+SAMPLE_EDGES = 200
+SKILLS = 100
+
+
+def bench():
+    """
+    Edge-insert latency as the graph grows.
+    With the Person.id / Skill.name constraints in place every insert is
+    two index seeks, so latency per edge should stay flat across sizes.
+    Uses a "bench-" id prefix; in Neo4j mode those nodes are removed after.
+    """
+    db = Neo4jClient()
+    db.bulk_upsert_skills(f"bench-skill-{i}" for i in range(SKILLS))
+
+    created = 0
+    print(f"{'nodes':>10} | {'µs / edge':>10}")
+    for size in SIZES:
+        db.bulk_upsert_people(
+            {"id": f"bench-p{i}", "name": f"Bench {i}"}
+            for i in range(created, size)
+        )
+        created = size
+
+        start = time.perf_counter()
+        for i in range(SAMPLE_EDGES):
+            person = f"bench-p{(i * 7919) % size}"
+            db.create_relationship(
+                person, f"bench-skill-{i % SKILLS}", REL_HAS_SKILL
+            )
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10,} | {elapsed / SAMPLE_EDGES * 1e6:>10.1f}")
+
+    if not db.use_mock:
+        with db.driver.session() as session:
+            session.run(
+                "MATCH (n) WHERE n.id STARTS WITH 'bench-' "
+                "OR n.name STARTS WITH 'bench-' DETACH DELETE n"
+            ).consume()
+    db.close()
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,49 @@
+import sys
+import os
+import json
+import time
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.prompt_encoding import DEFAULT_PROMPT_TOKENS, encode_people
+from backend.tokens import estimate_tokens
+from data.mock_data_generator import generate_synthetic_people
+
+
+def community(size: int, seed: int = 7):
+    """Raw community JSON state ({"people": [...]}) of a seeded synthetic community."""
+    return {"people": list(generate_synthetic_people(size, seed))}
+
+
+def raw_prompt_tokens(state) -> int:
+    """What GapDetector used to send: the full JSON plus repeated people / skill lists."""
+    people = [p["name"] for p in state["people"]]
+    skills = sorted({s for p in state["people"] for s in p["skills"]})
+    return estimate_tokens(json.dumps(state)) + estimate_tokens(str(people)) + estimate_tokens(str(skills))
+
+
+def bench(sizes, budget):
+    print(f"{'people':>9} | {'raw tokens':>11} | {'encoded':>8} | {'mode':>8} | {'reduction':>9} | {'encode ms':>9}")
+    for size in sizes:
+        state = community(size)
+        raw = raw_prompt_tokens(state)
+        people = [dict(p, needs=p["needs"]) for p in state["people"]]
+
+        start = time.perf_counter()
+        encoding = encode_people(people, budget)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{size:>9,} | {raw:>11,} | {encoding.tokens:>8,} | {encoding.mode:>8} | "
+            f"{raw / encoding.tokens:>8.1f}x | {elapsed * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GapDetector prompt size: raw JSON vs compact encoding.")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--budget", type=int, default=DEFAULT_PROMPT_TOKENS)
+    args = parser.parse_args()
+    bench([int(s) for s in args.sizes.split(",")], args.budget)
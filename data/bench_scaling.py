@@ -0,0 +1,187 @@
+import sys
+import os
+import gc
+import json
+import time
+import resource
+import argparse
+import platform
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from backend.graph.neo4j_client import Neo4jClient
+from backend.graph.schema import LABEL_PERSON, LABEL_SKILL
+from backend.offline_gap_detector import IncrementalGapTracker, detect_skill_gaps
+from data.mock_data_generator import generate_synthetic_people, load_synthetic_community
+from frontend.graph_view import build_view, snapshot_graph
+
+STAGES = ["generate", "ingest", "iterate", "columns", "gaps", "dataframes", "graph_view"]
+# A stage this much slower than the baseline (seconds ratio - 1) is a
+# regression, unless it is also within NOISE_FLOOR_S of it
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_S = 0.01
+# Read-only stages report the best of this many runs
+DEFAULT_REPEAT = 3
+# Neo4j mode writes under this id / name prefix and deletes it afterwards
+BENCH_PREFIX = "bench-"
+
+
+def timed(call, repeat=1):
+    """(result, best seconds over `repeat` runs)."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def record(results, stage, seconds, items):
+    results[stage] = {
+        "seconds": round(seconds, 6),
+        "items": items,
+        "per_sec": round(items / seconds, 1) if seconds > 0 else None,
+    }
+    print(f"   {stage:<22} {seconds:>9.3f}s  {items:>11,} items  {items / seconds if seconds else 0:>13,.0f} /s")
+
+
+def bench_size(size, seed, chunk_size, stages, repeat=DEFAULT_REPEAT):
+    """All stages for one community size; returns {stage: {seconds, items, per_sec}}."""
+    results = {}
+    print(f"\n👥 {size:,} members (seed {seed})")
+
+    if "generate" in stages:
+        count, seconds = timed(lambda: sum(1 for _ in generate_synthetic_people(size, seed)))
+        record(results, "generate", seconds, count)
+
+    db = Neo4jClient()
+    prefix = "" if db.use_mock else BENCH_PREFIX
+    stats, seconds = timed(lambda: load_synthetic_community(db, size, seed, chunk_size, prefix))
+    results["graph"] = {"mode": "mock" if db.use_mock else "neo4j", "nodes": db.count_nodes(), "edges": stats["edges"]}
+    if "ingest" in stages:
+        record(results, "ingest_records", seconds, stats["records"])
+        record(results, "ingest_rows", seconds, stats["rows"])
+
+    if "iterate" in stages:
+        count, seconds = timed(lambda: sum(1 for _ in db.iter_nodes()), repeat)
+        record(results, "iter_nodes", seconds, count)
+        count, seconds = timed(lambda: sum(1 for _ in db.iter_edges(properties=[])), repeat)
+        record(results, "iter_edges", seconds, count)
+
+    if "columns" in stages:
+        columns, seconds = timed(lambda: db.node_columns(), repeat)
+        record(results, "node_columns", seconds, len(columns["key"]))
+        columns, seconds = timed(lambda: db.edge_columns(properties=[]), repeat)
+        record(results, "edge_columns", seconds, len(columns["from"]))
+
+    if "gaps" in stages:
+        gaps, seconds = timed(lambda: detect_skill_gaps(db), repeat)
+        record(results, "gap_detection", seconds, len(gaps))
+        tracker, seconds = timed(lambda: IncrementalGapTracker().attach(db))
+        record(results, "gap_tracker_attach", seconds, len(tracker.current_gaps()))
+        tracker.detach()
+
+    if "dataframes" in stages:
+        # Same construction as the Community Graph tab (frontend/app.py)
+        def frames():
+            people = db.node_columns(LABEL_PERSON, ["id", "name", "age"])
+            skills = db.node_columns(LABEL_SKILL, ["name"])
+            edges = db.edge_columns(properties=[])
+            return (
+                pd.DataFrame({"ID": people["id"], "Name": people["name"], "Age": people["age"]}),
+                pd.DataFrame({"Skill Name": skills["name"]}),
+                pd.DataFrame({"From": edges["from"], "Relationship": edges["type"], "To": edges["to"]}),
+            )
+        tables, seconds = timed(frames, repeat)
+        record(results, "dataframes", seconds, sum(len(t) for t in tables))
+
+    if "graph_view" in stages:
+        snapshot, seconds = timed(lambda: snapshot_graph(db))
+        record(results, "graph_snapshot", seconds, len(snapshot.labels))
+        (nodes, _), seconds = timed(lambda: build_view(snapshot), repeat)
+        record(results, "graph_view", seconds, len(nodes))
+        (nodes, _), seconds = timed(lambda: build_view(snapshot, frozenset({0})), repeat)
+        record(results, "graph_view_expanded", seconds, len(nodes))
+
+    if not db.use_mock:
+        with db.driver.session() as session:
+            session.run(
+                "MATCH (n) WHERE n.id STARTS WITH $prefix "
+                "OR n.name STARTS WITH $prefix DETACH DELETE n",
+                prefix=BENCH_PREFIX
+            ).consume()
+    db.close()
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Print seconds ratios against a saved run; returns the number of regressions."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    print(f"\n📊 Compared with {baseline_path} (tolerance {tolerance:.0%})")
+    print(f"{'members':>10} | {'stage':<22} | {'baseline s':>10} | {'now s':>10} | {'ratio':>6}")
+    for size, stages in results["sizes"].items():
+        for stage, now in stages.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(stage)
+            if not before or "seconds" not in now or not before.get("seconds"):
+                continue
+            ratio = now["seconds"] / before["seconds"]
+            flag = ""
+            if ratio > 1 + tolerance and now["seconds"] - before["seconds"] > NOISE_FLOOR_S:
+                regressions += 1
+                flag = " ⚠️"
+            print(
+                f"{int(size):>10,} | {stage:<22} | {before['seconds']:>10.3f} | "
+                f"{now['seconds']:>10.3f} | {ratio:>5.2f}x{flag}"
+            )
+    return regressions
+
+
+def bench(args):
+    stages = set(args.stages.split(","))
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "chunk_size": args.chunk_size,
+            "repeat": args.repeat,
+        },
+        "sizes": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        results["sizes"][str(size)] = bench_size(size, args.seed, args.chunk_size, stages, args.repeat)
+    # ru_maxrss is in KiB on Linux
+    results["meta"]["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n⚠️ {regressions} stage(s) slower than the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmarks on seeded synthetic communities.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated member counts (up to 1000000)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per read-only stage (best is kept)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    bench(parser.parse_args())
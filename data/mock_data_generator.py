@@ -1,9 +1,23 @@
+import sys
 import json
 import os
+import time
+import random
+import argparse
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+# Add project root to path (when run as a script)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.cypher import chunked
+from backend.graph.schema import REL_HAS_NEED, REL_HAS_SKILL, REL_MENTORS, need_name
+
+DATA_DIR = os.path.dirname(__file__)
 
 def generate_mock_data(db):
-    json_path = os.path.join(os.path.dirname(__file__), "mock_community.json")
-    
+    json_path = os.path.join(DATA_DIR, "mock_community.json")
+
     if not os.path.exists(json_path):
         print(f"Warning: {json_path} not found. Skipping mock generation.")
         return
@@ -11,17 +25,184 @@ def generate_mock_data(db):
     with open(json_path, "r") as f:
         data = json.load(f)
 
-    for person in data.get("people", []):
-        # 1. Upsert Person
-        # Copy person data but exclude lists (skills, interests) for properties if needed, 
-        # but Neo4j supports list properties. 
-        # For graph purity, we separate skills into nodes, but keeping them as props is also fine.
-        # We'll pass the whole dict to upsert_person as requested.
-        db.upsert_person(person)
+    people = data.get("people", [])
+    start = time.perf_counter()
+
+    # 1. Upsert People
+    # Neo4j supports list properties, so the whole dict (skills, needs,
+    # interests) is stored on the Person node as well as being split into
+    # Skill and Need nodes.
+    rows = db.bulk_upsert_people(people)
+
+    # 2. Upsert Skills (deduplicated) and HAS_SKILL relationships
+    skills = {skill for person in people for skill in person.get("skills", [])}
+    rows += db.bulk_upsert_skills(sorted(skills))
+    rows += db.bulk_create_relationships(
+        {"from": person["id"], "to": skill, "type": REL_HAS_SKILL}
+        for person in people
+        for skill in person.get("skills", [])
+    )
+
+    # 3. Upsert Needs and HAS_NEED relationships
+    needs = {need for person in people for need in person.get("needs", [])}
+    rows += db.bulk_upsert_needs(sorted(needs))
+    rows += db.bulk_create_relationships(
+        {"from": person["id"], "to": need, "type": REL_HAS_NEED}
+        for person in people
+        for need in person.get("needs", [])
+    )
+
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"✅ Mock data generated from {json_path} "
+        f"({rows} rows in {elapsed:.2f}s, {rate:,.0f} rows/sec)"
+    )
+
+
+# -----------------------------
+# Synthetic communities (scale testing)
+# -----------------------------
+# Seeded, streamed generator for communities far larger than the demo
+# file: the same seed and size always give the same people, skills, needs
+# and mentorship edges, one person at a time (constant memory at 1M).
+
+ROLES = ["Student", "Teacher", "Technician", "Designer", "Developer", "Mentor", "Manager"]
+ROLE_WEIGHTS = [40, 10, 15, 8, 12, 5, 10]
+REGIONS = ["North", "South", "East", "West", "Central"]
+
+# Skill (and need) popularity is Zipf-like: the k-th most common name is
+# drawn with weight 1 / k ** POPULARITY_EXPONENT
+POPULARITY_EXPONENT = 1.1
+SKILLS_PER_PERSON = (1, 6)
+NEEDS_PER_PERSON = (0, 3)
+# Share of members with a mentor. Mentors are earlier members, skewed
+# toward the earliest (index * random() ** MENTOR_SKEW), so a few seniors
+# mentor many and mentorship in-degree is heavy-tailed too.
+MENTEE_SHARE = 0.3
+MENTOR_SKEW = 2.0
+
+# Person properties written to the graph; the rest become relationships
+SYNTHETIC_PROPERTIES = ("id", "name", "role", "region", "age")
+
+
+def synthetic_vocabulary(size: int, prefix: str = "") -> List[str]:
+    """
+    Skill names, most popular first: the demo community's skills, then
+    generated ones, about 4 * sqrt(size) in all. Skills that gap rules
+    report as missing are left out so rule-based gaps still fire.
+    """
+    with open(os.path.join(DATA_DIR, "mock_community.json"), "r") as f:
+        demo = [s for p in json.load(f).get("people", []) for s in p.get("skills", [])]
+    with open(os.path.join(DATA_DIR, "skill_gap_rules.json"), "r") as f:
+        missing = {rule["missing"] for rule in json.load(f).get("rules", [])}
+
+    names = [s for s in dict.fromkeys(demo) if s not in missing]
+    total = max(50, int(4 * size ** 0.5))
+    names += [f"Skill {i}" for i in range(total - len(names))]
+    return [f"{prefix}{name}" for name in names]
+
+
+def _draw(rng: random.Random, names: List[str], cum_weights: List[float], bounds) -> List[str]:
+    return list(dict.fromkeys(rng.choices(names, cum_weights=cum_weights, k=rng.randint(*bounds))))
+
+
+def generate_synthetic_people(size: int, seed: int = 7, prefix: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    Yield `size` people: {"id", "name", "role", "region", "age", "skills",
+    "needs"} plus "mentor" (an earlier member's id) for about MENTEE_SHARE
+    of them. `prefix` is prepended to ids and skill names.
+    """
+    rng = random.Random(seed)
+    skills = synthetic_vocabulary(size, prefix)
+    weights = list(accumulate(1 / (rank + 1) ** POPULARITY_EXPONENT for rank in range(len(skills))))
+    # Demand follows its own popularity order: common needs are not the
+    # common skills (see schema.need_name for the naming)
+    needs = [need_name(name) for name in skills]
+    rng.shuffle(needs)
+    role_weights = list(accumulate(ROLE_WEIGHTS))
+
+    for i in range(size):
+        person = {
+            "id": f"{prefix}p{i}",
+            "name": f"Member {i}",
+            "role": rng.choices(ROLES, cum_weights=role_weights)[0],
+            "region": rng.choice(REGIONS),
+            "age": rng.randint(16, 70),
+            "skills": _draw(rng, skills, weights, SKILLS_PER_PERSON),
+            "needs": _draw(rng, needs, weights, NEEDS_PER_PERSON),
+        }
+        if i and rng.random() < MENTEE_SHARE:
+            person["mentor"] = f"{prefix}p{int(i * rng.random() ** MENTOR_SKEW)}"
+        yield person
+
+
+def load_synthetic_community(
+    db,
+    size: int,
+    seed: int = 7,
+    chunk_size: int = 1000,
+    prefix: str = ""
+) -> Dict[str, Any]:
+    """
+    Write a synthetic community through the client's bulk APIs, one chunk
+    at a time. Returns {"records", "rows", "edges", "elapsed"}.
+    """
+    stats = {"records": 0, "rows": 0, "edges": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+
+    for people in chunked(generate_synthetic_people(size, seed, prefix), chunk_size):
+        edges = [
+            {"from": p["id"], "to": s, "type": REL_HAS_SKILL} for p in people for s in p["skills"]
+        ] + [
+            {"from": p["id"], "to": n, "type": REL_HAS_NEED} for p in people for n in p["needs"]
+        ] + [
+            {"from": p["mentor"], "to": p["id"], "type": REL_MENTORS} for p in people if "mentor" in p
+        ]
+        stats["rows"] += db.bulk_upsert_people(
+            {key: p[key] for key in SYNTHETIC_PROPERTIES} for p in people
+        )
+        stats["rows"] += db.bulk_upsert_skills(sorted({s for p in people for s in p["skills"]}))
+        stats["rows"] += db.bulk_upsert_needs(sorted({n for p in people for n in p["needs"]}))
+        stats["rows"] += db.bulk_create_relationships(edges)
+        stats["records"] += len(people)
+        stats["edges"] += len(edges)
+
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def write_synthetic_jsonl(path: str, size: int, seed: int = 7) -> int:
+    """One person per line, readable by `python -m backend.ingest` (mentor edges are not ingested)."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for person in generate_synthetic_people(size, seed):
+            f.write(json.dumps(person) + "\n")
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    from backend.graph.neo4j_client import Neo4jClient
 
-        # 2. Create Skill Relationships
-        for skill in person.get("skills", []):
-            db.upsert_skill(skill)
-            db.create_relationship(person["id"], skill, "HAS_SKILL")
+    parser = argparse.ArgumentParser(description="Load the demo community, or a seeded synthetic one.")
+    parser.add_argument("--synthetic", type=int, metavar="MEMBERS", help="generate this many members instead")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--output", help="write the synthetic community as JSONL instead of loading it")
+    args = parser.parse_args()
 
-    print(f"✅ Mock data generated from {json_path}")
+    if args.synthetic and args.output:
+        written = write_synthetic_jsonl(args.output, args.synthetic, args.seed)
+        print(f"✅ Wrote {written:,} synthetic members to {args.output}")
+    else:
+        client = Neo4jClient()
+        if args.synthetic:
+            stats = load_synthetic_community(client, args.synthetic, args.seed, args.chunk_size)
+            print(
+                f"✅ Synthetic community loaded ({stats['records']:,} members, {stats['rows']:,} rows "
+                f"in {stats['elapsed']:.2f}s, {stats['rows'] / stats['elapsed']:,.0f} rows/sec)"
+            )
+        else:
+            generate_mock_data(client)
+        client.close()
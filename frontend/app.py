@@ -1,7 +1,7 @@
+import atexit
 import streamlit as st
 import sys
 import os
-import json
 import pandas as pd
 
 # Add project root to path so we can import backend modules
@@ -11,45 +11,38 @@ from backend.gemini_client import EduMeshGemini
 from backend.graph.neo4j_client import Neo4jClient
 from backend.gap_detector import GapDetector
 # from backend.offline_gap_detector import OfflineGapDetector
-from backend.offline_gap_detector import detect_skill_gaps
+from backend.offline_gap_detector import IncrementalGapTracker, detect_community_gaps
+from backend.prompt_encoding import encode_community
 from backend.lead_selector import LeadSelector
+from backend.lead_ranking import rank_leads_from_graph
+from backend.metrics import METRICS
+from frontend.graph_view import render_lod_graph
 from data.mock_data_generator import generate_mock_data
 
-def split_nodes_by_type(nodes):
+def split_nodes_by_type(db):
     """
-    Convert raw graph nodes into structured DataFrames
-    for clean UI rendering.
+    Convert graph nodes into structured DataFrames
+    for clean UI rendering (label-indexed columns, no per-row dicts).
     """
-    people = []
-    skills = []
+    people = db.node_columns("Person", ["id", "name", "age"])
+    skills = db.node_columns("Skill", ["name"])
 
-    for node_id, data in nodes:
-        label = data.get("labels")
-
-        if label == "Person":
-            people.append({
-                "ID": data.get("id"),
-                "Name": data.get("name"),
-                "Age": data.get("age")
-            })
-
-        elif label == "Skill":
-            skills.append({
-                "Skill Name": data.get("name")
-            })
-
-    return pd.DataFrame(people), pd.DataFrame(skills)
+    people_df = pd.DataFrame({
+        "ID": people["id"],
+        "Name": people["name"],
+        "Age": people["age"]
+    })
+    skills_df = pd.DataFrame({"Skill Name": skills["name"]})
+    return people_df, skills_df
 
 def section_divider(title: str):
     st.markdown(f"### {title}")
     st.markdown("---")
 
-def render_community_tables(nodes):
+def render_community_tables(people_df, skills_df):
     """
     Render People and Skills tables in a judge-friendly format.
     """
-    people_df, skills_df = split_nodes_by_type(nodes)
-
     st.subheader("👥 Community Members")
     if not people_df.empty:
         st.dataframe(people_df.reset_index(drop=True), use_container_width=True)
@@ -64,31 +57,22 @@ def render_community_tables(nodes):
     else:
         st.info("No skills found.")
 
-def extract_relationships(mock_graph):
+def extract_relationships(db):
     """
-    Convert mock graph edges into a table.
+    Convert graph edges into a table (columnar export, works in both modes).
     """
-    rows = []
-
-    for source, target, data in mock_graph.edges(data=True):
-        rows.append({
-            "From": source,
-            "Relationship": data.get("type"),
-            "To": target
-        })
+    edges = db.edge_columns(properties=[])
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame({
+        "From": edges["from"],
+        "Relationship": edges["type"],
+        "To": edges["to"]
+    })
 
-def render_relationships_table(db):
+def render_relationships_table(rel_df):
     """
-    Render relationships if running in mock mode.
+    Render relationships between people and skills.
     """
-    if not db.use_mock:
-        st.info("Relationship view available in mock mode only.")
-        return
-
-    rel_df = extract_relationships(db.mock_graph)
-
     st.subheader("🔗 Who Can Do What")
     if not rel_df.empty:
         st.dataframe(rel_df.reset_index(drop=True), use_container_width=True)
@@ -96,6 +80,75 @@ def render_relationships_table(db):
     else:
         st.info("No relationships found.")
 
+# -----------------------------
+# Graph-derived views, memoized per graph version
+# -----------------------------
+# `graph_token` is Neo4jClient.cache_token, which every write through the
+# client changes; the client itself is passed as `_db` (not hashed). Reruns
+# on an unchanged graph are served from the cache with no graph I/O.
+VIEW_CACHE_ENTRIES = 8
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def graph_overview(graph_token: str, _db):
+    """(node count, people, skills, relationships) for the Community Graph tab."""
+    people_df, skills_df = split_nodes_by_type(_db)
+    return _db.count_nodes(), people_df, skills_df, extract_relationships(_db)
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def community_encoding(graph_token: str, _db):
+    return encode_community(_db)
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def lead_shortlist(graph_token: str, _db):
+    return rank_leads_from_graph(_db)
+
+@st.cache_data(max_entries=VIEW_CACHE_ENTRIES, show_spinner=False)
+def community_gaps(graph_token: str, _db):
+    return detect_community_gaps(_db)
+
+def render_stream_timing(stats):
+    """Time-to-first-result of the last streamed agent call."""
+    if stats.get("ttfr_s") is None:
+        return
+    source = "cache" if stats["cached"] else "model"
+    st.metric(
+        "Time to first result",
+        f"{stats['ttfr_s']:.2f}s",
+        help=f"{stats['items']} results in {stats['total_s']:.2f}s (from {source})"
+    )
+
+METRIC_SOURCE_LABELS = {"llm_cache": "Response Cache", "image_cache": "Image Cache"}
+
+def render_performance_panel():
+    """
+    Latency percentiles, token counts and cache hit rates recorded by
+    backend.metrics since startup (or the last reset), with exports.
+    """
+    if not METRICS.enabled:
+        st.caption("Instrumentation disabled (EDUMESH_METRICS=0).")
+        return
+    if st.button("Reset Metrics"):
+        METRICS.reset()
+
+    rows = METRICS.rows()
+    if rows:
+        st.dataframe(pd.DataFrame(rows).set_index("Operation"), use_container_width=True)
+    else:
+        st.caption("No operations timed yet.")
+
+    for name, stats in METRICS.snapshot()["sources"].items():
+        if "hit_rate" in stats:
+            st.metric(
+                METRIC_SOURCE_LABELS.get(name, name),
+                f"{stats['hit_rate']:.0%}",
+                help=f"{stats['hits']} hits / {stats['misses']} misses"
+            )
+        else:
+            st.caption(f"**{name}:** " + ", ".join(f"{k} {v:g}" for k, v in stats.items()))
+
+    st.download_button("Prometheus Metrics", METRICS.prometheus(), file_name="edumesh_metrics.prom", mime="text/plain")
+    st.download_button("JSONL Metrics", METRICS.jsonl(), file_name="edumesh_metrics.jsonl", mime="application/jsonl")
+
 # Page Config
 st.set_page_config(page_title="EduMesh OS", layout="wide")
 
@@ -103,20 +156,31 @@ st.title("EduMesh OS (Gemini 3 Pro + Neo4j)")
 st.markdown("**Autonomous Community Intelligence System**")
 
 # Initialize Backend
+# Mock-mode graph persists here (snapshot + mutation log) across restarts
+MOCK_STORE_DIR = os.getenv(
+    "EDUMESH_MOCK_STORE",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.edumesh', 'mock_graph'))
+)
+
 @st.cache_resource
 def get_backend():
     gemini = EduMeshGemini()
-    db = Neo4jClient()
+    db = Neo4jClient(mock_store=MOCK_STORE_DIR)
+    # Fold the mock graph's log into a snapshot when the server stops
+    atexit.register(db.close)
 
-    # Auto-seed mock graph once per session
-    if db.use_mock and "mock_seeded" not in st.session_state:
+    # Auto-seed mock graph once, unless a persisted graph was restored
+    if db.use_mock and db.count_nodes() == 0 and "mock_seeded" not in st.session_state:
         generate_mock_data(db)
         st.session_state["mock_seeded"] = True
 
-    return gemini, db
+    # Kept current by the client's mutation events; reruns read it in O(1)
+    gap_tracker = IncrementalGapTracker().attach(db)
+
+    return gemini, db, gap_tracker
 
 try:
-    gemini_client, neo4j_client = get_backend()
+    gemini_client, neo4j_client, gap_tracker = get_backend()
     st.sidebar.success("System Online: Gemini + Neo4j (or Mock)")
 except Exception as e:
     st.error(f"System Offline: {e}")
@@ -136,49 +200,38 @@ tab1, tab2, tab3 = st.tabs(["Community Graph", "Skill Gaps (Arbitrage)", "Lead S
 with tab1:
     st.header("Live Community Graph")
     if st.button("Refresh Graph Data"):
-        # Here we would typically re-query Neo4j
-        pass
-    
+        # Picks up writes made outside this client (other processes, Neo4j Browser)
+        neo4j_client.invalidate()
+
+    node_count, people_df, skills_df, rel_df = graph_overview(neo4j_client.cache_token, neo4j_client)
+
     # Simple Visualizer for Demo (Mocking the visual aspect if GraphView is complex)
-    # real implementation would pull from neo4j_client.get_all_nodes()
     # For hackathon demo, let's show stats or raw data if visualizer acts up
-    nodes = neo4j_client.get_all_nodes()
-    st.metric("Total Nodes", len(nodes))
+    st.metric("Total Nodes", node_count)
     if neo4j_client.use_mock:
         st.info("Running in Mock Graph/Memory Mode")
         
     section_divider("Community Overview")
     
-    # Calculate stats for summary
-    people_df, skills_df = split_nodes_by_type(nodes)
-    rel_count = 0
-    if neo4j_client.use_mock:
-        rel_df = extract_relationships(neo4j_client.mock_graph)
-        rel_count = len(rel_df)
-        
     st.success(
-        f"{len(people_df)} members • {len(skills_df)} skills • {rel_count} relationships"
+        f"{len(people_df)} members • {len(skills_df)} skills • {len(rel_df)} relationships"
     )
     
-    render_community_tables(nodes)
-    render_relationships_table(neo4j_client)
+    section_divider("Graph View")
+    # Level-of-detail view: communities as supernodes, click one to expand it
+    render_lod_graph(neo4j_client, neo4j_client.cache_token)
+
+    render_community_tables(people_df, skills_df)
+    render_relationships_table(rel_df)
 
 with tab2:
     st.header("Strategic Gap Analysis (Gemini + Thinking)")
     
-    # Load mock data for Gemini context
-    mock_data = [] 
-    if os.path.exists("data/mock_community.json"):
-        with open("data/mock_community.json", "r") as f:
-            mock_data = json.load(f)
-
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Offline Detector (Deterministic)")
         
-        # Re-fetch nodes for this tab
-        nodes = neo4j_client.get_all_nodes()
-        offline_gaps = detect_skill_gaps(nodes)
+        offline_gaps = gap_tracker.current_gaps()
 
         st.subheader("📉 Detected Skill Gaps (Offline Intelligence)")
 
@@ -188,6 +241,13 @@ with tab2:
             st.caption("Detected gaps are derived from community skill topology.")
         else:
             st.info("No critical skill gaps detected.")
+
+        with st.expander("Gaps by community (region, else role)"):
+            local_gaps = community_gaps(neo4j_client.cache_token, neo4j_client)
+            if local_gaps:
+                st.dataframe(pd.DataFrame(local_gaps), use_container_width=True)
+            else:
+                st.info("No community is missing a successor skill.")
         
     with col2:
         st.subheader("Gemini 3 Pro Agent")
@@ -196,32 +256,32 @@ with tab2:
                 st.warning("⚠️ AI disabled. Toggle 'Use Gemini AI' in sidebar to run this agent.")
             else:
                 gap_detector_agent = GapDetector(gemini_client)
-                # Create a string representation of the graph for the AI
-                graph_summary = json.dumps(mock_data) 
+                # Compact encoding built straight from the graph (see prompt_encoding)
+                encoding = community_encoding(neo4j_client.cache_token, neo4j_client)
+                st.caption(f"Prompt data: ~{encoding.tokens:,} tokens ({encoding.mode} encoding)")
                 with st.spinner("Gemini is thinking (High Reasoning)..."):
                     try:
-                        ai_gaps = gap_detector_agent.detect_gaps(graph_summary)
-                        
-                        # Ensure list format
-                        if isinstance(ai_gaps, dict):
-                            ai_gaps = [ai_gaps]
-                            
-                        # Convert to DataFrame for strategic view
-                        ai_df = pd.DataFrame(ai_gaps)
-                        
                         st.subheader("🧠 AI-Identified Strategic Opportunities")
-                        
-                        # Check if columns exist before filtering to avoid errors if AI hallucinates schema
-                        cols_to_show = ["title", "severity", "suggested_intervention"]
-                        existing_cols = [c for c in cols_to_show if c in ai_df.columns]
-                        
-                        if existing_cols:
-                            st.dataframe(
-                                ai_df[existing_cols],
+                        gaps_table = st.empty()
+
+                        # Gaps are streamed: the table grows as each one completes
+                        ai_gaps = []
+                        for gap in gap_detector_agent.stream_gaps_encoded(encoding):
+                            ai_gaps.append(gap)
+                            
+                            # Convert to DataFrame for strategic view
+                            ai_df = pd.DataFrame(ai_gaps)
+                            
+                            # Check if columns exist before filtering to avoid errors if AI hallucinates schema
+                            cols_to_show = ["title", "severity", "suggested_intervention"]
+                            existing_cols = [c for c in cols_to_show if c in ai_df.columns]
+                            
+                            gaps_table.dataframe(
+                                ai_df[existing_cols] if existing_cols else ai_df,
                                 use_container_width=True
                             )
-                        else:
-                            st.dataframe(ai_df, use_container_width=True)
+
+                        render_stream_timing(gemini_client.last_stream)
 
                         with st.expander("🔍 View Raw Gemini Reasoning (JSON)"):
                             st.json(ai_gaps)
@@ -233,37 +293,66 @@ with tab2:
                         st.error(f"AI Error: {e}")
                 
                 # Reframed Thought Signature
-                if gemini_client.thought_signature:
+                if len(gemini_client.thoughts):
                     st.success("🧠 Reasoning continuity active")
                     st.caption(
                         "Persistent thought signature maintained across Gemini calls."
                     )
 
                 with st.expander("View Thought Signature (Debug)"):
-                    st.json(gemini_client.thought_signature)
+                    st.json(gemini_client.thoughts.snapshot())
 
 with tab3:
     st.header("Lead Selector Agent")
+    selector = LeadSelector(gemini_client)
+
+    # Deterministic pre-ranking from the graph; only this shortlist reaches the model
+    shortlist = lead_shortlist(neo4j_client.cache_token, neo4j_client)
+    st.subheader("📋 Graph-Ranked Shortlist")
+    if shortlist:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Name": c.name,
+                    "Role": c.role,
+                    "Score": round(c.score, 2),
+                    "Mentees": c.mentees,
+                    "Skills": ", ".join(c.skills),
+                }
+                for c in shortlist
+            ]),
+            use_container_width=True
+        )
+        st.caption("Ranked by skill rarity, mentorship, need coverage and role diversity.")
+    else:
+        st.info("No community members found.")
+
     if st.button("Identify Leaders"):
         if not use_ai:
-            st.warning("⚠️ AI disabled. Toggle 'Use Gemini AI' in sidebar to run this agent.")
+            st.info("🛡️ AI disabled: leads picked from graph signals alone.")
+            for lead in (candidate.as_lead() for candidate in shortlist[:3]):
+                st.success(f"Selected: {lead.get('name')}")
+                st.caption(lead.get('reason'))
         else:
-            selector = LeadSelector(gemini_client)
             with st.spinner("Analyzing candidates..."):
-                mock_candidates = []
-                if os.path.exists("data/mock_community.json"):
-                    with open("data/mock_community.json", "r") as f:
-                        mock_candidates = json.load(f)
-                
                 try:
-                    leads = selector.select_leads(mock_candidates)
-                    for lead in leads:
+                    # Leads are streamed and shown as each one completes
+                    for lead in selector.stream_from_shortlist(shortlist):
                         st.success(f"Selected: {lead.get('name')}")
                         st.caption(lead.get('reason'))
+                    render_stream_timing(gemini_client.last_stream)
                 except Exception as e:
                     st.error(f"AI Error: {e}")
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### System Status")
 st.sidebar.markdown(f"**Gemini Model:** {gemini_client.model}")
+cache_stats = gemini_client.cache.stats()
+st.sidebar.markdown(
+    f"**Response Cache:** {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+    f"({cache_stats['hit_rate']:.0%})"
+)
 st.sidebar.markdown(f"**Graph Mode:** {'MOCK' if neo4j_client.use_mock else 'NEO4J'}")
+
+with st.sidebar.expander("⏱️ Performance"):
+    render_performance_panel()
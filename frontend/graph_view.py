@@ -1,34 +1,366 @@
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import networkx as nx
 import streamlit as st
 from streamlit_agraph import agraph, Node, Edge, Config
 
+from backend.graph.compact_graph import CompactGraph
+from backend.metrics import METRICS
+
+# -----------------------------
+# Level of detail
+# -----------------------------
+# Large graphs are never sent whole. Nodes are grouped into communities
+# (Louvain, computed once per graph version), each shown as one
+# supernode. Clicking a supernode expands it into its members, highest
+# degree first, within the node budget; members that do not fit stay
+# behind a "+N more" node. Communities beyond the budget share one "other"
+# node, and parallel edges between shown units are merged into one
+# weighted edge. Community centres are laid out once per graph version and
+# members are placed on rings around their centre, so the browser gets
+# fixed coordinates and runs no physics.
+
+DEFAULT_NODE_BUDGET = 300
+DEFAULT_EDGE_BUDGET = 900
+# Largest communities placed by spring layout (networkx's dense solver,
+# no scipy needed); any further ones go on an outer ring
+LAYOUT_COMMUNITIES = 400
+LAYOUT_SCALE = 1500
+LAYOUT_SEED = 7
+# Louvain runs on the whole graph up to this many edges; larger graphs run
+# it on a seeded sample of this many edges (drawn from the edge columns)
+# and attach the other nodes to their neighbours' most common community,
+# read from CompactGraph adjacency
+LOUVAIN_MAX_EDGES = 50_000
+
+CLUSTER_PREFIX = "cluster:"
+MORE_PREFIX = "more:"
+OTHER_ID = "cluster:other"
+
+
+@dataclass
+class GraphSnapshot:
+    labels: Dict[str, str]                  # node id -> label
+    names: Dict[str, str]                   # node id -> display name
+    edges: List[Tuple[str, str, str]]       # (from, to, type)
+    degree: Counter
+    community: Dict[str, int] = field(default_factory=dict)
+    members: List[List[str]] = field(default_factory=list)   # by size, members by degree
+    centers: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+
+
+@METRICS.timed("view.snapshot_graph")
+def snapshot_graph(db) -> GraphSnapshot:
+    """One pass over the graph: nodes, edges, communities and their layout."""
+    nodes = db.node_columns(properties=["name"])
+    keys = nodes["key"]
+    labels = dict(zip(keys, (label or "Node" for label in nodes["labels"])))
+    names = {key: str(name or key) for key, name in zip(keys, nodes["name"])}
+    columns = db.edge_columns(properties=[])
+    edges = list(zip(columns["from"], columns["to"], columns["type"]))
+
+    degree = Counter(columns["from"])
+    degree.update(columns["to"])
+
+    snapshot = GraphSnapshot(labels, names, edges, degree)
+    # Mock mode already holds the adjacency; Neo4j mode builds it on demand
+    _detect_communities(snapshot, db.mock_graph if getattr(db, "use_mock", False) else None)
+    _layout_communities(snapshot)
+    return snapshot
+
+
+def _detect_communities(snapshot: GraphSnapshot, adjacency: Optional[CompactGraph] = None):
+    groups: List[List[str]] = []
+    unlinked: Dict[str, List[str]] = {}
+    for community in _communities(snapshot, adjacency):
+        if len(community) == 1:
+            # Isolated nodes: one group per label rather than thousands of singletons
+            (node,) = community
+            unlinked.setdefault(snapshot.labels[node], []).append(node)
+        else:
+            groups.append(list(community))
+    groups.extend(unlinked.values())
+
+    by_degree = lambda node: (-snapshot.degree[node], node)
+    snapshot.members = sorted(
+        (sorted(group, key=by_degree) for group in groups),
+        key=lambda group: (-len(group), group[0])
+    )
+    snapshot.community = {node: cid for cid, group in enumerate(snapshot.members) for node in group}
+
+
+def _communities(snapshot: GraphSnapshot, adjacency: Optional[CompactGraph] = None) -> List[set]:
+    # Label propagation was cheaper, but hub skills held by much of the
+    # community pull every label together into one giant group
+    labels = snapshot.labels
+    edges = [(s, t) for s, t, _ in snapshot.edges if s in labels and t in labels]
+    if len(edges) <= LOUVAIN_MAX_EDGES:
+        graph = nx.Graph()
+        graph.add_nodes_from(labels)
+        graph.add_edges_from(edges)
+        return nx.community.louvain_communities(graph, seed=LAYOUT_SEED)
+
+    sample = random.Random(LAYOUT_SEED).sample(edges, LOUVAIN_MAX_EDGES)
+    community: Dict[str, int] = {}
+    for cid, members in enumerate(nx.community.louvain_communities(nx.Graph(sample), seed=LAYOUT_SEED)):
+        community.update(dict.fromkeys(members, cid))
+
+    if adjacency is None:
+        adjacency = CompactGraph()
+        for source, target, rel_type in snapshot.edges:
+            adjacency.add_edge(source, target, rel_type)
+
+    # Best-connected nodes first, so later ones can vote through them
+    pending = sorted((node for node in labels if node not in community), key=lambda node: -snapshot.degree[node])
+    while pending:
+        left = []
+        for node in pending:
+            votes = Counter(community[other] for other in adjacency.neighbors(node) if other in community)
+            if votes:
+                community[node] = votes.most_common(1)[0][0]
+            else:
+                left.append(node)
+        if len(left) == len(pending):
+            break
+        pending = left
+
+    groups: Dict[int, set] = {}
+    for node, cid in community.items():
+        groups.setdefault(cid, set()).add(node)
+    return list(groups.values()) + [{node} for node in pending]
+
+
+def _layout_communities(snapshot: GraphSnapshot):
+    """Spring layout of the community graph (largest LAYOUT_COMMUNITIES), weighted by links."""
+    total = len(snapshot.members)
+    shown = min(total, LAYOUT_COMMUNITIES)
+    quotient = nx.Graph()
+    quotient.add_nodes_from(range(shown))
+    weights: Counter = Counter()
+    for source, target, _ in snapshot.edges:
+        a, b = snapshot.community.get(source), snapshot.community.get(target)
+        if a is not None and b is not None and a != b and a < shown and b < shown:
+            weights[min(a, b), max(a, b)] += 1
+    quotient.add_weighted_edges_from((a, b, w) for (a, b), w in weights.items())
+    if shown:
+        positions = nx.spring_layout(quotient, seed=LAYOUT_SEED, scale=LAYOUT_SCALE)
+        snapshot.centers = {cid: (float(x), float(y)) for cid, (x, y) in positions.items()}
+    for cid in range(shown, total):
+        angle = 2 * math.pi * (cid - shown) / (total - shown)
+        snapshot.centers[cid] = (1.3 * LAYOUT_SCALE * math.cos(angle), 1.3 * LAYOUT_SCALE * math.sin(angle))
+
+
+def _ring(center: Tuple[float, float], index: int) -> Tuple[float, float]:
+    """Position of the index-th member around its community centre (sunflower spiral)."""
+    radius = 18 * math.sqrt(index + 1)
+    angle = index * 2.39996  # golden angle
+    return center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle)
+
+
+@METRICS.timed("view.build_view")
+def build_view(
+    snapshot: GraphSnapshot,
+    expanded: FrozenSet[int] = frozenset(),
+    node_budget: int = DEFAULT_NODE_BUDGET,
+    edge_budget: int = DEFAULT_EDGE_BUDGET
+) -> Tuple[List[dict], List[dict]]:
+    """
+    (nodes, edges) as plain dicts, at most `node_budget` nodes. A graph
+    that fits is shown in full. Otherwise up to half the budget is split
+    between the `expanded` communities, each showing its highest-degree
+    members, and the rest shows the largest other communities as
+    supernodes (plus one "other" node when they do not all fit).
+    """
+    communities = range(len(snapshot.members))
+    if len(snapshot.labels) <= node_budget:
+        takes = {cid: len(snapshot.members[cid]) for cid in communities}
+        collapsed: List[int] = []
+        other: List[int] = []
+    else:
+        opened = sorted(cid for cid in expanded if cid < len(snapshot.members))[:max(1, node_budget // 2)]
+        share = (node_budget // 2) // max(1, len(opened))
+        takes = {}
+        for cid in opened:
+            size = len(snapshot.members[cid])
+            # A truncated community spends one slot on its "+N more" node
+            takes[cid] = size if size <= share else max(0, share - 1)
+        used = sum(take + (take < len(snapshot.members[cid])) for cid, take in takes.items())
+        rest = [cid for cid in communities if cid not in takes]
+        room = node_budget - used
+        if len(rest) > room:
+            collapsed, other = rest[:room - 1], rest[room - 1:]
+        else:
+            collapsed, other = rest, []
+
+    nodes: List[dict] = []
+    unit: Dict[str, str] = {}
+    for cid, take in takes.items():
+        members = snapshot.members[cid]
+        center = snapshot.centers.get(cid, (0.0, 0.0))
+        for index, node in enumerate(members[:take]):
+            x, y = _ring(center, index)
+            nodes.append({
+                "id": node,
+                "label": snapshot.names[node],
+                "group": snapshot.labels[node],
+                "size": 10 + 2 * math.log1p(snapshot.degree[node]),
+                "title": f"{snapshot.labels[node]} · degree {snapshot.degree[node]}",
+                "x": x,
+                "y": y,
+            })
+            unit[node] = node
+        if take < len(members):
+            more = f"{MORE_PREFIX}{cid}"
+            x, y = _ring(center, take)
+            nodes.append({
+                "id": more,
+                "label": f"+{len(members) - take} more",
+                "group": "cluster",
+                "size": 12,
+                "title": "Lower-degree members not shown (node budget)",
+                "x": x,
+                "y": y,
+            })
+            for node in members[take:]:
+                unit[node] = more
+
+    for cid in collapsed:
+        members = snapshot.members[cid]
+        nodes.append(_supernode(snapshot, cid, f"{CLUSTER_PREFIX}{cid}", members, snapshot.centers.get(cid, (0.0, 0.0))))
+        for node in members:
+            unit[node] = f"{CLUSTER_PREFIX}{cid}"
+
+    if other:
+        rest_members = [node for cid in other for node in snapshot.members[cid]]
+        nodes.append(_supernode(snapshot, None, OTHER_ID, rest_members, (LAYOUT_SCALE * 1.5, LAYOUT_SCALE * 1.5)))
+        for node in rest_members:
+            unit[node] = OTHER_ID
+
+    return nodes, _merge_edges(snapshot, unit, edge_budget)
+
+
+def _supernode(snapshot: GraphSnapshot, cid, node_id: str, members: List[str], center) -> dict:
+    counts = Counter(snapshot.labels[node] for node in members)
+    composition = ", ".join(f"{label} {count}" for label, count in counts.most_common())
+    name = "Other communities" if cid is None else f"{snapshot.names[members[0]]} +{len(members) - 1}"
+    return {
+        "id": node_id,
+        "label": name,
+        "group": "cluster",
+        "shape": "hexagon",
+        "size": 15 + 6 * math.log1p(len(members)),
+        "title": f"{len(members)} nodes ({composition}) · click to expand",
+        "x": center[0],
+        "y": center[1],
+    }
+
+
+def _merge_edges(snapshot: GraphSnapshot, unit: Dict[str, str], edge_budget: int) -> List[dict]:
+    merged: Counter = Counter()
+    for source, target, rel_type in snapshot.edges:
+        a, b = unit.get(source), unit.get(target)
+        if a is None or b is None or a == b:
+            continue
+        # Individual endpoints keep the relationship type; merged edges just count
+        detailed = a == source and b == target
+        merged[a, b, rel_type if detailed else None] += 1
+
+    edges = []
+    for (a, b, rel_type), weight in merged.most_common(edge_budget):
+        edge = {"from": a, "to": b, "type": rel_type or str(weight)}
+        if rel_type is None:
+            edge["width"] = 1 + math.log1p(weight)
+        edges.append(edge)
+    return edges
+
+
+# -----------------------------
+# Streamlit rendering
+# -----------------------------
+
+# Heavy and read-only: shared, not copied, per graph version
+@st.cache_resource(max_entries=2, show_spinner="Clustering graph...")
+def graph_snapshot(graph_token: str, _db) -> GraphSnapshot:
+    return snapshot_graph(_db)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def graph_lod_view(graph_token: str, expanded: Tuple[int, ...], node_budget: int, _db):
+    return build_view(graph_snapshot(graph_token, _db), frozenset(expanded), node_budget)
+
+
+def render_lod_graph(db, graph_token: str, node_budget: int = DEFAULT_NODE_BUDGET, key: str = "graph"):
+    """
+    Level-of-detail graph for any size: at most `node_budget` nodes reach
+    the browser. Clicking a community expands it; expansions reset when
+    the graph version changes (community ids are per version).
+    """
+    state = st.session_state.setdefault(f"{key}_lod", {"token": graph_token, "expanded": []})
+    if state["token"] != graph_token:
+        state.update(token=graph_token, expanded=[])
+
+    nodes, edges = graph_lod_view(graph_token, tuple(sorted(state["expanded"])), node_budget, db)
+    config = Config(
+        width=900,
+        height=600,
+        directed=True,
+        physics=False,
+        nodeHighlightBehavior=True,
+        highlightColor="#F7A7A6",
+        collapsible=False
+    )
+    clicked = render_graph(nodes, edges, config)
+
+    if isinstance(clicked, str) and clicked.startswith(CLUSTER_PREFIX) and clicked != OTHER_ID:
+        cid = int(clicked[len(CLUSTER_PREFIX):])
+        if cid not in state["expanded"]:
+            state["expanded"].append(cid)
+            st.rerun()
+    if state["expanded"] and st.button("Collapse communities", key=f"{key}_collapse"):
+        state["expanded"] = []
+        st.rerun()
+    st.caption(f"Showing {len(nodes)} of {len(graph_snapshot(graph_token, db).labels)} nodes (budget {node_budget}).")
+    return clicked
+
+
 def render_graph(nodes, edges, config=None):
     """
     Renders an interactive graph using streamlit-agraph.
+    Node dicts may carry size / title / shape / x / y (see build_view).
     """
     ag_nodes = []
     ag_edges = []
-    
+
     # Convert dicts/objects to agraph Nodes
     for n in nodes:
         # Check if n is dict or object (depending on where it comes from)
         nid = n.get('id') if isinstance(n, dict) else (n.element_id if hasattr(n, 'element_id') else str(n))
-        label = n.get('name') if isinstance(n, dict) else (n['name'] if hasattr(n, '__getitem__') else str(n))
-        group = n.get('labels', ['Node'])[0] if isinstance(n, dict) and 'labels' in n else "Node"
-        
-        ag_nodes.append(Node(id=nid, label=label, size=25, group=group))
+        label = n.get('name') or n.get('label') if isinstance(n, dict) else (n['name'] if hasattr(n, '__getitem__') else str(n))
+        group = n.get('group') if isinstance(n, dict) and 'group' in n else (
+            n.get('labels', ['Node'])[0] if isinstance(n, dict) and 'labels' in n else "Node"
+        )
+        extra = {k: n[k] for k in ("title", "shape", "x", "y") if isinstance(n, dict) and k in n}
+        size = n.get('size', 25) if isinstance(n, dict) else 25
+
+        ag_nodes.append(Node(id=nid, label=label, size=size, group=group, **extra))
 
     for e in edges:
         source = e.get('from')
         target = e.get('to')
         label = e.get('type')
-        ag_edges.append(Edge(source=source, target=target, label=label))
+        extra = {"width": e["width"]} if "width" in e else {}
+        ag_edges.append(Edge(source=source, target=target, label=label, **extra))
 
     if not config:
-        config = Config(width=700, 
-                        height=500, 
+        config = Config(width=700,
+                        height=500,
                         directed=True,
-                        nodeHighlightBehavior=True, 
-                        highlightColor="#F7A7A6", 
+                        nodeHighlightBehavior=True,
+                        highlightColor="#F7A7A6",
                         collapsible=False)
 
     return agraph(nodes=ag_nodes, edges=ag_edges, config=config)
@@ -0,0 +1,71 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.compact_graph import COMPACT_MIN_TAIL, CompactGraph
+
+
+def _edge_set(graph, rel_type=None):
+    columns = graph.edge_columns(rel_type, properties=[])
+    return set(zip(columns["from"], columns["to"], columns["type"]))
+
+
+def test_nodes_labels_and_columns():
+    graph = CompactGraph()
+    graph.add_node("a", "Person", {"name": "Ada"})
+    graph.add_node("b", "Person", {"name": "Bo", "role": "lead"})
+    graph.add_node("py", "Skill", {"name": "Python"})
+    graph.add_node("a", props={"role": "member"})
+
+    assert graph.get_node("a") == {"labels": "Person", "name": "Ada", "role": "member"}
+    assert graph.count_label("Person") == 2
+    assert [node_id for node_id, _ in graph.iter_nodes("Skill")] == ["py"]
+    assert graph.node_columns("Person", ["name", "missing"]) == {
+        "key": ["a", "b"], "name": ["Ada", "Bo"], "missing": [None, None],
+    }
+
+
+def test_edges_survive_compaction_and_tombstones():
+    graph = CompactGraph()
+    graph.add_edge("a", "py", "HAS_SKILL", {"level": 3})
+    graph.add_edge("b", "py", "HAS_SKILL")
+    graph.add_edge("a", "b", "KNOWS")
+    assert not graph.add_edge("a", "py", "HAS_SKILL")
+    graph.compact()
+
+    # Tombstone a packed edge, add a tail edge, then re-pack
+    assert graph.remove_edge("b", "py", "HAS_SKILL")
+    graph.add_edge("c", "py", "HAS_SKILL")
+    expected = {("a", "py", "HAS_SKILL"), ("c", "py", "HAS_SKILL"), ("a", "b", "KNOWS")}
+    assert _edge_set(graph) == expected
+    graph.compact()
+    assert _edge_set(graph) == expected
+    assert graph.number_of_edges() == 3
+    assert graph.edge_columns("HAS_SKILL", ["level"])["level"] == [3, None]
+    assert sorted(graph.predecessors("py", "HAS_SKILL")) == ["a", "c"]
+    assert sorted(graph.neighbors("a")) == ["b", "py"]
+
+
+def test_remove_node_detaches_its_edges():
+    graph = CompactGraph()
+    graph.add_edge("a", "py", "HAS_SKILL")
+    graph.add_edge("b", "a", "KNOWS")
+    graph.compact()
+    assert graph.remove_node("a")
+
+    assert graph.get_node("a") is None
+    assert graph.number_of_edges() == 0
+    assert _edge_set(graph) == set()
+    assert graph.neighbors("b") == []
+
+
+def test_bulk_inserts_compact_automatically():
+    graph = CompactGraph()
+    for i in range(COMPACT_MIN_TAIL + 10):
+        graph.add_edge(f"p{i}", "py", "HAS_SKILL")
+    adjacency = graph._rels["HAS_SKILL"]
+    assert adjacency.tail_size < COMPACT_MIN_TAIL
+    assert len(graph.predecessors("py")) == COMPACT_MIN_TAIL + 10
+    assert graph.has_edge("p0", "py") and not graph.has_edge("py", "p0")
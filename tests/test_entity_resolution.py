@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.entity_resolution import EntityResolver
+
+NEAR_MISSES = [
+    ("Project Management", "Product Management"),
+    ("Accounting", "Counting"),
+    ("Machine Learning", "Machine Learning Ops"),
+]
+
+
+def test_near_miss_names_are_not_merged_on_write():
+    resolver = EntityResolver()
+    for existing, incoming in NEAR_MISSES:
+        resolver.seed("Skill", [existing])
+        assert resolver.resolve(incoming, "Skill") == incoming
+        assert resolver.lookup(incoming, "Skill") == incoming
+    assert resolver.stats()["merged"] == 0
+
+
+def test_key_and_alias_hits_still_merge():
+    resolver = EntityResolver({"Skill": {"JavaScript": ["JS"]}})
+    resolver.seed("Skill", ["React"])
+    assert resolver.resolve("React.js", "Skill") == "React"
+    assert resolver.resolve("ReactJS", "Skill") == "React"
+    assert resolver.resolve("JS", "Skill") == "JavaScript"
+
+
+def test_fuzzy_matches_are_suggestions_only():
+    resolver = EntityResolver()
+    resolver.seed("Skill", ["Project Management"])
+    similar, ratio = resolver.suggest("Product Management", "Skill")
+    assert similar == "Project Management" and ratio >= resolver.threshold
+    assert resolver.resolve("Product Management", "Skill") == "Product Management"
@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.compact_graph import CompactGraph
+from backend.offline_gap_detector import GapRuleSet, detect_community_gaps
+
+
+class _Db:
+    """The iterators people_from_graph reads, over a CompactGraph."""
+    def __init__(self, graph: CompactGraph):
+        self.graph = graph
+
+    def iter_nodes(self, label, properties=None):
+        return self.graph.iter_nodes(label, properties)
+
+    def iter_edges(self, rel_type, properties=None):
+        return self.graph.edges(data=True, rel_type=rel_type, properties=properties)
+
+
+def _random_rules(rng, skills, count):
+    return [
+        {
+            "requires": rng.sample(skills, rng.randint(1, 3)),
+            "missing": rng.choice(skills),
+            "reason": f"rule {i}",
+            "action": f"action {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_batch_evaluation_matches_per_community():
+    rng = random.Random(3)
+    skills = [f"s{i}" for i in range(40)]
+    rules = GapRuleSet(_random_rules(rng, skills, 300))
+    communities = {
+        f"c{c}": rng.sample(skills + ["unrelated"], rng.randint(0, 25))
+        for c in range(70)
+    }
+
+    fired = rules.evaluate_batch(communities)
+    assert fired == {name: rules.evaluate(held) for name, held in communities.items()}
+    assert any(fired.values()) and not all(fired.values())
+    assert rules.evaluate_batch({}) == {}
+
+
+def test_community_gaps_are_counted_within_each_community():
+    rules = GapRuleSet([
+        {"requires": ["Solar Installation"], "missing": "Solar Maintenance", "reason": "r1", "action": "a1"},
+        {"requires": ["Basic Math"], "missing": "Advanced Math", "reason": "r2", "action": "a2"},
+    ])
+    graph = CompactGraph()
+    members = [
+        ("p1", "Ali", "North", ["Basic Math"]),
+        ("p2", "Sara", "North", ["Solar Installation"]),
+        ("p3", "Omar", "North", []),
+        ("p4", "Ahmed", "South", ["Basic Math", "Advanced Math"]),
+        ("p5", "Hina", None, ["Solar Installation"]),
+    ]
+    for pid, name, region, skills in members:
+        graph.add_node(pid, "Person", {"name": name, "role": "Teacher", "region": region})
+        for skill in skills:
+            graph.add_edge(pid, skill, "HAS_SKILL")
+
+    gaps = detect_community_gaps(_Db(graph), rules)
+    assert [(gap["Community"], gap["Missing Skill"], gap["Prerequisite Holders"], gap["Coverage"]) for gap in gaps] == [
+        ("North", "Solar Maintenance", "Sara", "1 of 3 people"),
+        ("North", "Advanced Math", "Ali", "1 of 3 people"),
+        # No region: grouped by role
+        ("Teacher", "Solar Maintenance", "Hina", "1 of 1 people"),
+    ]
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.fake_gemini import FakeGeminiServer
+from backend.gemini_client import EduMeshGemini
+from backend.image_prep import ImagePreprocessor
+from backend.response_cache import ResponseCache
+from backend.thought_store import ThoughtStore
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    prompts = []
+
+    def responder(prompt, request):
+        prompts.append(prompt)
+        return {"text": '{"answer": %d}' % len(prompts), "thoughts": [f"thought {len(prompts)}"]}
+
+    with FakeGeminiServer(responder=responder) as server:
+        monkeypatch.setenv("GEMINI_TRANSPORT", "live")
+        monkeypatch.setenv("GEMINI_BASE_URL", server.url)
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        client = EduMeshGemini(
+            cache=ResponseCache(directory=None),
+            thoughts=ThoughtStore(),
+            images=ImagePreprocessor(directory=None),
+        )
+        client.prompts = prompts
+        yield client
+
+
+def test_repeated_generate_json_is_served_from_cache(gemini):
+    first = gemini.generate_json("Find the gaps.", namespace="gaps")
+    # The first answer's thought is now injected into the prompt context...
+    assert "thought 1" in gemini._json_request("Find the gaps.", "gaps")[0]
+    # ...but the repeat still hits the cache
+    assert gemini.generate_json("Find the gaps.", namespace="gaps") == first
+    assert len(gemini.prompts) == 1
+    assert gemini.cache.stats()["hits"] == 1
+
+
+def test_different_prompts_and_use_cache_false_call_the_model(gemini):
+    gemini.generate_json("Find the gaps.")
+    gemini.generate_json("Pick the leads.")
+    gemini.generate_json("Find the gaps.", use_cache=False)
+    assert len(gemini.prompts) == 3
@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.async_neo4j_client import AsyncNeo4jClient
+from backend.graph.events import EDGE_ADDED, EDGE_REMOVED, NODE_ADDED, NODE_REMOVED
+from backend.graph.neo4j_client import Neo4jClient
+
+
+def _mock_client(monkeypatch):
+    monkeypatch.setenv("NEO4J_URI", "bolt://127.0.0.1:1")
+    client = Neo4jClient()
+    assert client.use_mock
+    return client
+
+
+def test_each_write_bumps_the_version_once(monkeypatch):
+    client = _mock_client(monkeypatch)
+    events = []
+    for listening in (False, True):
+        if listening:
+            client.subscribe(events.append)
+        start = client.version
+        client.upsert_person({"id": "p1", "name": "Ada"})
+        client.link_person_skill("p1", "Python")
+        client.delete_relationship("p1", "Python", "HAS_SKILL")
+        client.delete_node("Person", "p1")
+        assert client.version == start + 4
+
+    assert [event.kind for event in events] == [NODE_ADDED, EDGE_ADDED, EDGE_REMOVED, NODE_REMOVED]
+
+
+def test_mock_bulk_write_bumps_once_per_row(monkeypatch):
+    # The mock graph applies (and logs) each row as its own write
+    client = _mock_client(monkeypatch)
+    events = []
+    client.subscribe(events.append)
+    start = client.version
+    client.bulk_upsert_people([{"id": f"p{i}", "name": f"P{i}"} for i in range(5)], batch_size=2)
+    assert client.version == start + 5
+    assert [event.key for event in events] == [f"p{i}" for i in range(5)]
+
+
+def test_async_client_bumps_once_per_write():
+    async def run():
+        client = AsyncNeo4jClient()
+        client.use_mock = True
+        events = []
+        client.subscribe(events.append)
+        await client.upsert_person({"id": "p1", "name": "Ada"})
+        await client.link_person_skill("p1", "Python")
+        await client.delete_relationship("p1", "Python", "HAS_SKILL")
+        await client.delete_node("Person", "p1")
+        return client.version, [event.kind for event in events]
+
+    version, kinds = asyncio.run(run())
+    assert version == 4
+    assert kinds == [NODE_ADDED, EDGE_ADDED, EDGE_REMOVED, NODE_REMOVED]
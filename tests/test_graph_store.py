@@ -0,0 +1,50 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph.graph_store import LOG_FILE, MockGraphStore
+
+
+def _person_ids(graph):
+    return sorted(node_id for node_id, _ in graph.iter_nodes("Person"))
+
+
+def test_torn_log_tail_is_truncated_before_append(tmp_path):
+    store = MockGraphStore(str(tmp_path))
+    graph = store.load()
+    graph.add_node("a", "Person", {"name": "A"})
+    graph.add_node("b", "Person", {"name": "B"})
+    # Simulate a crash mid-write: no close(), last record torn
+    store._log.close()
+    log_path = os.path.join(str(tmp_path), LOG_FILE)
+    with open(log_path, "rb+") as f:
+        f.truncate(os.path.getsize(log_path) - 5)
+
+    store = MockGraphStore(str(tmp_path))
+    graph = store.load()
+    assert _person_ids(graph) == ["a"]
+    graph.add_node("c", "Person", {"name": "C"})
+    graph.add_node("d", "Person", {"name": "D"})
+    store._log.close()
+
+    store = MockGraphStore(str(tmp_path))
+    assert _person_ids(store.load()) == ["a", "c", "d"]
+    store.close()
+
+
+def test_close_snapshots_and_unmaps(tmp_path):
+    store = MockGraphStore(str(tmp_path))
+    graph = store.load()
+    graph.add_node("a", "Person", {"name": "A"})
+    graph.add_edge("a", "Python", "HAS_SKILL")
+    store.close()
+
+    store = MockGraphStore(str(tmp_path))
+    graph = store.load()
+    assert store._mapped is not None
+    assert graph.has_edge("a", "Python", "HAS_SKILL")
+    store.close()
+    assert store._mapped is None
+    assert os.path.getsize(os.path.join(str(tmp_path), LOG_FILE)) == 0
@@ -0,0 +1,84 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import frontend.graph_view as graph_view
+from backend.graph.compact_graph import CompactGraph
+from frontend.graph_view import CLUSTER_PREFIX, build_view, snapshot_graph
+
+
+class _Db:
+    """The slice of Neo4jClient that snapshot_graph reads, over a CompactGraph."""
+    def __init__(self, graph: CompactGraph, use_mock: bool = True):
+        self.mock_graph = graph
+        self.use_mock = use_mock
+
+    def node_columns(self, properties=None):
+        return self.mock_graph.node_columns(None, properties)
+
+    def edge_columns(self, properties=None):
+        return self.mock_graph.edge_columns(None, properties)
+
+
+def _cliques(count: int, size: int) -> CompactGraph:
+    """`count` cliques of people sharing one skill each, chained by one edge."""
+    graph = CompactGraph()
+    for c in range(count):
+        skill = f"skill{c}"
+        graph.add_node(skill, "Skill", {"name": skill})
+        people = [f"p{c}_{i}" for i in range(size)]
+        for person in people:
+            graph.add_node(person, "Person", {"name": person})
+            graph.add_edge(person, skill, "HAS_SKILL")
+        for i, a in enumerate(people):
+            for b in people[i + 1:]:
+                graph.add_edge(a, b, "KNOWS")
+        if c:
+            graph.add_edge(people[0], f"p{c - 1}_0", "KNOWS")
+    return graph
+
+
+def _groups(snapshot):
+    return {frozenset(members) for members in snapshot.members}
+
+
+def test_every_node_lands_in_one_community():
+    snapshot = snapshot_graph(_Db(_cliques(4, 6)))
+    assert sorted(snapshot.community) == sorted(snapshot.labels)
+    assert sum(len(members) for members in snapshot.members) == len(snapshot.labels)
+    assert len(snapshot.members) == 4
+    for c in range(4):
+        assert len({snapshot.community[f"p{c}_{i}"] for i in range(6)}) == 1
+
+
+def test_sampled_louvain_votes_the_rest_in(monkeypatch):
+    graph = _cliques(4, 8)
+    monkeypatch.setattr(graph_view, "LOUVAIN_MAX_EDGES", graph.number_of_edges() // 2)
+
+    snapshot = snapshot_graph(_Db(graph))
+    assert sorted(snapshot.community) == sorted(snapshot.labels)
+    # Without mock adjacency (Neo4j mode) the vote runs on a CompactGraph
+    # built from the edge columns, with the same result
+    assert _groups(snapshot_graph(_Db(graph, use_mock=False))) == _groups(snapshot)
+
+
+def test_view_stays_within_node_budget():
+    snapshot = snapshot_graph(_Db(_cliques(12, 10)))
+    nodes, edges = build_view(snapshot, node_budget=8)
+    assert len(nodes) <= 8
+    assert all(node["id"].startswith(CLUSTER_PREFIX) for node in nodes)
+    assert all(edge["from"] != edge["to"] for edge in edges)
+
+    # Expanding a community shows its highest-degree members
+    nodes, _ = build_view(snapshot, expanded=frozenset({0}), node_budget=8)
+    assert len(nodes) <= 8
+    assert snapshot.members[0][0] in {node["id"] for node in nodes}
+
+
+def test_small_graph_is_shown_in_full():
+    snapshot = snapshot_graph(_Db(_cliques(2, 3)))
+    nodes, edges = build_view(snapshot)
+    assert {node["id"] for node in nodes} == set(snapshot.labels)
+    assert {edge["type"] for edge in edges} == {"HAS_SKILL", "KNOWS"}
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+from google.genai.errors import ClientError
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.fake_gemini import FakeGeminiServer
+from backend.gemini_client import EduMeshGemini
+from backend.image_prep import ImagePreprocessor
+from backend.response_cache import ResponseCache
+from backend.thought_store import ThoughtStore
+
+
+def _scan(tmp_path, name="scan.png", size=(2400, 1200)):
+    path = str(tmp_path / name)
+    Image.new("RGB", size, (200, 120, 40)).save(path)
+    return path
+
+
+def test_prepared_image_is_reused_from_memory_and_disk(tmp_path):
+    scan = _scan(tmp_path)
+    cache_dir = str(tmp_path / "image_cache")
+
+    images = ImagePreprocessor(directory=cache_dir)
+    first = images.prepare(scan)
+    assert max(first.width, first.height) == images.max_side
+    assert images.prepare(scan) is first
+    assert images.stats()["hits"] == 1 and images.stats()["misses"] == 1
+
+    # A new process finds the prepared bytes on disk
+    reloaded = ImagePreprocessor(directory=cache_dir)
+    again = reloaded.prepare(scan)
+    assert reloaded.stats()["misses"] == 0
+    assert (again.data, again.mime_type, again.width, again.height) == (
+        first.data, first.mime_type, first.width, first.height
+    )
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    scans = [_scan(tmp_path, f"scan{i}.png", (2400, 1200 + i)) for i in range(3)]
+    images = ImagePreprocessor(directory=str(tmp_path / "image_cache"), memory_entries=1)
+    for scan in scans[:2]:
+        images.prepare(scan)
+
+    # Room for two entries after eviction: preparing a third drops the oldest
+    images._store.max_disk_bytes = int(images._store.disk_bytes * 1.25)
+    images.prepare(scans[2])
+    assert images.stats()["disk_entries"] == 2
+    images.prepare(scans[1])
+    assert images.stats()["misses"] == 3
+    images.prepare(scans[0])
+    assert images.stats()["misses"] == 4
+
+
+def test_multimodal_answer_replays_from_recorded_cassette(tmp_path, monkeypatch):
+    scan = _scan(tmp_path)
+    other = _scan(tmp_path, "other.png", (2400, 1300))
+    cassette = str(tmp_path / "cassette.jsonl")
+    monkeypatch.setenv("EDUMESH_CASSETTE", cassette)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    def client():
+        return EduMeshGemini(
+            cache=ResponseCache(directory=None),
+            thoughts=ThoughtStore(),
+            images=ImagePreprocessor(directory=None),
+        )
+
+    with FakeGeminiServer(responder=lambda prompt, request: "a survey form") as server:
+        monkeypatch.setenv("GEMINI_TRANSPORT", "record")
+        monkeypatch.setenv("GEMINI_BASE_URL", server.url)
+        assert client().generate_multimodal("Read this scan.", scan) == "a survey form"
+
+    monkeypatch.setenv("GEMINI_TRANSPORT", "replay")
+    monkeypatch.delenv("GEMINI_BASE_URL")
+    replay = client()
+    try:
+        assert replay.generate_multimodal("Read this scan.", scan) == "a survey form"
+        # Same prompt, different image: not in the cassette
+        with pytest.raises(ClientError):
+            replay.generate_multimodal("Read this scan.", other)
+    finally:
+        replay.transport.close()
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.ingest import IngestCheckpoint, ingest_stream
+
+
+class _Db:
+    """Bulk write surface of Neo4jClient; fails once `fail_at` chunks were written."""
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.people = []
+        self.edges = []
+
+    def bulk_upsert_people(self, rows):
+        if self.fail_at is not None and len(self.people) >= self.fail_at:
+            raise RuntimeError("connection lost")
+        rows = list(rows)
+        self.people.extend(row["id"] for row in rows)
+        return len(rows)
+
+    def bulk_upsert_skills(self, names):
+        return len(list(names))
+
+    bulk_upsert_needs = bulk_upsert_skills
+
+    def bulk_create_relationships(self, rows):
+        rows = list(rows)
+        self.edges.extend((row["from"], row["to"], row["type"]) for row in rows)
+        return len(rows)
+
+
+def _write(path, records, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for record in records:
+            f.write(record if isinstance(record, str) else json.dumps(record))
+            f.write("\n")
+
+
+def _ingest(db, path, **kwargs):
+    return ingest_stream(db, path, chunk_size=3, on_progress=lambda stats: None, **kwargs)
+
+
+def test_interrupted_ingest_resumes_from_last_committed_chunk(tmp_path):
+    path = str(tmp_path / "people.jsonl")
+    _write(path, [{"id": f"p{i}", "skills": ["Python", " Python "]} for i in range(10)])
+
+    crashed = _Db(fail_at=6)
+    with pytest.raises(RuntimeError):
+        _ingest(crashed, path)
+    assert crashed.people == [f"p{i}" for i in range(6)]
+    with open(path, "rb") as f:
+        sixth_line_end = len(b"".join(f.readlines()[:6]))
+    assert IngestCheckpoint(f"{path}.offset").load() == sixth_line_end
+
+    resumed = _Db()
+    stats = _ingest(resumed, path)
+    assert resumed.people == [f"p{i}" for i in range(6, 10)]
+    assert resumed.edges == [(f"p{i}", "Python", "HAS_SKILL") for i in range(6, 10)]
+    assert stats["offset"] == os.path.getsize(path)
+
+    # A grown export only ingests the appended tail; bad lines and id-less records are skipped
+    _write(path, [{"id": "p10"}, "{not json", {"name": "no id"}, {"id": "p11"}], mode="a")
+    tail = _Db()
+    assert _ingest(tail, path)["records"] == 2
+    assert tail.people == ["p10", "p11"]
+
+    fresh = _Db()
+    _ingest(fresh, path, resume=False)
+    assert len(fresh.people) == 12
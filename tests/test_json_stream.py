@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.fake_gemini import FakeGeminiServer
+from backend.gemini_client import EduMeshGemini
+from backend.image_prep import ImagePreprocessor
+from backend.json_stream import JsonArrayStream
+from backend.response_cache import ResponseCache
+from backend.thought_store import ThoughtStore
+
+
+def _stream(text, size, key=None):
+    parser = JsonArrayStream(key)
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(parser.feed(text[i:i + size]))
+    assert parser.text == text
+    return items, parser.done
+
+
+CASES = [
+    # Leading prose and a code fence
+    ('Here are the gaps:\n```json\n[{"title": "A"}, {"title": "B"}]\n```', None, [{"title": "A"}, {"title": "B"}]),
+    # Brackets inside strings, before the array and inside elements
+    ('Note "use [x]" then\n[{"a": "x]\\"y["}, "s,t", 3, true, null]', None, [{"a": 'x]"y['}, "s,t", 3, True, None]),
+    # Object reply: its first array member, skipping strings and nested arrays
+    ('{"summary": "see [1]", "meta": {"tags": ["x"]}, "gaps": [{"t": 1}, [2]], "more": [9]}', None, [{"t": 1}, [2]]),
+    # Object reply with a configured key
+    ('{"gaps": [1], "leads": [2, 3]}', "leads", [2, 3]),
+    ('{"le\\u0061ds": [4]}', "leads", [4]),
+    ('[5, 6]', "leads", [5, 6]),
+]
+
+
+@pytest.mark.parametrize("text, key, expected", CASES)
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_stream_yields_the_array_elements(text, key, expected, size):
+    assert _stream(text, size, key) == (expected, True)
+
+
+def test_no_array_yields_nothing():
+    assert _stream('{"summary": "nothing [here]", "n": {"x": [1]}}', 4) == ([], False)
+    assert _stream('{"gaps": [1]}', 4, key="leads") == ([], False)
+
+
+def test_malformed_element_is_skipped():
+    assert _stream('[{"a": 1}, {oops}, {"b": 2}]', 5) == ([{"a": 1}, {"b": 2}], True)
+
+
+def test_stream_json_streams_an_object_reply_member(monkeypatch):
+    reply = '{"note": "see [1]", "gaps": [{"t": 1}, {"t": 2}], "leads": [3]}'
+    with FakeGeminiServer(responder=lambda prompt, request: reply) as server:
+        server.chunk_chars = 9
+        monkeypatch.setenv("GEMINI_TRANSPORT", "live")
+        monkeypatch.setenv("GEMINI_BASE_URL", server.url)
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        gemini = EduMeshGemini(
+            cache=ResponseCache(directory=None),
+            thoughts=ThoughtStore(),
+            images=ImagePreprocessor(directory=None),
+        )
+        assert list(gemini.stream_json("Find the gaps.")) == [{"t": 1}, {"t": 2}]
+        assert list(gemini.stream_json("Pick the leads.", array_key="leads")) == [3]
+        # Served from the cache, the whole reply gives the same member
+        assert list(gemini.stream_json("Pick the leads.", array_key="leads")) == [3]
+        assert gemini.last_stream["cached"]
@@ -0,0 +1,42 @@
+import json
+import math
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.lead_ranking import people_from_candidates, rank_leads, score_people
+from data.mock_data_generator import DATA_DIR, generate_synthetic_people
+
+
+def _person(pid, skills, needs=()):
+    return {"id": pid, "name": pid, "role": pid, "skills": list(skills), "needs": list(needs), "mentees": 0}
+
+
+def test_coverage_changes_the_ranking():
+    # a and b hold one unique skill each; only b's skill is asked for
+    people = [
+        _person("a", ["Welding"]),
+        _person("b", ["Python"]),
+        _person("c", ["Welding", "Python"], ["Python Support"]),
+        _person("d", [], ["Python Support", "Python"]),
+    ]
+    without = {"rarity": 1.0, "mentorship": 1.5, "coverage": 0.0}
+    assert [lead.id for lead in rank_leads(people, k=4, weights=without)] == ["c", "a", "b", "d"]
+    assert [lead.id for lead in rank_leads(people, k=4)] == ["c", "b", "a", "d"]
+
+    scored = {lead.id: lead for lead in score_people(people)}
+    # Two people need Python (d names it twice), two hold it
+    assert scored["b"].coverage == scored["c"].coverage == math.log1p(2 / 2)
+    assert scored["a"].coverage == 0
+    assert "covers open community needs" in scored["b"].reason()
+
+
+def test_demo_and_synthetic_communities_have_coverage():
+    with open(os.path.join(DATA_DIR, "mock_community.json"), "r") as f:
+        demo = score_people(people_from_candidates(json.load(f)))
+    assert any(lead.coverage > 0 for lead in demo)
+
+    synthetic = score_people(people_from_candidates(list(generate_synthetic_people(300))))
+    assert sum(lead.coverage > 0 for lead in synthetic) > len(synthetic) // 2
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.graph import cypher
+from backend.graph.async_neo4j_client import AsyncNeo4jClient
+from backend.graph.entity_resolution import EntityResolver
+
+SKILLS = [f"skill{i:02d}" for i in range(7)]
+# source -> targets; p1 has no edges (an OPTIONAL MATCH row with no type)
+EDGES = {"p0": ["skill00", "skill01"], "p1": [], "p2": ["skill02"], "p3": ["skill03", "skill04", "skill05"]}
+
+
+def _fake_read(queries):
+    """Keyset pages over SKILLS / EDGES, shaped like the async client's records."""
+    async def read(query, after="", limit=0):
+        queries.append(query)
+        if "OPTIONAL MATCH" in query:
+            sources = [key for key in sorted(EDGES) if key > after][:limit]
+            return [
+                {"from_key": source, "type": "HAS_SKILL" if target else None, "to_key": target, "props": {}}
+                for source in sources
+                for target in EDGES[source] or [None]
+            ]
+        return [{"key": key, "props": {}} for key in SKILLS if key > after][:limit]
+    return read
+
+
+def test_cursor_helpers():
+    assert cypher.next_node_page(["a", "b"], 2) == "b"
+    assert cypher.next_node_page(["a"], 2) is None
+    assert cypher.next_edge_page(["a", "a", "b"], 2) == "b"
+    assert cypher.next_edge_page(["a", "a", "a"], 2) is None
+    assert cypher.next_edge_page([], 2) is None
+
+
+def test_async_iterators_page_with_shared_cursors():
+    async def run():
+        client = AsyncNeo4jClient()
+        queries = []
+        client._read = _fake_read(queries)
+        nodes = [key async for key, _ in client.iter_nodes("Skill", properties=[], page_size=3)]
+        edges = [(s, t) async for s, t, _ in client.iter_edges("HAS_SKILL", properties=[], page_size=2)]
+        return nodes, edges, queries
+
+    nodes, edges, queries = asyncio.run(run())
+    assert nodes == SKILLS
+    assert edges == [(source, target) for source, targets in EDGES.items() for target in targets]
+    # 7 skills at 3 per page; 4 sources at 2 per page, plus the empty page
+    assert len(queries) == 3 + 3
+    # Key-only reads: no property maps are fetched
+    assert not any("properties(" in query for query in queries)
+
+
+def test_async_seed_reads_keys_only_through_iter_nodes(monkeypatch):
+    async def run():
+        client = AsyncNeo4jClient(resolver=EntityResolver())
+        client.use_mock = True
+        client.mock_graph.add_node("React", "Skill", {"name": "React", "bio": "x" * 100})
+
+        async def full_nodes(label):
+            raise AssertionError("seeding must not load whole nodes")
+        monkeypatch.setattr(client, "get_nodes_by_label", full_nodes)
+
+        await client.bulk_upsert_skills(["React.js", "Vue"])
+        return [key async for key, _ in client.iter_nodes("Skill", properties=[])]
+
+    assert asyncio.run(run()) == ["React", "Vue"]